@@ -16,8 +16,7 @@
 import time
 import traceback
 
-from concurrent.futures import ThreadPoolExecutor
-from typing import Dict, Tuple
+from typing import Dict, Optional, Tuple
 
 from kubernetes.client.rest import ApiException
 
@@ -25,7 +24,10 @@ import polyaxon_sdk
 
 from polyaxon import live_state, settings
 from polyaxon.agents import converter
+from polyaxon.agents.scheduler import AgentActions, AgentScheduler
+from polyaxon.agents.spawners.pipelined_spawner import PipelinedSpawner
 from polyaxon.agents.spawners.spawner import Spawner
+from polyaxon.agents.status_reporter import StatusReporter
 from polyaxon.client import PolyaxonClient
 from polyaxon.env_vars.getters import get_run_info
 from polyaxon.exceptions import PolypodException
@@ -40,21 +42,55 @@ class BaseAgent:
     HEALTH_FILE = "/tmp/.healthz"
     SLEEP_STOP_TIME = 60 * 5
     SLEEP_ARCHIVED_TIME = 60 * 60
+    STATE_WATCH_TIMEOUT = 30
 
     def __init__(self, sleep_interval=None):
         self.sleep_interval = sleep_interval
-        self.spawner = Spawner()
+        self.spawner = self.get_spawner()
         self._spawner_refreshed_at = now()
         self.client = PolyaxonClient()
+        self.status_reporter = StatusReporter(self.client)
         self._graceful_shutdown = False
+        self._watch_state = True
         self.content = settings.AGENT_CONFIG.to_dict(dump=True)
 
+    @staticmethod
+    def get_spawner():
+        spawner_concurrency = settings.CLIENT_CONFIG.spawner_concurrency
+        if spawner_concurrency:
+            # High volume agents pipeline the k8s calls of all workers
+            return PipelinedSpawner(max_concurrency=spawner_concurrency)
+        return Spawner()
+
     def get_info(self) -> polyaxon_sdk.V1Agent:
         raise NotImplementedError
 
     def get_state(self) -> polyaxon_sdk.V1AgentStateResponse:
         raise NotImplementedError
 
+    def watch_state(
+        self, timeout: float
+    ) -> Optional[polyaxon_sdk.V1AgentStateResponse]:
+        """Long polls the agent state.
+
+        Should return as soon as there's new work or when the timeout elapses,
+        returns `None` if the platform does not support watching the state,
+        in which case the agent falls back to polling.
+        """
+        return None
+
+    def _get_state(self) -> Tuple[polyaxon_sdk.V1AgentStateResponse, bool]:
+        if self._watch_state:
+            try:
+                agent_state = self.watch_state(timeout=self.STATE_WATCH_TIMEOUT)
+                if agent_state is not None:
+                    return agent_state, True
+            except Exception as e:
+                logger.info("Could not watch the agent state: %s", repr(e))
+            logger.info("Falling back to polling the agent state.")
+            self._watch_state = False
+        return self.get_state(), False
+
     def sync_compatible_updates(self, compatible_updates: Dict):
         raise NotImplementedError
 
@@ -92,21 +128,35 @@ class BaseAgent:
         try:
             with exit_context() as exit_event:
                 index = 0
-                workers = get_pool_workers()
+                workers = max(
+                    get_pool_workers(), settings.CLIENT_CONFIG.spawner_concurrency or 0
+                )
 
-                with ThreadPoolExecutor(workers) as pool:
-                    logger.debug("Thread pool Workers: {}".format(workers))
+                with AgentScheduler(workers) as scheduler:
+                    logger.debug("Scheduler Workers: {}".format(workers))
                     timeout = self.sleep_interval or get_wait(index)
                     while not exit_event.wait(timeout=timeout):
                         index += 1
                         self.refresh_spawner()
-                        agent_state = self.process(pool)
+                        agent_state = self.process(scheduler)
                         self._check_status(agent_state)
                         if agent_state.state.full:
                             index = 2
                         self.ping()
-                        timeout = self.sleep_interval or get_wait(index)
-                        logger.info("Sleeping for {} seconds".format(timeout))
+                        logger.debug(
+                            "Scheduler metrics: {}".format(scheduler.get_metrics())
+                        )
+                        logger.debug(
+                            "Status reporter metrics: {}".format(
+                                self.status_reporter.get_metrics()
+                            )
+                        )
+                        if self._watch_state:
+                            # The state request already waited for new work
+                            timeout = 0
+                        else:
+                            timeout = self.sleep_interval or get_wait(index)
+                            logger.info("Sleeping for {} seconds".format(timeout))
         finally:
             self.end()
 
@@ -128,14 +178,16 @@ class BaseAgent:
 
     def end(self, sleep: int = None):
         self._graceful_shutdown = True
+        # Report the pending run statuses before sleeping or exiting
+        self.status_reporter.stop(timeout=settings.CLIENT_CONFIG.timeout)
         if sleep:
             time.sleep(sleep)
         else:
             logger.info("Agent is shutting down.")
 
-    def process(self, pool: "ThreadPoolExecutor") -> polyaxon_sdk.V1AgentStateResponse:
+    def process(self, scheduler: AgentScheduler) -> polyaxon_sdk.V1AgentStateResponse:
         try:
-            agent_state = self.get_state()
+            agent_state, _ = self._get_state()
             if agent_state.compatible_updates:
                 self.sync_compatible_updates(agent_state.compatible_updates)
 
@@ -146,24 +198,23 @@ class BaseAgent:
                 return polyaxon_sdk.V1AgentStateResponse()
 
             state = agent_state.state
-            for run_data in state.schedules or []:
-                pool.submit(self.submit_run, run_data)
-            for run_data in state.queued or []:
-                pool.submit(self.submit_run, run_data)
-            for run_data in state.checks or []:
-                pool.submit(self.check_run, run_data)
-            for run_data in state.stopping or []:
-                pool.submit(self.stop_run, run_data)
-            for run_data in state.apply or []:
-                pool.submit(self.apply_run, run_data)
-            for run_data in state.deleting or []:
-                pool.submit(self.delete_run, run_data)
-            for run_data in state.hooks or []:
-                pool.submit(self.make_and_create_run, run_data)
-            for run_data in state.watchdogs or []:
-                pool.submit(self.make_and_create_run, run_data)
-            for run_data in state.tuners or []:
-                pool.submit(self.make_and_create_run, run_data, True)
+            # Higher priority actions are scheduled first
+            actions = [
+                (AgentActions.STOP, state.stopping, self.stop_run, ()),
+                (AgentActions.DELETE, state.deleting, self.delete_run, ()),
+                (AgentActions.APPLY, state.apply, self.apply_run, ()),
+                (AgentActions.CHECK, state.checks, self.check_run, ()),
+                (AgentActions.SUBMIT, state.schedules, self.submit_run, ()),
+                (AgentActions.SUBMIT, state.queued, self.submit_run, ()),
+                (AgentActions.CREATE, state.hooks, self.make_and_create_run, ()),
+                (AgentActions.CREATE, state.watchdogs, self.make_and_create_run, ()),
+                (AgentActions.CREATE, state.tuners, self.make_and_create_run, (True,)),
+            ]
+            for action, items, fn, args in actions:
+                for run_data in items or []:
+                    # Items in flight are deduped and items above the action's
+                    # limit are rejected, they are picked up with the next state
+                    scheduler.submit(action, run_data[0], fn, run_data, *args)
             return agent_state
         except Exception as exc:
             logger.error(exc)
@@ -239,12 +290,11 @@ class BaseAgent:
         status_condition = V1StatusCondition.get_condition(
             type=status, status=True, reason=reason, message=message
         )
-        self.client.runs_v1.create_run_status(
-            owner=run_owner,
-            project=run_project,
-            uuid=run_uuid,
-            body={"condition": status_condition},
-            async_req=True,
+        self.status_reporter.report(
+            run_owner=run_owner,
+            run_project=run_project,
+            run_uuid=run_uuid,
+            condition=status_condition,
         )
 
     def clean_run(self, run_uuid: str, run_kind: str):
@@ -13,6 +13,9 @@
 # WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
 # See the License for the specific language governing permissions and
 # limitations under the License.
+import copy
+import threading
+
 from typing import Dict
 
 from polyaxon.polyaxonfile import CompiledOperationSpecification, OperationSpecification
@@ -22,6 +25,51 @@ from polyaxon.polypod.compiler.converters import PLATFORM_CONVERTERS
 from polyaxon.schemas.cli.agent_config import AgentConfig
 
 
+class AgentConfigCache:
+    """Keeps the parsed agent config until the agent content changes.
+
+    The connections, secrets and config maps lookups are resolved once per content,
+    every call returns a shallow copy of the cached config that shares them.
+    The conversions only mutate the sidecar, which is cloned for every copy.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._cached = (None, None)
+
+    @staticmethod
+    def _read(agent_content: str) -> AgentConfig:
+        config = AgentConfig.read(agent_content)
+        config.connections_by_names
+        config.secrets
+        config.config_maps
+        return config
+
+    @staticmethod
+    def _copy(config: AgentConfig) -> AgentConfig:
+        config = copy.copy(config)
+        if config.sidecar:
+            config.sidecar = config.sidecar.clone()
+        return config
+
+    def get(self, agent_content: str) -> AgentConfig:
+        content, config = self._cached
+        # The agent passes the same content object until it's updated
+        if config is not None and (
+            agent_content is content or agent_content == content
+        ):
+            return self._copy(config)
+        with self._lock:
+            content, config = self._cached
+            if config is None or agent_content != content:
+                config = self._read(agent_content)
+                self._cached = (agent_content, config)
+        return self._copy(config)
+
+
+AGENT_CONFIG_CACHE = AgentConfigCache()
+
+
 def convert(
     owner_name: str,
     project_name: str,
@@ -36,7 +84,7 @@ def convert(
 
     polypod_config.resolve(
         compiled_operation=compiled_operation,
-        agent_config=AgentConfig.read(agent_content) if agent_content else None,
+        agent_config=AGENT_CONFIG_CACHE.get(agent_content) if agent_content else None,
     )
     return converter.convert(
         compiled_operation=compiled_operation,
@@ -0,0 +1,171 @@
+#!/usr/bin/python
+#
+# Copyright 2018-2022 Polyaxon, Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import itertools
+import threading
+import traceback
+
+from collections import defaultdict
+from enum import Enum
+from queue import PriorityQueue
+from time import time
+from typing import Callable, Dict, Optional
+
+from polyaxon.logger import logger
+
+
+class AgentActions(str, Enum):
+    STOP = "stop"
+    DELETE = "delete"
+    APPLY = "apply"
+    CHECK = "check"
+    SUBMIT = "submit"
+    CREATE = "create"
+
+
+ACTION_PRIORITIES = {
+    AgentActions.STOP: 0,
+    AgentActions.DELETE: 0,
+    AgentActions.APPLY: 1,
+    AgentActions.CHECK: 1,
+    AgentActions.SUBMIT: 2,
+    AgentActions.CREATE: 2,
+}
+
+
+class AgentScheduler:
+    """Prioritized executor of the agent's run actions.
+
+    * A run is only scheduled once per action while it is in flight.
+    * The number of in flight items per action is capped,
+      items above the cap are rejected and picked up with the next agent state.
+    * Stops and deletions are handled before applies and checks,
+      which are handled before submissions.
+
+    Args:
+        workers: int, the number of worker threads.
+        max_in_flight: int, optional, the max number of pending and running
+             items per action, defaults to twice the number of workers.
+    """
+
+    NAME = "polyaxon.AgentScheduler"
+    END_PRIORITY = len(ACTION_PRIORITIES)
+
+    def __init__(self, workers: int, max_in_flight: int = None):
+        self._workers = workers
+        self._max_in_flight = max_in_flight or 2 * workers
+        self._queue = PriorityQueue()
+        self._seq = itertools.count()
+        self._lock = threading.Lock()
+        self._in_flight = set()
+        self._counts = defaultdict(int)
+        self._rejected = defaultdict(int)
+        self._latency = defaultdict(lambda: {"avg": 0, "max": 0, "count": 0})
+        self._threads = []
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, exc_type, exc_value, tb):
+        self.stop()
+
+    @property
+    def depth(self) -> int:
+        """Number of items waiting for a worker."""
+        return self._queue.qsize()
+
+    def get_metrics(self) -> Dict:
+        with self._lock:
+            return {
+                "depth": self.depth,
+                "in_flight": {k.value: v for k, v in self._counts.items()},
+                "rejected": {k.value: v for k, v in self._rejected.items()},
+                "latency": {
+                    k.value: {"avg": v["avg"], "max": v["max"]}
+                    for k, v in self._latency.items()
+                },
+            }
+
+    def submit(self, action: AgentActions, key: str, fn: Callable, *args) -> bool:
+        """Schedules an action, returns `False` if it was deduped or rejected."""
+        with self._lock:
+            if (action, key) in self._in_flight:
+                return False
+            if self._counts[action] >= self._max_in_flight:
+                self._rejected[action] += 1
+                return False
+            self._in_flight.add((action, key))
+            self._counts[action] += 1
+        self._queue.put(
+            (
+                ACTION_PRIORITIES[action],
+                next(self._seq),
+                (action, key, fn, args, time()),
+            )
+        )
+        return True
+
+    def _done(self, action: AgentActions, key: str, created_at: float):
+        latency = time() - created_at
+        with self._lock:
+            self._in_flight.discard((action, key))
+            self._counts[action] -= 1
+            metrics = self._latency[action]
+            metrics["count"] += 1
+            metrics["avg"] += (latency - metrics["avg"]) / metrics["count"]
+            metrics["max"] = max(metrics["max"], latency)
+
+    def _target(self):
+        while True:
+            _, _, item = self._queue.get()
+            try:
+                if item is None:
+                    break
+                action, key, fn, args, created_at = item
+                try:
+                    fn(*args)
+                except Exception as e:
+                    logger.error(
+                        "Agent failed processing %s %s: %s\n%s",
+                        action.value,
+                        key,
+                        repr(e),
+                        traceback.format_exc(),
+                    )
+                finally:
+                    self._done(action, key, created_at)
+            finally:
+                self._queue.task_done()
+
+    def start(self):
+        if self._threads:
+            return
+        for i in range(self._workers):
+            thread = threading.Thread(
+                target=self._target, name="{}.{}".format(self.NAME, i), daemon=True
+            )
+            thread.start()
+            self._threads.append(thread)
+
+    def stop(self, timeout: Optional[float] = None):
+        """Waits for the scheduled items to be processed and stops the workers."""
+        for _ in self._threads:
+            # End events have the lowest priority, pending items are processed first
+            self._queue.put((self.END_PRIORITY, next(self._seq), None))
+        for thread in self._threads:
+            thread.join(timeout=timeout)
+        self._threads = []
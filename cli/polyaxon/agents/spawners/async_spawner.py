@@ -14,7 +14,11 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
-from typing import Dict
+import asyncio
+
+from typing import Any, Awaitable, Dict
+
+from kubernetes.client import Configuration
 
 from polyaxon.agents.spawners.base import BaseSpawner
 from polyaxon.k8s.async_manager import AsyncK8SManager
@@ -22,6 +26,27 @@ from polyaxon.utils.fqn_utils import get_resource_name
 
 
 class AsyncSpawner(BaseSpawner):
+    """Spawner using the async k8s manager.
+
+    The calls awaited through `limit` run with at most `max_concurrency`
+    concurrent requests, the connection pool of the manager is sized accordingly.
+    """
+
+    MAX_CONCURRENCY = 20
+
+    def __init__(
+        self,
+        namespace: str = None,
+        k8s_config: Configuration = None,
+        in_cluster: bool = None,
+        max_concurrency: int = None,
+    ):
+        super().__init__(
+            namespace=namespace, k8s_config=k8s_config, in_cluster=in_cluster
+        )
+        self.max_concurrency = max_concurrency or self.MAX_CONCURRENCY
+        self._semaphore = None
+
     @property
     def k8s_manager(self):
         if not self._k8s_manager:
@@ -31,6 +56,25 @@ class AsyncSpawner(BaseSpawner):
             )
         return self._k8s_manager
 
+    async def setup(self):
+        if not self.k8s_manager.api_client:
+            await self.k8s_manager.setup(
+                k8s_config=self.k8s_config,
+                connection_pool_maxsize=self.max_concurrency,
+            )
+
+    async def close(self):
+        if self._k8s_manager:
+            await self._k8s_manager.close()
+            self._k8s_manager = None
+
+    async def limit(self, coro: Awaitable) -> Any:
+        """Awaits a coroutine within the spawner's concurrency limit."""
+        if self._semaphore is None:
+            self._semaphore = asyncio.Semaphore(self.max_concurrency)
+        async with self._semaphore:
+            return await coro
+
     async def create(self, run_uuid: str, run_kind: str, resource: Dict):
         mixin = self._get_mixin_for_kind(kind=run_kind)
         resource_name = get_resource_name(run_uuid)
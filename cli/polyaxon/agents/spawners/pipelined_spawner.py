@@ -0,0 +1,167 @@
+#!/usr/bin/python
+#
+# Copyright 2018-2022 Polyaxon, Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import asyncio
+import threading
+
+from collections import Counter
+from typing import Any, Awaitable, Dict
+
+from kubernetes.client import Configuration
+from kubernetes.client.rest import ApiException
+from kubernetes_asyncio.client.rest import ApiException as AsyncApiException
+
+from polyaxon.agents.spawners.async_spawner import AsyncSpawner
+from polyaxon.agents.spawners.base import BaseSpawner
+from polyaxon.k8s.manager import K8SManager
+
+
+class PipelinedSpawner(BaseSpawner):
+    """Sync spawner that pipelines the calls of many threads.
+
+    The calls are made by an async spawner running in a dedicated event loop,
+    all threads share its connection pool and its concurrency limit,
+    which allows high volume agents to create many runs at once.
+    Refreshing swaps in a new async spawner,
+    the previous one is closed once its calls in flight are done.
+    """
+
+    NAME = "polyaxon.PipelinedSpawner"
+
+    def __init__(
+        self,
+        namespace: str = None,
+        k8s_config: Configuration = None,
+        in_cluster: bool = None,
+        max_concurrency: int = None,
+    ):
+        super().__init__(
+            namespace=namespace, k8s_config=k8s_config, in_cluster=in_cluster
+        )
+        self.max_concurrency = max_concurrency
+        self.async_spawner = self._get_async_spawner()
+        # Calls in flight by async spawner, only updated in the loop
+        self._calls = Counter()
+        self._lock = threading.Lock()
+        self._loop = None
+        self._thread = None
+
+    @property
+    def k8s_manager(self):
+        # Used for the occasional sync calls, e.g. getting the k8s version
+        if not self._k8s_manager:
+            self._k8s_manager = K8SManager(
+                k8s_config=self.k8s_config,
+                namespace=self.namespace,
+                in_cluster=self.in_cluster,
+            )
+        return self._k8s_manager
+
+    def _get_async_spawner(self) -> AsyncSpawner:
+        return AsyncSpawner(
+            namespace=self.namespace,
+            k8s_config=self.k8s_config,
+            in_cluster=self.in_cluster,
+            max_concurrency=self.max_concurrency,
+        )
+
+    def _get_loop(self) -> asyncio.AbstractEventLoop:
+        with self._lock:
+            if self._loop is None:
+                self._loop = asyncio.new_event_loop()
+                self._thread = threading.Thread(
+                    target=self._loop.run_forever, name=self.NAME, daemon=True
+                )
+                self._thread.start()
+            return self._loop
+
+    def _run(self, coro: Awaitable) -> Any:
+        future = asyncio.run_coroutine_threadsafe(coro, self._get_loop())
+        try:
+            return future.result()
+        except AsyncApiException as e:
+            # Callers handle the exceptions of the sync k8s client
+            exc = ApiException(status=e.status, reason=e.reason)
+            exc.body = e.body
+            exc.headers = e.headers
+            raise exc from e
+
+    async def _call(self, method: str, **kwargs) -> Any:
+        async_spawner = self.async_spawner
+        self._calls[async_spawner] += 1
+        try:
+            await async_spawner.setup()
+            return await async_spawner.limit(getattr(async_spawner, method)(**kwargs))
+        finally:
+            self._calls[async_spawner] -= 1
+            if not self._calls[async_spawner]:
+                del self._calls[async_spawner]
+                if async_spawner is not self.async_spawner:
+                    await async_spawner.close()
+
+    async def _refresh(self):
+        async_spawner = self.async_spawner
+        self.async_spawner = self._get_async_spawner()
+        if not self._calls[async_spawner]:
+            await async_spawner.close()
+
+    async def _close(self):
+        await self.async_spawner.close()
+        # Also close the previous spawners that still have calls in flight
+        for async_spawner in list(self._calls):
+            await async_spawner.close()
+        self._calls.clear()
+
+    def refresh(self):
+        if self._loop is not None:
+            self._run(self._refresh())
+        self._k8s_manager = None
+        return self.k8s_manager
+
+    def close(self):
+        if self._loop is None:
+            return
+        self._run(self._close())
+        self._loop.call_soon_threadsafe(self._loop.stop)
+        self._thread.join()
+        self._loop.close()
+        self._loop = None
+        self._thread = None
+
+    def create(self, run_uuid: str, run_kind: str, resource: Dict) -> Dict:
+        return self._run(
+            self._call(
+                "create", run_uuid=run_uuid, run_kind=run_kind, resource=resource
+            )
+        )
+
+    def apply(self, run_uuid: str, run_kind: str, resource: Dict) -> Dict:
+        return self._run(
+            self._call("apply", run_uuid=run_uuid, run_kind=run_kind, resource=resource)
+        )
+
+    def stop(self, run_uuid: str, run_kind: str):
+        return self._run(self._call("stop", run_uuid=run_uuid, run_kind=run_kind))
+
+    def clean(self, run_uuid: str, run_kind: str):
+        return self.apply(
+            run_uuid=run_uuid,
+            run_kind=run_kind,
+            resource={"metadata": {"finalizers": None}},
+        )
+
+    def get(self, run_uuid: str, run_kind: str):
+        return self._run(self._call("get", run_uuid=run_uuid, run_kind=run_kind))
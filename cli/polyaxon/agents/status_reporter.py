@@ -0,0 +1,167 @@
+#!/usr/bin/python
+#
+# Copyright 2018-2022 Polyaxon, Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+
+import threading
+import time
+
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict
+
+from polyaxon.client.workers.coalescing_worker import CoalescingWorker
+from polyaxon.lifecycle import V1StatusCondition
+from polyaxon.logger import logger
+
+
+class StatusWorker(CoalescingWorker):
+    """Coalescing worker that flushes the pending runs concurrently."""
+
+    NUM_WORKERS = 10
+    NAME = "polyaxon.StatusWorker"
+
+    def __init__(self, callback, merge_callback, num_workers=None, **kwargs):
+        super().__init__(callback=callback, merge_callback=merge_callback, **kwargs)
+        self._num_workers = num_workers or self.NUM_WORKERS
+
+    def flush(self):
+        keys = list(self._pending.keys())
+        if len(keys) > 1 and self._num_workers > 1:
+            with ThreadPoolExecutor(
+                max_workers=min(self._num_workers, len(keys)),
+                thread_name_prefix=self.NAME,
+            ) as executor:
+                list(executor.map(self._flush_key, keys))
+        else:
+            for key in keys:
+                self._flush_key(key)
+        self._last_flush = time.time()
+
+
+class StatusReporter:
+    """Buffers and reports the runs' status transitions in batches.
+
+    Transitions of the same run are collapsed while they are pending,
+    only the latest condition is reported, the pending runs are flushed
+    on an interval and failed requests are retried with a backoff.
+
+    Args:
+        client: PolyaxonClient, the client used to report the statuses.
+        interval: float, optional, seconds to buffer the transitions.
+        num_workers: int, optional, max number of concurrent requests per flush.
+        max_attempts: int, optional, max number of attempts per status.
+    """
+
+    INTERVAL = 1
+    MAX_ATTEMPTS = 3
+    RETRY_BACKOFF = 0.5
+
+    def __init__(
+        self,
+        client,
+        interval: float = None,
+        num_workers: int = None,
+        max_attempts: int = None,
+    ):
+        self.client = client
+        self._interval = interval if interval is not None else self.INTERVAL
+        self._num_workers = num_workers
+        self._max_attempts = max_attempts or self.MAX_ATTEMPTS
+        self._lock = threading.Lock()
+        self._sent = 0
+        self._failed = 0
+        self._merged = 0
+        self._retried = 0
+        self._worker = None
+        # Reports come from all the scheduler threads, they must share one worker
+        self._worker_lock = threading.Lock()
+
+    @property
+    def worker(self) -> StatusWorker:
+        with self._worker_lock:
+            if self._worker is None or not self._worker.is_alive():
+                self._worker = StatusWorker(
+                    callback=self._send,
+                    merge_callback=self._merge,
+                    num_workers=self._num_workers,
+                    worker_interval=self._interval,
+                )
+                self._worker.start()
+            return self._worker
+
+    def get_metrics(self) -> Dict:
+        with self._lock:
+            return {
+                "sent": self._sent,
+                "failed": self._failed,
+                "merged": self._merged,
+                "retried": self._retried,
+            }
+
+    def report(
+        self,
+        run_owner: str,
+        run_project: str,
+        run_uuid: str,
+        condition: V1StatusCondition,
+    ):
+        self.worker.queue(
+            key=run_uuid,
+            data=(run_owner, run_project, condition),
+            request=self._create_run_status,
+            merge=self._latest,
+        )
+
+    @staticmethod
+    def _latest(current, data):
+        return data
+
+    def _merge(self, merge, current, data):
+        with self._lock:
+            self._merged += 1
+        return merge(current, data)
+
+    def _create_run_status(self, run_uuid: str, data):
+        run_owner, run_project, condition = data
+        self.client.runs_v1.create_run_status(
+            owner=run_owner,
+            project=run_project,
+            uuid=run_uuid,
+            body={"condition": condition},
+        )
+
+    def _send(self, request, key, data):
+        for attempt in range(1, self._max_attempts + 1):
+            try:
+                request(key, data)
+                with self._lock:
+                    self._sent += 1
+                return
+            except Exception as e:
+                if attempt >= self._max_attempts:
+                    with self._lock:
+                        self._failed += 1
+                    logger.warning("Could not report the status of run %s: %s", key, e)
+                    return
+                with self._lock:
+                    self._retried += 1
+                time.sleep(self.RETRY_BACKOFF * attempt)
+
+    def stop(self, timeout: float = None):
+        """Flushes the pending transitions and stops the worker."""
+        with self._worker_lock:
+            if self._worker is not None:
+                self._worker.stop(timeout=timeout)
+                self._worker = None
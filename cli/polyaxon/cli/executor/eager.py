@@ -0,0 +1,169 @@
+#!/usr/bin/python
+#
+# Copyright 2018-2022 Polyaxon, Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+
+import os
+import threading
+import time
+
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from typing import Any, Callable, Iterable, List, Set, Tuple
+
+from rich.progress import Progress
+from urllib3.exceptions import ConnectTimeoutError, MaxRetryError, NewConnectionError
+
+from polyaxon.contexts import paths as ctx_paths
+from polyaxon.logger import logger
+from polyaxon.polyflow import V1Operation
+from polyaxon.utils.hashing import hash_value
+from polyaxon.utils.path_utils import check_or_create_path
+from polyaxon.utils.workers_utils import get_pool_workers
+
+
+def get_resume_path(owner: str, project: str, content: str) -> str:
+    return os.path.join(
+        ctx_paths.CONTEXT_USER_POLYAXON_PATH,
+        "eager",
+        "{}.plx.log".format(hash_value((owner, project, content), hash_length=32)),
+    )
+
+
+class EagerRunsSubmitter:
+    """Creates the operations of an eager matrix with a bounded pool of workers.
+
+    The index of every created operation is appended to a resume file,
+    if the submission is interrupted or some operations could not be created,
+    submitting the same matrix again only creates the missing operations.
+    A resume file older than `resume_ttl` seconds is ignored.
+
+    Creating a run is not idempotent, a creation is only retried
+    if the connection could not be established or if the API asked to retry.
+
+    Args:
+        create_run: Callable, creates a run for an operation and returns it.
+        resume_path: str, the path of the resume file.
+        max_workers: int, optional, the max number of concurrent creations.
+        max_attempts: int, optional, the max number of attempts per operation.
+        resume_ttl: int, optional, the max age in seconds of a resume file.
+    """
+
+    MAX_ATTEMPTS = 3
+    RETRY_BACKOFF = 1
+    RETRY_STATUSES = {429, 503}
+    RESUME_TTL = 60 * 60 * 24
+
+    def __init__(
+        self,
+        create_run: Callable[[V1Operation], Any],
+        resume_path: str,
+        max_workers: int = None,
+        max_attempts: int = None,
+        resume_ttl: int = None,
+    ):
+        self._create_run = create_run
+        self._resume_path = resume_path
+        self._max_workers = max_workers or get_pool_workers()
+        self._max_attempts = max_attempts or self.MAX_ATTEMPTS
+        self._resume_ttl = resume_ttl or self.RESUME_TTL
+        self._lock = threading.Lock()
+
+    def get_created(self) -> Set[int]:
+        if not os.path.exists(self._resume_path):
+            return set()
+        if time.time() - os.path.getmtime(self._resume_path) > self._resume_ttl:
+            self.reset()
+            return set()
+        with open(self._resume_path, "r") as f:
+            return {int(line) for line in f if line.strip().isdigit()}
+
+    def reset(self):
+        """Removes the resume file, the next submission creates all operations."""
+        if os.path.exists(self._resume_path):
+            os.remove(self._resume_path)
+
+    @classmethod
+    def should_retry(cls, exc: Exception) -> bool:
+        if isinstance(exc, MaxRetryError):
+            exc = exc.reason
+        # The request was not sent, the run could not have been created
+        if isinstance(exc, (ConnectTimeoutError, NewConnectionError)):
+            return True
+        return getattr(exc, "status", None) in cls.RETRY_STATUSES
+
+    def _mark_created(self, index: int):
+        with self._lock:
+            with open(self._resume_path, "a") as f:
+                f.write("{}\n".format(index))
+
+    def _create(self, index: int, op_spec: V1Operation) -> Any:
+        for attempt in range(1, self._max_attempts + 1):
+            try:
+                run = self._create_run(op_spec)
+                break
+            except Exception as e:
+                if attempt >= self._max_attempts or not self.should_retry(e):
+                    raise
+                logger.debug("Could not create operation %s: %s", index, e)
+                time.sleep(self.RETRY_BACKOFF * attempt)
+        self._mark_created(index)
+        return run
+
+    def submit(
+        self, ops: Iterable[V1Operation], num_ops: int
+    ) -> Tuple[List[Any], List[Tuple[int, Exception]]]:
+        """Creates the operations that were not created by a previous submission.
+
+        Returns the created runs and the failed operations' indices and errors,
+        the resume file is removed once all operations are created.
+        """
+        check_or_create_path(self._resume_path, is_dir=False)
+        created = self.get_created()
+        runs = []
+        failed = []
+        pending = set()
+        pending_indices = {}
+        # Bounds the operations generated ahead of the workers
+        max_pending = 2 * self._max_workers
+
+        def collect(done):
+            for future in done:
+                index = pending_indices.pop(future)
+                try:
+                    runs.append(future.result())
+                except Exception as e:
+                    failed.append((index, e))
+                progress.advance(task)
+
+        with Progress() as progress, ThreadPoolExecutor(
+            max_workers=self._max_workers
+        ) as executor:
+            task = progress.add_task("[cyan]Creating operations:", total=num_ops)
+            progress.advance(task, advance=len(created))
+            for index, op_spec in enumerate(ops):
+                if index in created:
+                    continue
+                if len(pending) >= max_pending:
+                    done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                    collect(done)
+                future = executor.submit(self._create, index, op_spec)
+                pending_indices[future] = index
+                pending.add(future)
+            done, _ = wait(pending)
+            collect(done)
+
+        if not failed:
+            self.reset()
+        return runs, sorted(failed, key=lambda f: f[0])
@@ -14,6 +14,7 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+import os
 import sys
 
 from collections import namedtuple
@@ -67,6 +68,7 @@ def run(
     watch: bool,
     eager: bool,
     output: str = None,
+    eager_restart: bool = False,
 ):
 
     polyaxon_client = RunClient(owner=owner, project=project_name)
@@ -195,7 +197,11 @@ def run(
         upload_run(build_uuid or run_instance.uuid)
 
     if eager:
-        from polyaxon.polyaxonfile.manager import get_eager_matrix_operations
+        from polyaxon.cli.executor.eager import EagerRunsSubmitter, get_resume_path
+        from polyaxon.polyaxonfile.manager import (
+            get_eager_matrix_suggestions,
+            get_ops_from_suggestions,
+        )
 
         refresh_run()
         # Prepare artifacts
@@ -214,14 +220,60 @@ def run(
         delete_run()
         # Suggestions
         Printer.print("Starting eager mode...")
-        for op_spec in get_eager_matrix_operations(
+        num_ops, suggestions = get_eager_matrix_suggestions(
+            compiled_operation=compiled_operation, is_cli=True
+        )
+        ops = get_ops_from_suggestions(
             content=matrix_content,
             compiled_operation=compiled_operation,
-            is_cli=True,
-        ):
-            i_run_instance = create_run(meta_info=run_meta_info)
-            runs_to_watch.append(RunWatchSpec(i_run_instance.uuid, i_run_instance.name))
+            suggestions=suggestions,
+        )
+
+        def create_eager_run(eager_op_spec: V1Operation):
+            # Each creation uses its own run client sharing the same api client
+            return RunClient(
+                owner=owner, project=project_name, client=polyaxon_client.client
+            ).create(
+                name=name,
+                description=description,
+                tags=tags,
+                content=eager_op_spec,
+                meta_info=run_meta_info,
+            )
 
+        resume_path = get_resume_path(owner, project_name, matrix_content)
+        submitter = EagerRunsSubmitter(
+            create_run=create_eager_run, resume_path=resume_path
+        )
+        if eager_restart:
+            submitter.reset()
+        if os.path.exists(resume_path):
+            Printer.print(
+                "Resuming a previous submission of this matrix from `{}`, "
+                "use `--eager-restart` to create all operations again.".format(
+                    resume_path
+                )
+            )
+        else:
+            Printer.print(
+                "The created operations are recorded in `{}`, "
+                "running the same command again resumes an interrupted "
+                "submission.".format(resume_path)
+            )
+        Printer.print_heading("Creating {} operations".format(num_ops))
+        created_runs, failed = submitter.submit(ops, num_ops)
+        runs_to_watch += [RunWatchSpec(r.uuid, r.name) for r in created_runs]
+        if failed:
+            handle_cli_error(
+                failed[0][1],
+                message="Could not create {} out of {} operations, "
+                "running the same command again creates only "
+                "the missing operations recorded in `{}`.".format(
+                    len(failed), num_ops, resume_path
+                ),
+            )
+            sys.exit(1)
+        Printer.print_success("{} operations were created".format(len(created_runs)))
         return
 
     # Check if we need to invoke logs
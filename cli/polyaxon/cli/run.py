@@ -193,6 +193,13 @@ from polyaxon.utils.validation import validate_tags
     "currently this mode supports grid search, random search, and parallel mapping. "
     "Note that this flag requires numpy.",
 )
+@click.option(
+    "--eager-restart",
+    is_flag=True,
+    default=False,
+    help="A flag to ignore the operations created by a previous eager submission "
+    "of the same matrix and create all operations again.",
+)
 @click.option(
     "--git-preset",
     is_flag=True,
@@ -253,6 +260,7 @@ def run(
     cache,
     approved,
     eager,
+    eager_restart,
     git_preset,
     git_revision,
     ignore_template,
@@ -442,4 +450,5 @@ def run(
             eager=eager,
             output=output,
             shell=shell,
+            eager_restart=eager_restart,
         )
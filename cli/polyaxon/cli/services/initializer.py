@@ -18,6 +18,7 @@ import subprocess
 import sys
 
 import click
+import ujson
 
 from marshmallow import ValidationError
 
@@ -303,6 +304,62 @@ def path(
     )
 
 
+@initializer.command()
+@click.option("--connection-kind", help="The connection kind.")
+@click.option("--connection-name", help="The connection name.")
+@click.option(
+    "--manifest",
+    help="A json list of `[path_from, path_to, is_file]` entries to download, "
+    "`is_file` can be null to check the path.",
+)
+@click.option(
+    "--max-concurrency",
+    type=int,
+    help="The max number of concurrent downloads.",
+)
+@click.option(
+    "--raise-errors",
+    is_flag=True,
+    default=False,
+    help="whether or not to raise initialization errors.",
+)
+@click.option(
+    "--sync-fw",
+    is_flag=True,
+    default=False,
+    help="whether or not to sync file watcher after initialization.",
+)
+def paths(
+    connection_kind,
+    connection_name,
+    manifest,
+    max_concurrency,
+    raise_errors,
+    sync_fw,
+):
+    """Create several path contexts in a single process."""
+    from polyaxon.init.artifacts import download_artifacts
+
+    try:
+        manifest = [
+            (path_from, path_to, is_file)
+            for path_from, path_to, is_file in ujson.loads(manifest or "[]")
+        ]
+    except (TypeError, ValueError) as e:
+        Printer.print_error("received a non valid paths manifest.")
+        Printer.print_error("Error message: {}.".format(e))
+        sys.exit(1)
+
+    download_artifacts(
+        connection_name=connection_name,
+        connection_kind=connection_kind,
+        manifest=manifest,
+        raise_errors=raise_errors,
+        sync_fw=sync_fw,
+        max_concurrency=max_concurrency,
+    )
+
+
 @initializer.command()
 @click.option("--port", type=int, help="The connection kind.")
 @click.option("--connection-kind", help="The connection kind.")
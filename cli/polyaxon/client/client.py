@@ -143,6 +143,14 @@ class PolyaxonClient:
     def config(self):
         return self._config
 
+    @property
+    def transport(self):
+        if not self._transport:
+            from polyaxon.client.transport import Transport
+
+            self._transport = Transport(config=self.config)
+        return self._transport
+
     @property
     def projects_v1(self):
         if not self._projects_v1:
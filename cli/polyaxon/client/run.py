@@ -14,8 +14,10 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+import atexit
 import os
 import sys
+import threading
 import time
 import uuid
 
@@ -36,6 +38,7 @@ from polyaxon.api import K8S_V1_LOCATION, STREAMS_V1_LOCATION
 from polyaxon.cli.errors import handle_cli_error
 from polyaxon.client.client import PolyaxonClient
 from polyaxon.client.decorators import client_handler, get_global_or_inline_config
+from polyaxon.client.transport.journal import RequestJournal
 from polyaxon.constants.metadata import META_COPY_ARTIFACTS
 from polyaxon.containers.names import MAIN_CONTAINER_NAMES
 from polyaxon.contexts import paths as ctx_paths
@@ -66,6 +69,7 @@ from polyaxon.utils.fqn_utils import get_entity_full_name, to_fqn_name
 from polyaxon.utils.hashing import hash_dir, hash_file, hash_value
 from polyaxon.utils.http_utils import absolute_uri
 from polyaxon.utils.list_utils import to_list
+from polyaxon.utils.np_utils import sanitize_nested_np_types
 from polyaxon.utils.path_utils import (
     check_or_create_path,
     delete_path,
@@ -126,6 +130,8 @@ class RunClient:
              resolve the values from the environment.
     """
 
+    JOURNAL_REPLAY_INTERVAL = 30
+
     @client_handler(check_no_op=True)
     def __init__(
         self,
@@ -194,6 +200,15 @@ class RunClient:
         self._default_filename_sanitize_paths = []
         self._last_update = None
         self._store = None
+        self._coalesce_updates = get_global_or_inline_config(
+            config_key="coalesce_updates", client=client
+        )
+        self._journal_requests = get_global_or_inline_config(
+            config_key="journal_requests", client=client
+        )
+        self._journal = None
+        self._journal_replay_timer = None
+        self._journal_replay_lock = threading.Lock()
 
     def _set_is_offline(
         self,
@@ -327,11 +342,168 @@ class RunClient:
         self._last_update = (current_time, updates + 1)
         return False
 
+    @staticmethod
+    def _merge_patches(current: List[Dict], patches: List[Dict]) -> List[Dict]:
+        """Merges pending patches, a new body is only started
+        when the merge flag changes, to preserve the reset semantics."""
+        current = list(current)
+        for patch in patches:
+            if not current or current[-1].get("merge") != patch.get("merge"):
+                current.append(patch)
+                continue
+            merged = dict(current[-1])
+            for k, v in patch.items():
+                if not merged.get("merge") or merged.get(k) is None:
+                    merged[k] = v
+                elif k in {"inputs", "outputs", "meta_info"}:
+                    merged[k] = {**merged[k], **v}
+                elif k == "tags":
+                    merged[k] = merged[k] + [t for t in v if t not in merged[k]]
+                else:
+                    merged[k] = v
+            current[-1] = merged
+        return current
+
+    def _send_patches(self, patches: List[Dict]):
+        for patch in patches:
+            self.client.runs_v1.patch_run(
+                owner=self.owner,
+                project=self.project,
+                run_uuid=self.run_uuid,
+                body=patch,
+                async_req=False,
+            )
+
+    @staticmethod
+    def _merge_lineages(current: Dict, lineages: Dict) -> Dict:
+        return {**current, **lineages}
+
+    def _send_lineages(self, lineages: Dict):
+        self.client.runs_v1.create_run_artifacts_lineage(
+            self.owner,
+            self.project,
+            self.run_uuid,
+            body=list(lineages.values()),
+            async_req=False,
+        )
+
+    def _get_journal(self, path: str = None) -> RequestJournal:
+        if not path:
+            if settings.CLIENT_CONFIG.is_managed:
+                path = ctx_paths.CONTEXT_MOUNT_ARTIFACTS_FORMAT.format(self.run_uuid)
+            else:
+                path = ctx_paths.get_offline_path(
+                    entity_value=self.run_uuid,
+                    entity_kind=V1ProjectFeature.RUNTIME,
+                )
+        return RequestJournal(
+            path=os.path.join(path, ctx_paths.CONTEXT_LOCAL_JOURNAL),
+            merges={"patch": self._merge_patches, "lineage": self._merge_lineages},
+        )
+
+    @property
+    def journal(self) -> Optional[RequestJournal]:
+        if not self._journal_requests:
+            return None
+        if not self._journal:
+            self._journal = self._get_journal()
+        return self._journal
+
+    def _replay_journal(self, journal: RequestJournal = None) -> bool:
+        journal = journal or self.journal
+        if not journal or not len(journal):
+            return True
+        try:
+            journal.replay(
+                {"patch": self._send_patches, "lineage": self._send_lineages}
+            )
+            logger.info("Journal data for run {} synced".format(self.run_uuid))
+            return True
+        except Exception as e:
+            logger.debug("Journal replay failed, exp: %s", e)
+            return False
+
+    def _replay_journal_on_timer(self):
+        if not self._replay_journal():
+            self._schedule_journal_replay()
+
+    def _schedule_journal_replay(self):
+        """Replays the journal on a timer until it's empty, and on exit,
+        the records appended after the last request are not left behind."""
+        with self._journal_replay_lock:
+            timer = self._journal_replay_timer
+            if timer is None:
+                atexit.register(self._replay_journal)
+            elif timer.is_alive() and timer is not threading.current_thread():
+                return
+            timer = threading.Timer(
+                self.JOURNAL_REPLAY_INTERVAL, self._replay_journal_on_timer
+            )
+            timer.daemon = True
+            timer.start()
+            self._journal_replay_timer = timer
+
+    def _append_to_journal(self, kind: str, data: Any):
+        self.journal.append(kind, data)
+        self._schedule_journal_replay()
+
+    def _send_or_journal(self, kind: str, data: Any, request):
+        """Sends a request, the request is appended to the journal if it fails,
+        or if the journal has pending records that could not be replayed."""
+        if not self._replay_journal():
+            self._append_to_journal(kind, data)
+            return
+        try:
+            request(data)
+        except Exception as e:
+            logger.debug("Request failed, adding it to the journal, exp: %s", e)
+            self._append_to_journal(kind, data)
+
+    def _send_or_journal_patches(self, patches: List[Dict]):
+        self._send_or_journal(
+            "patch",
+            self.client.sanitize_for_serialization(sanitize_nested_np_types(patches)),
+            self._send_patches,
+        )
+
+    def _send_or_journal_lineages(self, lineages: Dict):
+        self._send_or_journal(
+            "lineage",
+            self.client.sanitize_for_serialization(lineages),
+            self._send_lineages,
+        )
+
+    @client_handler(check_no_op=True, check_offline=True)
+    def sync_journal(self) -> bool:
+        """Replays the requests that were added to the journal
+        while the API was not reachable.
+
+        Returns:
+            bool, True if the journal is empty after the sync.
+        """
+        return self._replay_journal()
+
     def _update(
         self, data: Union[Dict, polyaxon_sdk.V1Run], async_req: bool = True
     ) -> polyaxon_sdk.V1Run:
         if self._is_offline:
             return self.run_data
+        use_transport = self._coalesce_updates or self._journal_requests
+        if async_req and use_transport and isinstance(data, Mapping):
+            self.client.transport.async_coalesce(
+                key=(self.run_uuid, "patch"),
+                data=[data],
+                request=(
+                    self._send_or_journal_patches
+                    if self._journal_requests
+                    else self._send_patches
+                ),
+                merge=self._merge_patches,
+            )
+            return self.run_data
+        if use_transport:
+            # A pending coalesced patch must not be sent after, and override, this one
+            self.client.transport.flush_coalesced((self.run_uuid, "patch"))
         response = self.client.runs_v1.patch_run(
             owner=self.owner,
             project=self.project,
@@ -2242,6 +2414,22 @@ class RunClient:
                     b = V1RunArtifact.read(b)
                 self._artifacts_lineage[b.name] = b
             return
+        if async_req and (self._coalesce_updates or self._journal_requests):
+            lineages = {}
+            for b in to_list(body, check_none=True):
+                name = b.name if isinstance(b, V1RunArtifact) else b.get("name")
+                lineages[name] = b
+            self.client.transport.async_coalesce(
+                key=(self.run_uuid, "lineage"),
+                data=lineages,
+                request=(
+                    self._send_or_journal_lineages
+                    if self._journal_requests
+                    else self._send_lineages
+                ),
+                merge=self._merge_lineages,
+            )
+            return
         self.client.runs_v1.create_run_artifacts_lineage(
             self.owner,
             self.project,
@@ -2663,6 +2851,8 @@ class RunClient:
             async_req=False,
         )
         logger.info(f"Offline data for run {self.run_data.uuid} synced")
+        if path:
+            self._replay_journal(journal=self._get_journal(path))
         if self._artifacts_lineage:
             self.log_artifact_lineage(
                 [l for l in self._artifacts_lineage.values()], async_req=False
@@ -14,6 +14,7 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+from polyaxon.client.transport.coalescing_transport import CoalescingTransportMixin
 from polyaxon.client.transport.http_transport import HttpTransportMixin
 from polyaxon.client.transport.periodic_transport import (
     PeriodicHttpTransportMixin,
@@ -28,6 +29,7 @@ class Transport(
     PeriodicHttpTransportMixin,
     PeriodicWSTransportMixin,
     ThreadedTransportMixin,
+    CoalescingTransportMixin,
     SocketTransportMixin,
 ):
     """Transport for handling http/ws operations."""
@@ -0,0 +1,106 @@
+#!/usr/bin/python
+#
+# Copyright 2018-2022 Polyaxon, Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from polyaxon import settings
+from polyaxon.client.workers.coalescing_worker import CoalescingWorker
+from polyaxon.logger import logger
+
+
+class CoalescingTransportMixin:
+    """Coalescing operations transport.
+
+    Requests queued with the same key are merged and sent as a single request.
+    """
+
+    @property
+    def coalescing_merged(self):
+        if hasattr(self, "_coalescing_merged"):
+            return self._coalescing_merged
+        return None
+
+    @property
+    def coalescing_sent(self):
+        if hasattr(self, "_coalescing_sent"):
+            return self._coalescing_sent
+        return None
+
+    @property
+    def coalescing_exceptions(self):
+        if hasattr(self, "_coalescing_exceptions"):
+            return self._coalescing_exceptions
+        return None
+
+    def _init_coalescing_counters(self):
+        if not hasattr(self, "_coalescing_merged"):
+            self._coalescing_merged = 0
+            self._coalescing_sent = 0
+            self._coalescing_exceptions = 0
+
+    def merge_coalesced_request(self, merge, current, data):
+        self._coalescing_merged += 1
+        return merge(current, data)
+
+    def queue_coalesced_request(self, request, key, data):
+        try:
+            request(data)
+        except Exception as e:
+            self._coalescing_exceptions += 1
+            logger.debug(
+                "Error making coalesced request key: %s, data: %s, exp: %s",
+                key,
+                data,
+                e,
+            )
+        finally:
+            self._coalescing_sent += 1
+
+    @property
+    def coalescing_worker(self):
+        if not hasattr(self, "_coalescing_worker") or (
+            not self._coalescing_worker.is_alive()
+        ):
+            self._init_coalescing_counters()
+            self._coalescing_worker = CoalescingWorker(
+                callback=self.queue_coalesced_request,
+                merge_callback=self.merge_coalesced_request,
+                worker_interval=settings.CLIENT_CONFIG.coalesce_interval,
+                worker_timeout=settings.CLIENT_CONFIG.timeout,
+            )
+            self._coalescing_worker.start()
+        return self._coalescing_worker
+
+    def async_coalesce(self, key, data, request, merge):
+        """Queues a request to be merged with pending requests of the same key.
+
+        Args:
+            key: hashable, requests with the same key are merged.
+            data: the payload of the request.
+            request: callable, called with the merged payload on flush.
+            merge: callable, called with the pending and the new payloads,
+                 it should return the merged payload.
+        """
+        return self.coalescing_worker.queue(
+            key=key, data=data, request=request, merge=merge
+        )
+
+    def flush_coalesced(self, key):
+        """Sends the pending requests of a key, and waits until they are sent."""
+        if not hasattr(self, "_coalescing_worker"):
+            return
+        if not self._coalescing_worker.flush_key(
+            key, timeout=settings.CLIENT_CONFIG.timeout
+        ):
+            logger.debug("Timed out flushing the coalesced requests key: %s", key)
@@ -0,0 +1,145 @@
+#!/usr/bin/python
+#
+# Copyright 2018-2022 Polyaxon, Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import os
+import threading
+
+from typing import Any, Callable, Dict, List, Tuple
+
+import ujson
+
+from polyaxon.logger import logger
+from polyaxon.utils.path_utils import check_or_create_path
+
+
+class RequestJournal:
+    """Write-ahead journal of requests that could not be sent.
+
+    Every record has a kind and a payload, records of the same kind are compacted
+    using the merge function of that kind, the order of first appearance
+    of the kinds is preserved.
+
+    Args:
+        path: str, the journal file path.
+        merges: Dict[str, Callable], merge function by record kind.
+        compact_size: int, optional, number of records that triggers a compaction.
+    """
+
+    COMPACT_SIZE = 100
+
+    def __init__(
+        self,
+        path: str,
+        merges: Dict[str, Callable[[Any, Any], Any]],
+        compact_size: int = None,
+    ):
+        self._path = path
+        self._merges = merges
+        self._compact_size = compact_size or self.COMPACT_SIZE
+        self._lock = threading.RLock()
+        self._size = None
+
+    @property
+    def path(self) -> str:
+        return self._path
+
+    def __len__(self):
+        with self._lock:
+            if self._size is None:
+                self._size = len(self._read())
+            return self._size
+
+    def _read(self) -> List[Tuple[str, Any]]:
+        if not os.path.isfile(self._path):
+            return []
+        records = []
+        with open(self._path, "r") as f:
+            for line in f:
+                line = line.strip()
+                if not line:
+                    continue
+                try:
+                    record = ujson.loads(line)
+                except ValueError:
+                    # A partial line can be written if the process was killed
+                    logger.debug("Skipping corrupted journal record: %s", line)
+                    continue
+                records.append((record["kind"], record["data"]))
+        return records
+
+    def _write(self, records: List[Tuple[str, Any]]):
+        tmp_path = "{}.tmp".format(self._path)
+        with open(tmp_path, "w") as f:
+            for kind, data in records:
+                f.write(ujson.dumps({"kind": kind, "data": data}) + "\n")
+        os.replace(tmp_path, self._path)
+        self._size = len(records)
+
+    def append(self, kind: str, data: Any):
+        with self._lock:
+            check_or_create_path(self._path, is_dir=False)
+            line = ujson.dumps({"kind": kind, "data": data}) + "\n"
+            with open(self._path, "ab+") as f:
+                if f.tell():
+                    f.seek(-1, os.SEEK_END)
+                    if f.read(1) != b"\n":
+                        # Do not append to a partial line written by a killed process
+                        line = "\n" + line
+                f.write(line.encode("utf-8"))
+            if self._size is not None:
+                self._size += 1
+            if len(self) >= self._compact_size:
+                self.compact()
+
+    def compact(self) -> List[Tuple[str, Any]]:
+        with self._lock:
+            records = self.compacted()
+            self._write(records)
+            return records
+
+    def compacted(self) -> List[Tuple[str, Any]]:
+        with self._lock:
+            values = {}
+            for kind, data in self._read():
+                if kind in values:
+                    values[kind] = self._merges[kind](values[kind], data)
+                else:
+                    values[kind] = data
+            return list(values.items())
+
+    def replay(self, callbacks: Dict[str, Callable[[Any], None]]):
+        """Replays the compacted records in order.
+
+        The records that were sent are removed,
+        if a callback fails the remaining records are kept in the journal.
+        """
+        with self._lock:
+            records = self.compacted()
+            while records:
+                kind, data = records[0]
+                try:
+                    callbacks[kind](data)
+                except Exception:
+                    self._write(records)
+                    raise
+                records = records[1:]
+            self.clear()
+
+    def clear(self):
+        with self._lock:
+            if os.path.isfile(self._path):
+                os.remove(self._path)
+            self._size = 0
@@ -14,8 +14,11 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+import threading
+
 from polyaxon import settings
 from polyaxon.client.transport.retry_transport import RetryTransportMixin
+from polyaxon.client.workers.pool_worker import PoolWorker
 from polyaxon.client.workers.queue_worker import QueueWorker
 from polyaxon.logger import logger
 
@@ -23,6 +26,9 @@ from polyaxon.logger import logger
 class ThreadedTransportMixin(RetryTransportMixin):
     """Threads operations transport."""
 
+    # The pool worker calls `queue_request` from several lanes
+    _threaded_lock = threading.Lock()
+
     @property
     def threaded_done(self):
         if hasattr(self, "_threaded_done"):
@@ -39,7 +45,8 @@ class ThreadedTransportMixin(RetryTransportMixin):
         try:
             request(url=url, session=self.retry_session, **kwargs)
         except Exception as e:
-            self._threaded_exceptions += 1
+            with self._threaded_lock:
+                self._threaded_exceptions += 1
             logger.debug(
                 "Error making request url: %s, params: params %s, exp: %s",
                 url,
@@ -47,15 +54,62 @@ class ThreadedTransportMixin(RetryTransportMixin):
                 e,
             )
         finally:
-            self._threaded_done += 1
+            with self._threaded_lock:
+                self._threaded_done += 1
+
+    @property
+    def threaded_depth(self):
+        if hasattr(self, "_worker") and isinstance(self._worker, PoolWorker):
+            return self._worker.depth
+        if hasattr(self, "_worker"):
+            return self._worker._queue.qsize()  # pylint:disable=protected-access
+        return None
+
+    @property
+    def threaded_latency(self):
+        if hasattr(self, "_worker") and isinstance(self._worker, PoolWorker):
+            return self._worker.latency
+        return None
+
+    @property
+    def threaded_dropped(self):
+        if hasattr(self, "_worker") and isinstance(self._worker, PoolWorker):
+            return self._worker.dropped
+        return None
+
+    def queue_pool_request(self, method, url, **kwargs):
+        self.queue_request(request=getattr(self, method), url=url, **kwargs)
 
     @property
     def worker(self):
         if not hasattr(self, "_worker") or not self._worker.is_alive():
-            self._worker = QueueWorker(timeout=settings.CLIENT_CONFIG.timeout)
+            if settings.CLIENT_CONFIG.transport_workers:
+                self._worker = PoolWorker(
+                    callback=self.queue_pool_request,
+                    num_workers=settings.CLIENT_CONFIG.transport_workers,
+                    queue_size=settings.CLIENT_CONFIG.transport_queue_size,
+                    full_policy=settings.CLIENT_CONFIG.transport_full_policy,
+                    timeout=settings.CLIENT_CONFIG.timeout,
+                )
+            else:
+                self._worker = QueueWorker(timeout=settings.CLIENT_CONFIG.timeout)
             self._worker.start()
         return self._worker
 
+    def _queue_async(self, method, url, **kwargs):
+        worker = self.worker
+        if isinstance(worker, PoolWorker):
+            return worker.queue(
+                key=url,
+                is_upload=method == "upload",
+                method=method,
+                url=url,
+                **kwargs,
+            )
+        return worker.queue(
+            self.queue_request, request=getattr(self, method), url=url, **kwargs
+        )
+
     def async_post(
         self,
         url,
@@ -67,9 +121,8 @@ class ThreadedTransportMixin(RetryTransportMixin):
         headers=None,
     ):
         """Async Call request with a post."""
-        return self.worker.queue(
-            self.queue_request,
-            request=self.post,
+        return self._queue_async(
+            "post",
             url=url,
             params=params,
             data=data,
@@ -90,9 +143,8 @@ class ThreadedTransportMixin(RetryTransportMixin):
         headers=None,
     ):
         """Async Call request with a patch."""
-        return self.worker.queue(
-            self.queue_request,
-            request=self.patch,
+        return self._queue_async(
+            "patch",
             url=url,
             params=params,
             data=data,
@@ -113,9 +165,8 @@ class ThreadedTransportMixin(RetryTransportMixin):
         headers=None,
     ):
         """Async Call request with a delete."""
-        return self.worker.queue(
-            self.queue_request,
-            request=self.delete,
+        return self._queue_async(
+            "delete",
             url=url,
             params=params,
             data=data,
@@ -136,9 +187,8 @@ class ThreadedTransportMixin(RetryTransportMixin):
         headers=None,
     ):
         """Async Call request with a put."""
-        return self.worker.queue(
-            self.queue_request,
-            request=self.put,
+        return self._queue_async(
+            "put",
             url=url,
             params=params,
             data=data,
@@ -158,9 +208,8 @@ class ThreadedTransportMixin(RetryTransportMixin):
         timeout=3600,
         headers=None,
     ):
-        return self.worker.queue(
-            self.queue_request,
-            request=self.upload,
+        return self._queue_async(
+            "upload",
             url=url,
             files=files,
             files_size=files_size,
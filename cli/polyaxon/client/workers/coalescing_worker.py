@@ -0,0 +1,146 @@
+#!/usr/bin/python
+#
+# Copyright 2018-2022 Polyaxon, Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import threading
+
+from queue import Empty
+from time import time
+
+from polyaxon import settings
+from polyaxon.client.workers.queue_worker import QueueWorker
+from polyaxon.logger import logger
+
+
+class CoalescingWorker(QueueWorker):
+    """Worker that merges pending records sharing the same key.
+
+    Every record is queued with a key, a merge function and a request function.
+    Records with the same key are merged while they are pending,
+    and are flushed using the request of the latest record,
+    either when the batch size is reached or when the interval elapses.
+    """
+
+    BATCH_SIZE = 100
+    FLUSH_KEY_EVENT = object()
+    NAME = "polyaxon.CoalescingWorker"
+
+    def __init__(
+        self,
+        callback,
+        merge_callback,
+        worker_interval=None,
+        batch_size=None,
+        worker_timeout=None,
+        queue_size=None,
+    ):
+        super().__init__(timeout=worker_timeout, queue_size=queue_size)
+        self._interval = (
+            worker_interval
+            if worker_interval is not None
+            else settings.CLIENT_CONFIG.coalesce_interval
+        )
+        self._batch_size = batch_size or self.BATCH_SIZE
+        self._callback = callback
+        self._merge_callback = merge_callback
+        self._pending = {}
+        self._pending_counts = {}
+        self._last_flush = time()
+
+    @property
+    def pending_size(self):
+        return len(self._pending)
+
+    def queue(self, key, data, request, merge):  # pylint:disable=arguments-differ
+        self.is_running()
+        self._queue.put_nowait((key, data, request, merge))
+
+    def flush_key(self, key, timeout=None) -> bool:
+        """Sends the pending records of a key and waits until they are processed.
+
+        The flush is queued behind the records already queued,
+        it's used before a synchronous request to not have a pending record
+        of the same key sent after it.
+
+        Returns:
+            bool, False if the flush did not finish before the timeout.
+        """
+        if not self.is_alive():
+            return True
+        if threading.current_thread() is self._thread:
+            # Called from a request callback, waiting would block the worker
+            if key in self._pending:
+                self._flush_key(key)
+            return True
+        done = threading.Event()
+        self._queue.put_nowait((self.FLUSH_KEY_EVENT, key, done))
+        return done.wait(timeout=timeout)
+
+    def _add(self, key, data, request, merge):
+        if not self._pending:
+            # The time budget starts with the first pending record
+            self._last_flush = time()
+        if key in self._pending:
+            current, _, _ = self._pending[key]
+            data = self._merge_callback(merge=merge, current=current, data=data)
+            self._pending_counts[key] += 1
+        else:
+            self._pending_counts[key] = 1
+        self._pending[key] = (data, request, merge)
+        if self._pending_counts[key] >= self._batch_size:
+            self._flush_key(key)
+
+    def _flush_key(self, key):
+        data, request, _ = self._pending.pop(key)
+        self._pending_counts.pop(key, None)
+        try:
+            self._callback(request=request, key=key, data=data)
+        except Exception:
+            logger.error("Failed processing job", exc_info=True)
+
+    def flush(self):
+        for key in list(self._pending.keys()):
+            self._flush_key(key)
+        self._last_flush = time()
+
+    def _get_wait(self):
+        if not self._pending:
+            return None
+        return max(self._interval - (time() - self._last_flush), 0)
+
+    def _target(self):
+        while True:
+            try:
+                record = self._queue.get(timeout=self._get_wait())
+            except Empty:
+                self.flush()
+                continue
+            try:
+                if record is self.END_EVENT:
+                    # Flush all pending records before marking the end event as done
+                    self.flush()
+                    break
+                if record[0] is self.FLUSH_KEY_EVENT:
+                    _, key, done = record
+                    if key in self._pending:
+                        self._flush_key(key)
+                    done.set()
+                    continue
+                self._add(*record)
+            finally:
+                self._queue.task_done()
+
+            if time() - self._last_flush >= self._interval:
+                self.flush()
@@ -0,0 +1,278 @@
+#!/usr/bin/python
+#
+# Copyright 2018-2022 Polyaxon, Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import atexit
+import os
+import shutil
+import tempfile
+import threading
+import zlib
+
+from enum import Enum
+from queue import Empty, Full, Queue
+from time import time
+
+import ujson
+
+from polyaxon import settings
+from polyaxon.client.workers.base_worker import BaseWorker
+from polyaxon.logger import logger
+
+
+class QueueFullPolicy(str, Enum):
+    BLOCK = "block"
+    DROP_OLDEST = "drop_oldest"
+    SPILL = "spill"
+
+
+class SpillQueue:
+    """A FIFO of json records backed by an append only file."""
+
+    def __init__(self, path: str):
+        self._path = path
+        self._read_offset = 0
+        self._size = 0
+
+    def __len__(self):
+        return self._size
+
+    def put(self, record):
+        line = ujson.dumps(record)
+        with open(self._path, "a") as f:
+            f.write(line + "\n")
+        self._size += 1
+
+    def get(self):
+        if not self._size:
+            raise Empty
+        with open(self._path, "r") as f:
+            f.seek(self._read_offset)
+            line = f.readline()
+            self._read_offset = f.tell()
+        self._size -= 1
+        if not self._size:
+            # All records were consumed, reset the file
+            open(self._path, "w").close()
+            self._read_offset = 0
+        return ujson.loads(line)
+
+
+class _Lane:
+    def __init__(self, name, queue_size, full_policy, spill_path):
+        self.name = name
+        self.queue = Queue(queue_size)
+        self.full_policy = full_policy
+        self.spill = (
+            SpillQueue(os.path.join(spill_path, "{}.jsonl".format(name)))
+            if full_policy == QueueFullPolicy.SPILL
+            else None
+        )
+        self.lock = threading.Lock()
+        self.thread = None
+
+    @property
+    def depth(self):
+        return self.queue.qsize() + (len(self.spill) if self.spill else 0)
+
+
+class PoolWorker(BaseWorker):
+    """Worker that dispatches records to a pool of bounded lanes.
+
+    Records with the same key are always handled by the same lane,
+    which preserves their ordering, uploads use dedicated lanes
+    to not block the small json requests.
+    """
+
+    NUM_WORKERS = 4
+    NUM_UPLOAD_WORKERS = 1
+    QUEUE_SIZE = 1000
+    END_EVENT = object()
+    NAME = "polyaxon.PoolWorker"
+
+    def __init__(
+        self,
+        callback,
+        num_workers=None,
+        num_upload_workers=None,
+        queue_size=None,
+        full_policy=None,
+        spill_path=None,
+        timeout=None,
+    ):
+        super().__init__()
+        self._callback = callback
+        self._timeout = (
+            timeout if timeout is not None else settings.CLIENT_CONFIG.timeout
+        )
+        full_policy = QueueFullPolicy(full_policy or QueueFullPolicy.BLOCK)
+        queue_size = queue_size or self.QUEUE_SIZE
+        # The spill dir is only removed on exit if it was created by the worker
+        self._spill_path = None
+        if full_policy == QueueFullPolicy.SPILL:
+            if not spill_path:
+                spill_path = tempfile.mkdtemp(prefix="plx-spill-")
+                self._spill_path = spill_path
+            os.makedirs(spill_path, exist_ok=True)
+        self._lanes = [
+            _Lane("worker-{}".format(i), queue_size, full_policy, spill_path)
+            for i in range(num_workers or self.NUM_WORKERS)
+        ]
+        # Uploads are not json serializable, they are never spilled
+        self._upload_lanes = [
+            _Lane("upload-{}".format(i), queue_size, QueueFullPolicy.BLOCK, None)
+            for i in range(num_upload_workers or self.NUM_UPLOAD_WORKERS)
+        ]
+        self._dropped = 0
+        self._latency = 0
+        self._latency_max = 0
+        self._latency_count = 0
+        self._metrics_lock = threading.Lock()
+
+    @property
+    def depth(self):
+        return sum(lane.depth for lane in self._lanes + self._upload_lanes)
+
+    @property
+    def dropped(self):
+        return self._dropped
+
+    @property
+    def latency(self):
+        """Average and max seconds between queuing and processing a record."""
+        return {"avg": self._latency, "max": self._latency_max}
+
+    def _all_lanes(self):
+        return self._lanes + self._upload_lanes
+
+    def is_alive(self):
+        if self._thread_for_pid != os.getpid():
+            return False
+        return all(lane.thread and lane.thread.is_alive() for lane in self._all_lanes())
+
+    def start(self):
+        with self._lock:
+            if not self.is_alive():
+                if self._spill_path:
+                    os.makedirs(self._spill_path, exist_ok=True)
+                for lane in self._all_lanes():
+                    lane.thread = threading.Thread(
+                        target=self._target,
+                        args=(lane,),
+                        name="{}.{}".format(self.NAME, lane.name),
+                        daemon=True,
+                    )
+                    lane.thread.start()
+                self._thread_for_pid = os.getpid()
+        atexit.register(self.atexit)
+
+    def _get_lane(self, key, is_upload=False):
+        lanes = self._upload_lanes if is_upload else self._lanes
+        return lanes[zlib.crc32(str(key).encode()) % len(lanes)]
+
+    def queue(self, key, is_upload=False, **kwargs):  # pylint:disable=arguments-differ
+        self.is_running()
+        lane = self._get_lane(key, is_upload=is_upload)
+        record = (time(), kwargs)
+        if lane.full_policy == QueueFullPolicy.BLOCK:
+            lane.queue.put(record)
+            return
+        with lane.lock:
+            if lane.full_policy == QueueFullPolicy.SPILL:
+                if len(lane.spill) or lane.queue.full():
+                    try:
+                        lane.spill.put(record)
+                        return
+                    except (TypeError, OverflowError, ValueError):
+                        logger.debug("Record could not be spilled, blocking.")
+                else:
+                    lane.queue.put_nowait(record)
+                    return
+            else:
+                try:
+                    lane.queue.put_nowait(record)
+                    return
+                except Full:
+                    try:
+                        lane.queue.get_nowait()
+                        lane.queue.task_done()
+                        with self._metrics_lock:
+                            self._dropped += 1
+                    except Empty:
+                        pass
+                    lane.queue.put_nowait(record)
+                    return
+        lane.queue.put(record)
+
+    def _get_record(self, lane):
+        if lane.spill is not None:
+            with lane.lock:
+                if lane.queue.empty() and len(lane.spill):
+                    return lane.spill.get(), False
+        return lane.queue.get(), True
+
+    def _process(self, record):
+        created_at, kwargs = record
+        try:
+            self._callback(**kwargs)
+        except Exception:
+            logger.error("Failed processing job", exc_info=True)
+        latency = time() - created_at
+        with self._metrics_lock:
+            self._latency_count += 1
+            self._latency += (latency - self._latency) / self._latency_count
+            self._latency_max = max(self._latency_max, latency)
+
+    def _target(self, lane):
+        while True:
+            record, from_queue = self._get_record(lane)
+            try:
+                if record is self.END_EVENT:
+                    # Drain spilled records before exiting
+                    while lane.spill is not None and len(lane.spill):
+                        self._process(lane.spill.get())
+                    break
+                self._process(record)
+            finally:
+                if from_queue:
+                    lane.queue.task_done()
+
+    def atexit(self):
+        with self._lock:
+            if not self.is_alive():
+                return
+            end = time() + self._timeout
+            for lane in self._all_lanes():
+                try:
+                    lane.queue.put(self.END_EVENT, timeout=max(end - time(), 0))
+                except Full:
+                    logger.debug("Lane %s is full, it can't be stopped.", lane.name)
+            for lane in self._all_lanes():
+                lane.thread.join(timeout=max(end - time(), 0))
+
+            size = self.depth
+            if size > 0:
+                print(
+                    "Polyaxon %s timed out and did not manage to send %i messages"
+                    % (self.NAME, size)
+                )
+            elif self._spill_path and not any(
+                lane.thread.is_alive() for lane in self._all_lanes()
+            ):
+                shutil.rmtree(self._spill_path, ignore_errors=True)
+            self._thread_for_pid = None
+
+    def stop(self, timeout=None):
+        self.atexit()
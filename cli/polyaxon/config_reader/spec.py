@@ -21,6 +21,7 @@ import yaml
 
 from collections.abc import Mapping
 from requests import HTTPError
+from typing import Dict, Optional, Tuple
 from yaml.parser import ParserError
 from yaml.scanner import ScannerError
 
@@ -121,11 +122,24 @@ class ConfigSpec:
 
 
 def _read_from_url(url: str):
+    config, _ = fetch_url(url)
+    return config
+
+
+def fetch_url(url: str, etag: str = None) -> Tuple[Optional[Dict], Optional[str]]:
+    """Reads a config from a url, returns the config and the etag of the response.
+
+    If an etag is provided and the content did not change,
+    the config is `None` and the same etag is returned.
+    """
     from polyaxon.utils.requests_utils import safe_request
 
-    resp = safe_request(url)
+    headers = {"If-None-Match": etag} if etag else None
+    resp = safe_request(url, headers=headers)
+    if etag and resp.status_code == 304:
+        return None, etag
     resp.raise_for_status()
-    return _read_from_stream(resp.content.decode())
+    return _read_from_stream(resp.content.decode()), resp.headers.get("ETag")
 
 
 def get_default_registry():
@@ -135,7 +149,8 @@ def get_default_registry():
     )
 
 
-def _read_from_public_hub(hub: str):
+def get_public_hub_info(hub: str) -> Tuple[str, str, str]:
+    """Returns the registry, the name and the version of a public hub reference."""
     hub_values = hub.split(":")
     if len(hub_values) > 2:
         raise PolyaxonSchemaError("Received an invalid hub reference: `{}`".format(hub))
@@ -144,10 +159,21 @@ def _read_from_public_hub(hub: str):
     else:
         hub_name, version = hub_values[0], "latest"
     version = version or "latest"
-    registry = get_default_registry()
+    return get_default_registry(), hub_name, version
+
+
+def _read_from_public_hub(hub: str):
+    config, _ = fetch_public_hub(hub)
+    return config
+
+
+def fetch_public_hub(
+    hub: str, etag: str = None
+) -> Tuple[Optional[Dict], Optional[str]]:
+    registry, hub_name, version = get_public_hub_info(hub)
     url = "{}/{}/{}.yaml".format(registry, hub_name, version)
     try:
-        return _read_from_url(url)
+        return fetch_url(url, etag=etag)
     except HTTPError as e:
         if e.response.status_code == 404:
             raise PolyaxonClientException(
@@ -37,6 +37,7 @@ CONTEXT_RELATED_RUNS = "_related_runs"
 
 # Local contexts
 CONTEXT_LOCAL_LINEAGES = "lineages.plx.json"
+CONTEXT_LOCAL_JOURNAL = "journal.plx.jsonl"
 CONTEXT_LOCAL_CONTENT = "content.plx.json"
 CONTEXT_LOCAL_README = "readme.plx.md"
 CONTEXT_LOCAL_POLYAXONFILE = "polyaxonfile.plx.md"
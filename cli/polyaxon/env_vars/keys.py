@@ -26,6 +26,22 @@ EV_KEYS_TRACKING_TIMEOUT = "POLYAXON_TRACKING_TIMEOUT"
 EV_KEYS_TIME_ZONE = "POLYAXON_TIME_ZONE"
 EV_KEYS_WATCH_INTERVAL = "POLYAXON_WATCH_INTERVAL"
 EV_KEYS_INTERVAL = "POLYAXON_INTERVAL"
+EV_KEYS_COALESCE_UPDATES = "POLYAXON_COALESCE_UPDATES"
+EV_KEYS_COALESCE_INTERVAL = "POLYAXON_COALESCE_INTERVAL"
+EV_KEYS_TRANSPORT_WORKERS = "POLYAXON_TRANSPORT_WORKERS"
+EV_KEYS_JOURNAL_REQUESTS = "POLYAXON_JOURNAL_REQUESTS"
+EV_KEYS_TRANSPORT_QUEUE_SIZE = "POLYAXON_TRANSPORT_QUEUE_SIZE"
+EV_KEYS_TRANSPORT_FULL_POLICY = "POLYAXON_TRANSPORT_FULL_POLICY"
+EV_KEYS_UPLOAD_CONCURRENCY = "POLYAXON_UPLOAD_CONCURRENCY"
+EV_KEYS_UPLOAD_BANDWIDTH = "POLYAXON_UPLOAD_BANDWIDTH"
+EV_KEYS_UPLOAD_PART_SIZE = "POLYAXON_UPLOAD_PART_SIZE"
+EV_KEYS_UPLOAD_STREAMING = "POLYAXON_UPLOAD_STREAMING"
+EV_KEYS_UPLOAD_COMPRESSION_LEVEL = "POLYAXON_UPLOAD_COMPRESSION_LEVEL"
+EV_KEYS_DOWNLOAD_WORKERS = "POLYAXON_DOWNLOAD_WORKERS"
+EV_KEYS_DOWNLOAD_STREAM_UNTAR = "POLYAXON_DOWNLOAD_STREAM_UNTAR"
+EV_KEYS_SPAWNER_CONCURRENCY = "POLYAXON_SPAWNER_CONCURRENCY"
+EV_KEYS_COMPONENTS_CACHE = "POLYAXON_COMPONENTS_CACHE"
+EV_KEYS_COMPONENTS_CACHE_TTL = "POLYAXON_COMPONENTS_CACHE_TTL"
 EV_KEYS_LOG_LEVEL = "POLYAXON_LOG_LEVEL"
 EV_KEYS_K8S_NAMESPACE = "POLYAXON_K8S_NAMESPACE"
 EV_KEYS_K8S_NODE_NAME = "POLYAXON_K8S_NODE_NAME"
@@ -13,14 +13,16 @@
 # WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
 # See the License for the specific language governing permissions and
 # limitations under the License.
+import asyncio
 import os
+import tarfile
 
-from typing import Dict, List, Optional, Union
+from typing import Awaitable, Callable, Dict, List, Optional, Tuple, Union
 
 import aiofiles
 
 from polyaxon import settings
-from polyaxon.fs.tar import tar_dir
+from polyaxon.fs.tar import add_to_tar, get_tar_path, tar_dir
 from polyaxon.fs.tar import tar_files as sync_tar_files
 from polyaxon.fs.types import FSSystem
 from polyaxon.lifecycle import V1ProjectFeature
@@ -30,6 +32,8 @@ from polyaxon.utils.hashing import hash_value
 from polyaxon.utils.list_utils import to_list
 from polyaxon.utils.path_utils import check_or_create_path
 
+from fsspec.asyn import _run_coros_in_chunks  # noqa
+
 
 async def ensure_async_execution(
     fs: FSSystem, fct: str, is_async: bool = False, *args, **kwargs
@@ -153,24 +157,46 @@ async def download_file(
         return None
 
 
+async def _download_all(
+    subpaths: List[str],
+    download_fct: Callable[[str], Awaitable[Optional[str]]],
+    max_concurrency: int = None,
+) -> List[Optional[str]]:
+    """Downloads the subpaths concurrently, results are returned in order.
+
+    A failed download is logged and returns `None`.
+    """
+    results = await _run_coros_in_chunks(
+        [download_fct(subpath) for subpath in subpaths],
+        batch_size=max_concurrency,
+        return_exceptions=True,
+        nofiles=True,
+    )
+    for i, (subpath, result) in enumerate(zip(subpaths, results)):
+        if isinstance(result, Exception):
+            logger.warning(
+                "The file download for path %s failed. " "Error %s" % (subpath, result)
+            )
+            results[i] = None
+    return results
+
+
 async def download_files(
     fs: FSSystem,
     subpaths: List[str],
     check_cache: bool = True,
     pkg_files: List[str] = None,
+    max_concurrency: int = None,
 ) -> List[str]:
     pkg_files = to_list(pkg_files, check_none=True)
-    for subpath in subpaths:
-        try:
-            file_to_path = await download_file(
-                fs=fs, subpath=subpath, check_cache=check_cache
-            )
-            pkg_files.append(file_to_path)
-        except Exception as e:
-            logger.warning(
-                "The file download for path %s failed. " "Error %s" % (subpath, e)
-            )
-
+    results = await _download_all(
+        subpaths=subpaths,
+        download_fct=lambda subpath: download_file(
+            fs=fs, subpath=subpath, check_cache=check_cache
+        ),
+        max_concurrency=max_concurrency,
+    )
+    pkg_files += [r for r in results if r]
     return pkg_files
 
 
@@ -248,25 +274,100 @@ async def download_dirs(
     pkg_files: List[str] = None,
     to_tar: bool = False,
     tar_filename: str = None,
+    max_concurrency: int = None,
 ) -> Union[str, List[str]]:
     pkg_files = to_list(pkg_files, check_none=True)
-    for subpath in subpaths:
+    if not to_tar:
+        results = await _download_all(
+            subpaths=subpaths,
+            download_fct=lambda subpath: download_dir(
+                fs=fs, subpath=subpath, to_tar=False
+            ),
+            max_concurrency=max_concurrency,
+        )
+        pkg_files += [r for r in results if r]
+        return pkg_files
+
+    tar_filename = tar_filename or "download"
+    relative_to = os.path.join(settings.CLIENT_CONFIG.archive_root, tar_filename)
+    target_path = get_tar_path("{}.pkg.{}".format(tar_filename, hash_value(subpaths)))
+    check_or_create_path(target_path, is_dir=False)
+    done = object()
+    ready_paths = asyncio.Queue()
+    for pkg_file in pkg_files:
+        ready_paths.put_nowait(pkg_file)
+
+    async def download(subpath: str) -> Optional[str]:
+        path = await download_dir(fs=fs, subpath=subpath, to_tar=False)
+        if path:
+            ready_paths.put_nowait(path)
+        return path
+
+    async def package(tar: tarfile.TarFile):
+        # Packages the dirs while the remaining downloads are in flight
+        while True:
+            path = await ready_paths.get()
+            if path is done:
+                return
+            await run_sync(add_to_tar, tar, path, relative_to)
+
+    tar = await run_sync(tarfile.open, target_path, "w:gz")
+    try:
+        packager = asyncio.ensure_future(package(tar))
         try:
-            file_to_path = await download_dir(fs=fs, subpath=subpath, to_tar=False)
-            pkg_files.append(file_to_path)
-        except Exception as e:
-            logger.warning(
-                "The file download for path %s failed. " "Error %s" % (subpath, e)
+            await _download_all(
+                subpaths=subpaths,
+                download_fct=download,
+                max_concurrency=max_concurrency,
             )
-
-    if to_tar:
-        tar_filename = tar_filename or "download"
-        return await tar_files(
-            filename="{}.pkg.{}".format(tar_filename, hash_value(subpaths)),
-            pkg_files=pkg_files,
-            subpath=tar_filename,
+        finally:
+            ready_paths.put_nowait(done)
+            await packager
+    finally:
+        await run_sync(tar.close)
+    return target_path
+
+
+async def download_file_or_dir(
+    fs: FSSystem, path_from: str, path_to: str, is_file: Optional[bool]
+) -> str:
+    """Downloads a file or a dir, if `is_file` is `None` the store path is checked."""
+    if is_file is None:
+        is_file = await ensure_async_execution(
+            fs=fs, fct="isfile", is_async=fs.async_impl, path=path_from
         )
-    return pkg_files
+    check_or_create_path(path_to, is_dir=not is_file)
+    await ensure_async_execution(
+        fs=fs,
+        fct="get",
+        is_async=fs.async_impl,
+        rpath=path_from,
+        lpath=path_to,
+        recursive=not is_file,
+    )
+    return path_to
+
+
+async def download_paths(
+    fs: FSSystem,
+    paths: List[Tuple[str, str, Optional[bool]]],
+    max_concurrency: int = None,
+) -> List[Union[str, Exception]]:
+    """Downloads the `(path_from, path_to, is_file)` entries concurrently.
+
+    Results are returned in order, a failed download returns its exception.
+    """
+    return await _run_coros_in_chunks(
+        [
+            download_file_or_dir(
+                fs=fs, path_from=path_from, path_to=path_to, is_file=is_file
+            )
+            for path_from, path_to, is_file in paths
+        ],
+        batch_size=max_concurrency,
+        return_exceptions=True,
+        nofiles=True,
+    )
 
 
 async def list_files(
@@ -13,7 +13,11 @@
 # WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
 # See the License for the specific language governing permissions and
 # limitations under the License.
+import base64
+import uuid
+
 from adlfs import AzureBlobFileSystem as BaseAzureBlobFileSystem
+from azure.storage.blob import BlobBlock
 
 from polyaxon.connections.azure.base import (
     get_account_key,
@@ -24,14 +28,41 @@ from polyaxon.connections.azure.base import (
     get_sas_token,
     get_tenant_id,
 )
+from polyaxon.fs.multipart import MultipartUploadMixin
 
 
-class AzureBlobFileSystem(BaseAzureBlobFileSystem):
+class AzureBlobFileSystem(BaseAzureBlobFileSystem, MultipartUploadMixin):
     async def _put_file(self, lpath, rpath, delimiter="/", overwrite=True, **kwargws):
         return await super()._put_file(
             lpath, rpath, delimiter=delimiter, overwrite=overwrite, **kwargws
         )
 
+    def _get_blob_client(self, rpath):
+        container_name, path, *_ = self.split_path(rpath)
+        return self.service_client.get_blob_client(container_name, path)
+
+    @staticmethod
+    def _get_block_id(upload_id, part_number):
+        # Block ids of a blob must have the same length
+        return base64.b64encode(
+            "{}-{:06d}".format(upload_id, part_number).encode()
+        ).decode()
+
+    async def _mpu_start(self, rpath, size):
+        # Uncommitted blocks are kept by the service, no session is needed
+        return uuid.uuid4().hex[:8]
+
+    async def _mpu_upload_part(self, rpath, upload_id, part_number, offset, data, size):
+        block_id = self._get_block_id(upload_id, part_number)
+        async with self._get_blob_client(rpath) as bc:
+            await bc.stage_block(block_id=block_id, data=data, length=len(data))
+        return block_id
+
+    async def _mpu_complete(self, rpath, upload_id, parts):
+        async with self._get_blob_client(rpath) as bc:
+            await bc.commit_block_list([BlobBlock(block_id=i) for i in parts])
+        self.invalidate_cache(self._parent(rpath))
+
     async def _ls(
         self,
         path: str,
@@ -0,0 +1,209 @@
+#!/usr/bin/python
+#
+# Copyright 2018-2022 Polyaxon, Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import ctypes
+import ctypes.util
+import os
+import struct
+import sys
+
+from typing import Dict, List, Set, Tuple
+
+from polyaxon.logger import logger
+from polyaxon.utils.list_utils import to_list
+
+IN_MODIFY = 0x00000002
+IN_ATTRIB = 0x00000004
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_FROM = 0x00000040
+IN_MOVED_TO = 0x00000080
+IN_CREATE = 0x00000100
+IN_DELETE = 0x00000200
+IN_DELETE_SELF = 0x00000400
+IN_MOVE_SELF = 0x00000800
+IN_Q_OVERFLOW = 0x00004000
+IN_IGNORED = 0x00008000
+IN_ONLYDIR = 0x01000000
+IN_ISDIR = 0x40000000
+IN_NONBLOCK = 0o4000
+IN_CLOEXEC = 0o2000000
+
+WATCH_MASK = (
+    IN_MODIFY
+    | IN_ATTRIB
+    | IN_CLOSE_WRITE
+    | IN_MOVED_FROM
+    | IN_MOVED_TO
+    | IN_CREATE
+    | IN_DELETE
+    | IN_DELETE_SELF
+    | IN_MOVE_SELF
+    | IN_ONLYDIR
+)
+
+_EVENT_HEADER = struct.Struct("iIII")
+_libc = None
+
+
+def _get_libc():
+    global _libc
+
+    if _libc is None:
+        _libc = ctypes.CDLL(
+            ctypes.util.find_library("c") or "libc.so.6", use_errno=True
+        )
+    return _libc
+
+
+class Inotify:
+    """Recursive directory watcher based on the linux inotify api.
+
+    The watcher does not keep the file events,
+    it only collects the directories whose content has changed,
+    the caller is responsible for scanning these directories.
+    """
+
+    READ_SIZE = 64 * 1024
+
+    def __init__(self):
+        libc = _get_libc()
+        self._fd = libc.inotify_init1(IN_NONBLOCK | IN_CLOEXEC)
+        if self._fd < 0:
+            raise OSError(ctypes.get_errno(), "inotify_init1 failed")
+        self._paths_by_wd: Dict[int, str] = {}
+        self._wds_by_path: Dict[str, int] = {}
+        self._excludes: Dict[str, List[str]] = {}
+        self._overflowed = False
+
+    @staticmethod
+    def is_available() -> bool:
+        if not sys.platform.startswith("linux"):
+            return False
+        try:
+            return hasattr(_get_libc(), "inotify_init1")
+        except OSError:
+            return False
+
+    @property
+    def overflowed(self) -> bool:
+        return self._overflowed
+
+    def _add_dir_watch(self, path: str) -> bool:
+        wd = _get_libc().inotify_add_watch(self._fd, os.fsencode(path), WATCH_MASK)
+        if wd < 0:
+            logger.debug("Could not watch path %s, errno %s", path, ctypes.get_errno())
+            # Too many watches or the path disappeared,
+            # the caller should fallback to a full scan
+            self._overflowed = True
+            return False
+        self._paths_by_wd[wd] = path
+        self._wds_by_path[path] = wd
+        return True
+
+    def _get_exclude(self, path: str) -> List[str]:
+        for root, exclude in self._excludes.items():
+            if path == root or path.startswith(root + os.sep):
+                return exclude
+        return []
+
+    def add_watch(self, path: str, exclude: List[str] = None) -> Set[str]:
+        """Watches a directory recursively, returns the watched directories."""
+        path = os.path.abspath(path)
+        if exclude is not None:
+            self._excludes[path] = to_list(exclude, check_none=True)
+        exclude = self._get_exclude(path)
+        watched = set()
+        for root, dirs, _ in os.walk(path, topdown=True):
+            if exclude:
+                dirs[:] = [d for d in dirs if d not in exclude]
+            if root not in self._wds_by_path and not self._add_dir_watch(root):
+                continue
+            watched.add(root)
+        return watched
+
+    def is_watching(self, path: str) -> bool:
+        return os.path.abspath(path) in self._wds_by_path
+
+    def _remove_wd(self, wd: int):
+        path = self._paths_by_wd.pop(wd, None)
+        if path is not None and self._wds_by_path.get(path) == wd:
+            self._wds_by_path.pop(path)
+
+    def _remove_tree(self, path: str):
+        prefix = path + os.sep
+        for subpath in list(self._wds_by_path.keys()):
+            if subpath == path or subpath.startswith(prefix):
+                wd = self._wds_by_path.pop(subpath)
+                self._paths_by_wd.pop(wd, None)
+                _get_libc().inotify_rm_watch(self._fd, wd)
+
+    def _read_events(self) -> List[Tuple[int, int, str]]:
+        events = []
+        while True:
+            try:
+                data = os.read(self._fd, self.READ_SIZE)
+            except BlockingIOError:
+                break
+            if not data:
+                break
+            offset = 0
+            while offset < len(data):
+                wd, mask, _, length = _EVENT_HEADER.unpack_from(data, offset)
+                offset += _EVENT_HEADER.size
+                name = data[offset : offset + length].rstrip(b"\0")
+                offset += length
+                events.append((wd, mask, os.fsdecode(name)))
+        return events
+
+    def read_changes(self) -> Set[str]:
+        """Returns the directories that changed since the last call.
+
+        If the kernel queue overflowed, `overflowed` is set
+        and the caller should rescan the watched paths.
+        """
+        changed = set()
+        for wd, mask, name in self._read_events():
+            if mask & IN_Q_OVERFLOW:
+                self._overflowed = True
+                continue
+            if mask & IN_IGNORED:
+                self._remove_wd(wd)
+                continue
+            path = self._paths_by_wd.get(wd)
+            if path is None:
+                continue
+            if mask & (IN_DELETE_SELF | IN_MOVE_SELF):
+                changed.add(os.path.dirname(path))
+                continue
+            changed.add(path)
+            if mask & IN_ISDIR and mask & IN_MOVED_FROM:
+                self._remove_tree(os.path.join(path, name))
+            if mask & IN_ISDIR and mask & (IN_CREATE | IN_MOVED_TO):
+                subpath = os.path.join(path, name)
+                if name not in self._get_exclude(subpath):
+                    # New directories are watched and scanned fully
+                    changed |= self.add_watch(subpath)
+        return changed
+
+    def reset_overflow(self):
+        self._overflowed = False
+
+    def close(self):
+        if self._fd is not None and self._fd >= 0:
+            os.close(self._fd)
+        self._fd = None
+        self._paths_by_wd = {}
+        self._wds_by_path = {}
@@ -0,0 +1,273 @@
+#!/usr/bin/python
+#
+# Copyright 2018-2022 Polyaxon, Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import asyncio
+import math
+import os
+import threading
+import time
+import weakref
+
+from typing import Any, Callable, Dict, List, Optional
+
+import aiofiles
+
+from polyaxon import settings
+from polyaxon.logger import logger
+
+
+class TransferBudget:
+    """Global concurrency and bandwidth budget shared by the sync transfers.
+
+    The concurrency is limited per event loop, the bandwidth is shared by all loops.
+
+    Args:
+        concurrency: int, optional, maximum number of concurrent transfers.
+        bandwidth: int, optional, maximum number of bytes per second.
+    """
+
+    def __init__(self, concurrency: int = None, bandwidth: int = None):
+        self._concurrency = concurrency
+        self._bandwidth = bandwidth
+        # A semaphore is bound to the loop it's used in, one is created per loop
+        self._semaphores = weakref.WeakKeyDictionary()
+        self._lock = threading.Lock()
+        self._next_at = 0
+
+    def _get_semaphore(self) -> Optional[asyncio.Semaphore]:
+        if not self._concurrency:
+            return None
+        loop = asyncio.get_running_loop()
+        with self._lock:
+            semaphore = self._semaphores.get(loop)
+            if semaphore is None:
+                semaphore = asyncio.Semaphore(self._concurrency)
+                self._semaphores[loop] = semaphore
+            return semaphore
+
+    async def _throttle(self, nbytes: int):
+        if not self._bandwidth or not nbytes:
+            return
+        with self._lock:
+            now = time.monotonic()
+            start_at = max(self._next_at, now)
+            self._next_at = start_at + nbytes / self._bandwidth
+        if start_at > now:
+            await asyncio.sleep(start_at - now)
+
+    def acquire(self, nbytes: int = 0) -> "_BudgetSlot":
+        return _BudgetSlot(self, nbytes)
+
+
+class _BudgetSlot:
+    def __init__(self, budget: TransferBudget, nbytes: int):
+        self._budget = budget
+        self._nbytes = nbytes
+        self._semaphore = None
+
+    async def __aenter__(self):
+        self._semaphore = self._budget._get_semaphore()
+        if self._semaphore:
+            await self._semaphore.acquire()
+        try:
+            await self._budget._throttle(self._nbytes)
+        except BaseException:
+            if self._semaphore:
+                self._semaphore.release()
+            raise
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb):
+        if self._semaphore:
+            self._semaphore.release()
+
+
+_TRANSFER_BUDGET = None
+
+
+def get_transfer_budget() -> TransferBudget:
+    global _TRANSFER_BUDGET
+
+    if _TRANSFER_BUDGET is None:
+        _TRANSFER_BUDGET = TransferBudget(
+            concurrency=settings.CLIENT_CONFIG.upload_concurrency,
+            bandwidth=settings.CLIENT_CONFIG.upload_bandwidth,
+        )
+    return _TRANSFER_BUDGET
+
+
+class MultipartUploadMixin:
+    """Hooks to upload a file in parts that can be resumed.
+
+    Backends that can upload parts concurrently set `MULTIPART_CONCURRENT`,
+    otherwise the parts are uploaded sequentially.
+    """
+
+    MULTIPART_CONCURRENT = True
+
+    async def _mpu_start(self, rpath: str, size: int) -> str:
+        raise NotImplementedError
+
+    async def _mpu_upload_part(
+        self,
+        rpath: str,
+        upload_id: str,
+        part_number: int,
+        offset: int,
+        data: bytes,
+        size: int,
+    ) -> Any:
+        raise NotImplementedError
+
+    async def _mpu_complete(self, rpath: str, upload_id: str, parts: List[Any]):
+        raise NotImplementedError
+
+    async def _mpu_abort(self, rpath: str, upload_id: str):
+        pass
+
+
+def supports_multipart(fs) -> bool:
+    return isinstance(fs, MultipartUploadMixin) and fs.async_impl
+
+
+class MultipartUpload:
+    """Uploads a large file in parts using the multipart hooks of the fs.
+
+    The state of the upload is a json dict returned through `on_state`
+    after every part, passing it back resumes the upload,
+    the state is discarded if the file changed or failed too many times.
+
+    Args:
+        fs: MultipartUploadMixin, the async filesystem.
+        lpath: str, the local file path.
+        rpath: str, the store path.
+        state: Dict, optional, the state of a previous interrupted upload.
+        on_state: Callable, called with the new state, `None` once done.
+        budget: TransferBudget, optional, defaults to the global budget.
+        part_size: int, optional, the size of the parts.
+    """
+
+    MAX_ATTEMPTS = 3
+
+    def __init__(
+        self,
+        fs: MultipartUploadMixin,
+        lpath: str,
+        rpath: str,
+        state: Dict = None,
+        on_state: Callable[[Optional[Dict]], None] = None,
+        budget: TransferBudget = None,
+        part_size: int = None,
+    ):
+        self._fs = fs
+        self._lpath = lpath
+        self._rpath = rpath
+        self._on_state = on_state
+        self._budget = budget or get_transfer_budget()
+        self._part_size = part_size or settings.CLIENT_CONFIG.upload_part_size
+        stat = os.stat(lpath)
+        self._size = stat.st_size
+        self._ts = stat.st_mtime_ns
+        self._state = state
+        self._stale_state = None
+        if state and (
+            state.get("size") != self._size
+            or state.get("ts") != self._ts
+            or state.get("part_size") != self._part_size
+            or state.get("attempts", 0) >= self.MAX_ATTEMPTS
+        ):
+            self._stale_state = state
+            self._state = None
+
+    @property
+    def num_parts(self) -> int:
+        return max(math.ceil(self._size / self._part_size), 1)
+
+    def _notify(self):
+        if self._on_state:
+            self._on_state(self._state)
+
+    async def _start(self):
+        if self._stale_state:
+            try:
+                await self._fs._mpu_abort(self._rpath, self._stale_state["id"])
+            except Exception as e:
+                logger.debug("Could not abort stale upload %s: %s", self._rpath, e)
+        upload_id = await self._fs._mpu_start(self._rpath, self._size)
+        self._state = {
+            "id": upload_id,
+            "size": self._size,
+            "ts": self._ts,
+            "part_size": self._part_size,
+            "parts": {},
+            "attempts": 0,
+        }
+        self._notify()
+
+    async def _upload_part(self, part_number: int):
+        offset = (part_number - 1) * self._part_size
+        length = min(self._part_size, self._size - offset)
+        async with self._budget.acquire(length):
+            async with aiofiles.open(self._lpath, "rb") as f:
+                await f.seek(offset)
+                data = await f.read(length)
+            etag = await self._fs._mpu_upload_part(
+                self._rpath,
+                self._state["id"],
+                part_number=part_number,
+                offset=offset,
+                data=data,
+                size=self._size,
+            )
+        self._state["parts"][str(part_number)] = etag
+        self._notify()
+
+    async def upload(self):
+        if self._state:
+            logger.debug(
+                "Resuming upload %s, %s/%s parts done",
+                self._rpath,
+                len(self._state["parts"]),
+                self.num_parts,
+            )
+        else:
+            await self._start()
+
+        pending = [
+            i
+            for i in range(1, self.num_parts + 1)
+            if str(i) not in self._state["parts"]
+        ]
+        try:
+            if self._fs.MULTIPART_CONCURRENT:
+                # Wait for all the parts to keep the state of the successful ones
+                results = await asyncio.gather(
+                    *[self._upload_part(i) for i in pending], return_exceptions=True
+                )
+                for result in results:
+                    if isinstance(result, Exception):
+                        raise result
+            else:
+                for i in pending:
+                    await self._upload_part(i)
+            parts = [self._state["parts"][str(i)] for i in range(1, self.num_parts + 1)]
+            await self._fs._mpu_complete(self._rpath, self._state["id"], parts)
+        except Exception:
+            self._state["attempts"] = self._state.get("attempts", 0) + 1
+            self._notify()
+            raise
+        self._state = None
+        self._notify()
@@ -24,14 +24,53 @@ from polyaxon.connections.aws.base import (
     get_endpoint_url,
     get_region,
 )
+from polyaxon.fs.multipart import MultipartUploadMixin
 
 
-class S3FileSystem(BaseS3FileSystem):
+class S3FileSystem(BaseS3FileSystem, MultipartUploadMixin):
     retries = 5
 
     async def _ls(self, path, detail=False, force=False):
         return await super()._ls(path, detail=detail, refresh=force)
 
+    async def _mpu_start(self, rpath, size):
+        bucket, key, *_ = self.split_path(rpath)
+        mpu = await self._call_s3("create_multipart_upload", Bucket=bucket, Key=key)
+        return mpu["UploadId"]
+
+    async def _mpu_upload_part(self, rpath, upload_id, part_number, offset, data, size):
+        bucket, key, *_ = self.split_path(rpath)
+        out = await self._call_s3(
+            "upload_part",
+            Bucket=bucket,
+            Key=key,
+            PartNumber=part_number,
+            UploadId=upload_id,
+            Body=data,
+        )
+        return out["ETag"]
+
+    async def _mpu_complete(self, rpath, upload_id, parts):
+        bucket, key, *_ = self.split_path(rpath)
+        await self._call_s3(
+            "complete_multipart_upload",
+            Bucket=bucket,
+            Key=key,
+            UploadId=upload_id,
+            MultipartUpload={
+                "Parts": [
+                    {"PartNumber": i + 1, "ETag": etag} for i, etag in enumerate(parts)
+                ]
+            },
+        )
+        self.invalidate_cache(rpath)
+
+    async def _mpu_abort(self, rpath, upload_id):
+        bucket, key, *_ = self.split_path(rpath)
+        await self._call_s3(
+            "abort_multipart_upload", Bucket=bucket, Key=key, UploadId=upload_id
+        )
+
 
 def get_fs(
     context_path: str = None,
@@ -15,6 +15,7 @@
 # limitations under the License.
 
 import os
+import tarfile
 
 from typing import List
 
@@ -31,10 +32,19 @@ def tar_dir(download_path: str) -> str:
     return target_path
 
 
+def get_tar_path(download_name: str) -> str:
+    tar_name = "{}.tar.gz".format(download_name)
+    return os.path.join(settings.CLIENT_CONFIG.archive_root, tar_name)
+
+
 def tar_files(
     download_name: str, outputs_files: List[str], relative_to: str = None
 ) -> str:
-    tar_name = "{}.tar.gz".format(download_name)
-    target_path = os.path.join(settings.CLIENT_CONFIG.archive_root, tar_name)
+    target_path = get_tar_path(download_name)
     create_tarfile(files=outputs_files, tar_path=target_path, relative_to=relative_to)
     return target_path
+
+
+def add_to_tar(tar: tarfile.TarFile, filepath: str, relative_to: str = None):
+    arcname = os.path.relpath(filepath, relative_to) if relative_to else None
+    tar.add(filepath, arcname=arcname)
@@ -13,22 +13,44 @@
 # WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
 # See the License for the specific language governing permissions and
 # limitations under the License.
+
+import hashlib
 import json
 import os
+import time
 
 from collections import namedtuple
 from datetime import datetime
-from typing import Dict, List
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+import ujson
 
 from marshmallow import fields
 
 from polyaxon.contexts import paths as ctx_paths
+from polyaxon.fs.inotify import Inotify
+from polyaxon.logger import logger
 from polyaxon.schemas.base import BaseConfig, BaseSchema
-from polyaxon.utils.date_utils import path_last_modified
-from polyaxon.utils.path_utils import get_files_and_dirs_in_path
-
+from polyaxon.utils.hashing import hash_file
+from polyaxon.utils.list_utils import to_list
+from polyaxon.utils.path_utils import check_or_create_path
+
+
+class PathData(
+    namedtuple(
+        "PathData",
+        "base ts op ino src size digest racy",
+        defaults=(None, None, None, None, False),
+    )
+):
+    """Index entry of a watched path.
+
+    `ts` is the modification time in nanoseconds,
+    `ino` is used to detect renames and `src` is set for moved paths,
+    `size` and `digest` are only tracked for files,
+    `racy` is set when the file was indexed within the mtime granularity.
+    """
 
-class PathData(namedtuple("PathData", "base ts op")):
     pass
 
 
@@ -42,6 +64,8 @@ class FSWatcherSchema(BaseSchema):
 
 
 class FSWatcherConfig(BaseConfig):
+    """Legacy json dump of the watcher mappings, kept to read old index files."""
+
     SCHEMA = FSWatcherSchema
     IDENTIFIER = "fswatcher"
 
@@ -64,7 +88,7 @@ class FSWatcherConfig(BaseConfig):
         if not mapping:
             return None
         return {
-            k: PathData(v[0], datetime.fromisoformat(v[1]), v[2])
+            k: PathData(v[0], int(datetime.fromisoformat(v[1]).timestamp() * 1e9), v[2])
             for k, v in mapping.items()
         }
 
@@ -81,69 +105,398 @@ class FSWatcherConfig(BaseConfig):
 
 
 class FSWatcher:
+    """Collects the changes of local paths to sync them with a store.
+
+    By default every sync walks the whole path,
+    if `use_events` is enabled and inotify is available,
+    only the directories reported by inotify are scanned after the first sync.
+
+    The index is persisted as a compact json document:
+    `{"version": 2, "bases": [...], "files": {path: [...]}, "dirs": {path: [...]}}`,
+    entries are `[base, ts, ino]`, files also have `size, digest, racy`.
+
+    The digest of a file is recorded when it's uploaded,
+    a file with a new mtime but the same size, or a file indexed
+    within the mtime granularity of the filesystem, is hashed and compared
+    with that digest to not re-upload byte identical files
+    and to catch same-second rewrites, other files are never hashed by a scan.
+
+    The state of the interrupted multipart uploads is kept under `uploads`.
+    """
+
     PUT = "put"
     RM = "rm"
+    MV = "mv"
     NOOP = ""
-
-    def __init__(self, dir_mapping: Dict = None, file_mapping: Dict = None):
+    INDEX_VERSION = 2
+    # Coarsest mtime granularity handled (FAT), other filesystems use 1s or 1ns
+    RACY_WINDOW_NS = 2 * 10**9
+
+    def __init__(
+        self,
+        dir_mapping: Dict = None,
+        file_mapping: Dict = None,
+        use_events: bool = False,
+        uploads: Dict = None,
+    ):
         self._dir_mapping = dir_mapping or {}
         self._file_mapping = file_mapping or {}
+        self._uploads = uploads or {}
+        self._inotify = None
+        self._watched_paths = set()
+        self._changed_paths = set()
+        self._retry_dirs = set()
+        self._full_scan = True
+        if use_events and Inotify.is_available():
+            try:
+                self._inotify = Inotify()
+            except OSError as e:
+                logger.info("Inotify is not available, using polling: %s", e)
+
+    @property
+    def uses_events(self) -> bool:
+        return self._inotify is not None
 
     @classmethod
-    def read(cls, config_path: str = ctx_paths.CONTEXT_MOUNT_FILE_WATCHER):
+    def _parse_index_entry(cls, bases: List[str], value: List) -> PathData:
+        base, ts, ino, *extra = value
+        size, digest, racy = (extra + [None, None, False])[:3]
+        return PathData(
+            bases[base], ts, cls.NOOP, ino, size=size, digest=digest, racy=bool(racy)
+        )
+
+    @staticmethod
+    def _dump_index_entry(bases: Dict[str, int], data: PathData) -> List:
+        value = [bases.setdefault(data.base, len(bases)), data.ts, data.ino]
+        if data.size is not None:
+            value += [data.size, data.digest, int(data.racy)]
+        return value
+
+    @classmethod
+    def read(
+        cls,
+        config_path: str = ctx_paths.CONTEXT_MOUNT_FILE_WATCHER,
+        use_events: bool = False,
+    ):
         if not os.path.exists(config_path):
-            return cls()
-        config = FSWatcherConfig.read(config_path)
+            return cls(use_events=use_events)
+        with open(config_path, "r") as config_file:
+            data = ujson.load(config_file)
+        if data.get("version") != cls.INDEX_VERSION:
+            config = FSWatcherConfig.from_dict(data)
+            return cls(
+                dir_mapping=config.get_dir_mapping(),
+                file_mapping=config.get_file_mapping(),
+                use_events=use_events,
+            )
+
+        bases = data.get("bases") or []
+
+        def parse(mapping: Dict):
+            return {
+                k: cls._parse_index_entry(bases, v) for k, v in (mapping or {}).items()
+            }
+
         return cls(
-            dir_mapping=config.get_dir_mapping(), file_mapping=config.get_file_mapping()
+            dir_mapping=parse(data.get("dirs")),
+            file_mapping=parse(data.get("files")),
+            use_events=use_events,
+            uploads=data.get("uploads"),
         )
 
-    def write(self, config_path: str = ctx_paths.CONTEXT_MOUNT_FILE_WATCHER):
-        config = FSWatcherConfig.read(
-            {
-                "dir_mapping": self._dir_mapping,
-                "file_mapping": self._file_mapping,
+    def write(
+        self,
+        config_path: str = ctx_paths.CONTEXT_MOUNT_FILE_WATCHER,
+        include_pending: bool = True,
+    ):
+        """Persists the index.
+
+        Args:
+            config_path: str, the index path.
+            include_pending: bool, if `False` the paths that are not synced yet
+                are not persisted, which allows to checkpoint the index during a sync.
+        """
+        bases = {}
+        skip_ops = {self.RM} if include_pending else {self.RM, self.PUT, self.MV}
+
+        def dump(mapping: Dict):
+            return {
+                k: self._dump_index_entry(bases, d)
+                for k, d in mapping.items()
+                if d.op not in skip_ops
             }
-        )
-        return config.write(config_path)
 
-    def _sync_path(self, path: str, base_path: str, mapping: Dict):
-        current_ts = path_last_modified(path)
+        data = {
+            "version": self.INDEX_VERSION,
+            "files": dump(self._file_mapping),
+            "dirs": dump(self._dir_mapping),
+        }
+        if self._uploads:
+            data["uploads"] = self._uploads
+        data["bases"] = sorted(bases, key=bases.get)
+        check_or_create_path(config_path, is_dir=False)
+        tmp_path = "{}.tmp".format(config_path)
+        with open(tmp_path, "w") as config_file:
+            config_file.write(ujson.dumps(data))
+        os.replace(tmp_path, config_path)
+
+    def retry_files(self, files: Iterable[Tuple[str, str]]):
+        """Forgets the `(base, subpath)` files that failed to sync,
+        they are reported again as files to put on next sync.
+
+        When using events, nothing is reported for an unchanged dir,
+        the parent dirs of the files are scanned again on next sync.
+        """
+        for base_path, subpath in files:
+            self._file_mapping.pop(subpath, None)
+            self._retry_dirs.add(
+                os.path.abspath(os.path.join(base_path, os.path.dirname(subpath)))
+            )
+
+    def get_upload_digest(self, path: str, subpath: str) -> Optional[str]:
+        """Returns the digest of a file to put, it must be called before the upload,
+        a change during the upload is then detected on next sync."""
+        data = self._file_mapping.get(subpath)
+        if data and data.digest:
+            return data.digest
+        return self._get_digest(path)
+
+    def set_digest(self, subpath: str, digest: Optional[str]):
+        """Records the digest of an uploaded file."""
+        data = self._file_mapping.get(subpath)
+        if data and digest:
+            self._file_mapping[subpath] = data._replace(digest=digest)
+
+    def get_upload_state(self, subpath: str) -> Optional[Dict]:
+        return self._uploads.get(subpath)
+
+    def set_upload_state(self, subpath: str, state: Optional[Dict]):
+        if state:
+            self._uploads[subpath] = state
+        else:
+            self._uploads.pop(subpath, None)
+
+    @staticmethod
+    def _get_digest(path: str) -> Optional[str]:
+        try:
+            return hash_file(
+                path,
+                hash_length=32,
+                chunk_size=1024 * 1024,
+                hash_md5=hashlib.blake2b(digest_size=16),
+            )
+        except OSError:
+            return None
+
+    def _is_racy(self, ts: int) -> bool:
+        return time.time_ns() - ts < self.RACY_WINDOW_NS
+
+    def _sync_path(
+        self, path: str, base_path: str, mapping: Dict, stat: os.stat_result = None
+    ):
+        stat = stat or os.stat(path)
+        current_ts = stat.st_mtime_ns
         rel_path = os.path.relpath(path, base_path)
         data = mapping.get(rel_path)
-        if data:
-            if current_ts > data.ts:
-                mapping[rel_path] = PathData(base_path, current_ts, self.PUT)
-            else:
-                mapping[rel_path] = PathData(base_path, data.ts, self.NOOP)
+        if data and current_ts == data.ts:
+            mapping[rel_path] = data._replace(op=self.NOOP, src=None, ino=stat.st_ino)
         else:
-            mapping[rel_path] = PathData(base_path, current_ts, self.PUT)
+            mapping[rel_path] = PathData(base_path, current_ts, self.PUT, stat.st_ino)
+        return mapping
+
+    def _sync_file_path(
+        self, path: str, base_path: str, mapping: Dict, stat: os.stat_result = None
+    ):
+        stat = stat or os.stat(path)
+        current_ts = stat.st_mtime_ns
+        current_size = stat.st_size
+        rel_path = os.path.relpath(path, base_path)
+        data = mapping.get(rel_path)
+        op = self.PUT
+        digest = None
+        if data and data.size == current_size:
+            if current_ts == data.ts and not data.racy:
+                op = self.NOOP
+                digest = data.digest
+            elif data.digest:
+                # Ambiguous: touched or re-saved, or rewritten within the mtime tick
+                digest = self._get_digest(path)
+                if digest == data.digest:
+                    op = self.NOOP
+        mapping[rel_path] = PathData(
+            base_path,
+            current_ts,
+            op,
+            stat.st_ino,
+            size=current_size,
+            digest=digest,
+            racy=self._is_racy(current_ts),
+        )
         return mapping
 
-    def sync_file(self, path: str, base_path: str):
-        self._file_mapping = self._sync_path(path, base_path, self._file_mapping)
+    def sync_file(self, path: str, base_path: str, stat: os.stat_result = None):
+        self._file_mapping = self._sync_file_path(
+            path, base_path, self._file_mapping, stat=stat
+        )
 
-    def sync_dir(self, path: str, base_path: str):
-        self._dir_mapping = self._sync_path(path, base_path, self._dir_mapping)
+    def sync_dir(self, path: str, base_path: str, stat: os.stat_result = None):
+        self._dir_mapping = self._sync_path(
+            path, base_path, self._dir_mapping, stat=stat
+        )
 
     def init(self):
+        if not self._inotify:
+            # The walk reports the forgotten files again
+            self._retry_dirs = set()
+            self._dir_mapping = {
+                p: d._replace(op=self.RM, src=None)
+                for p, d in self._dir_mapping.items()
+            }
+            self._file_mapping = {
+                p: d._replace(op=self.RM, src=None)
+                for p, d in self._file_mapping.items()
+            }
+            return
+
+        # Only the changed paths are visited, the rest of the index is kept as is
         self._dir_mapping = {
-            p: PathData(d.base, d.ts, self.RM) for p, d in self._dir_mapping.items()
+            p: d._replace(op=self.NOOP, src=None) for p, d in self._dir_mapping.items()
         }
         self._file_mapping = {
-            p: PathData(d.base, d.ts, self.RM) for p, d in self._file_mapping.items()
+            p: d._replace(op=self.NOOP, src=None) for p, d in self._file_mapping.items()
         }
+        self._changed_paths = self._inotify.read_changes() | self._retry_dirs
+        self._retry_dirs = set()
+        if self._inotify.overflowed:
+            logger.debug("Inotify queue overflowed, rescanning all paths.")
+            self._inotify.reset_overflow()
+            self._full_scan = True
+            self._watched_paths = set()
+        else:
+            self._full_scan = False
+
+    def _mark_rm(self, base_path: str, rel_paths: Set[str], recursive: bool):
+        """Marks the rel paths, and optionally their descendants, for removal."""
+        prefixes = tuple(p + os.sep for p in rel_paths)
+        for mapping in [self._file_mapping, self._dir_mapping]:
+            for k, d in mapping.items():
+                if d.base != base_path:
+                    continue
+                if k in rel_paths or (recursive and k.startswith(prefixes)):
+                    mapping[k] = d._replace(op=self.RM, src=None)
+
+    def _walk(self, path: str, exclude: List[str] = None):
+        base_path, prefix_path = os.path.split(path)
+        exclude = to_list(exclude, check_none=True)
+        for root, dirs, files in os.walk(path, topdown=True):
+            if exclude:
+                dirs[:] = [d for d in dirs if d not in exclude]
+            for file_name in files:
+                self.sync_file(os.path.join(root, file_name), base_path=base_path)
+            for dir_name in dirs:
+                self.sync_dir(os.path.join(root, dir_name), base_path=base_path)
+
+    def _scan_changed_dirs(self, path: str, exclude: List[str] = None):
+        base_path, _ = os.path.split(path)
+        exclude = to_list(exclude, check_none=True)
+        root = os.path.abspath(path)
+        root_prefix = root + os.sep
+        changed_dirs = {
+            os.path.relpath(p, base_path)
+            for p in self._changed_paths
+            if p == root or p.startswith(root_prefix)
+        }
+        if not changed_dirs:
+            return
+
+        seen = set()
+        failed_dirs = set()
+        for rel_dir in changed_dirs:
+            dir_path = os.path.join(base_path, rel_dir)
+            try:
+                with os.scandir(dir_path) as entries:
+                    for entry in entries:
+                        rel_path = os.path.join(rel_dir, entry.name)
+                        try:
+                            # Same classification as `os.walk` in the full scan
+                            if entry.is_dir():
+                                if entry.name in exclude:
+                                    continue
+                                self.sync_dir(entry.path, base_path, stat=entry.stat())
+                            else:
+                                self.sync_file(entry.path, base_path, stat=entry.stat())
+                        except OSError as e:
+                            # A dangling symlink or a path removed during the scan,
+                            # it does not abort the scan of its siblings
+                            logger.debug("Could not sync path %s: %s", entry.path, e)
+                            continue
+                        seen.add(rel_path)
+            except OSError as e:
+                # The directory was removed, its parent is also reported as changed,
+                # its children are only removed when the parent is scanned
+                logger.debug("Could not scan dir %s: %s", dir_path, e)
+                failed_dirs.add(rel_dir)
+        changed_dirs -= failed_dirs
+
+        removed_files = set()
+        removed_dirs = set()
+        for mapping, removed in [
+            (self._file_mapping, removed_files),
+            (self._dir_mapping, removed_dirs),
+        ]:
+            for k, d in mapping.items():
+                if (
+                    d.base == base_path
+                    and k not in seen
+                    and os.path.dirname(k) in changed_dirs
+                ):
+                    removed.add(k)
+        if removed_files:
+            self._mark_rm(base_path, removed_files, recursive=False)
+        if removed_dirs:
+            self._mark_rm(base_path, removed_dirs, recursive=True)
+
+    def _detect_moves(self):
+        """Converts a removed file and a new file with the same inode to a move."""
+        removed = {
+            (d.base, d.ino, d.ts, d.size): k
+            for k, d in self._file_mapping.items()
+            if d.op == self.RM and d.ino
+        }
+        if not removed:
+            return
+        for k, d in list(self._file_mapping.items()):
+            if d.op != self.PUT or not d.ino:
+                continue
+            src = removed.pop((d.base, d.ino, d.ts, d.size), None)
+            if src:
+                src_data = self._file_mapping.pop(src)
+                self._file_mapping[k] = d._replace(
+                    op=self.MV, src=src, digest=src_data.digest
+                )
 
     def sync(self, path: str, exclude: List[str] = None):
-        files, dirs = get_files_and_dirs_in_path(
-            path, exclude=exclude, collect_dirs=True
-        )
-        base_path, prefix_path = os.path.split(path)
-        for file_path in files:
-            self.sync_file(os.path.join(prefix_path, file_path), base_path=base_path)
+        if not self._inotify:
+            self._walk(path, exclude=exclude)
+            self._detect_moves()
+            return
+
+        abs_path = os.path.abspath(path)
+        if self._full_scan or abs_path not in self._watched_paths:
+            base_path, prefix_path = os.path.split(path)
+            self._mark_rm(base_path, {prefix_path}, recursive=True)
+            # Watch before walking to not miss changes happening during the walk
+            self._inotify.add_watch(abs_path, exclude=exclude)
+            self._watched_paths.add(abs_path)
+            self._walk(path, exclude=exclude)
+        else:
+            self._scan_changed_dirs(path, exclude=exclude)
+        self._detect_moves()
 
-        for dir_path in dirs:
-            self.sync_dir(os.path.join(prefix_path, dir_path), base_path=base_path)
+    def close(self):
+        if self._inotify:
+            self._inotify.close()
+            self._inotify = None
 
     def _get_mapping_by_op(self, mapping: Dict, op: str):
         return {(p.base, k) for k, p in mapping.items() if p.op == op}
@@ -154,9 +507,16 @@ class FSWatcher:
     def get_files_to_put(self):
         return self._get_mapping_by_op(self._file_mapping, self.PUT)
 
+    def get_files_to_mv(self):
+        return {
+            (p.base, p.src, k) for k, p in self._file_mapping.items() if p.op == self.MV
+        }
+
     def get_files_to_rm(self):
         results = self._get_mapping_by_op(self._file_mapping, self.RM)
         self._file_mapping = self._clean_by_op(self._file_mapping, self.RM)
+        for _, subpath in results:
+            self._uploads.pop(subpath, None)
         return results
 
     def get_dirs_to_put(self):
@@ -164,5 +524,5 @@ class FSWatcher:
 
     def get_dirs_to_rm(self):
         results = self._get_mapping_by_op(self._dir_mapping, self.RM)
-        self._file_mapping = self._clean_by_op(self._file_mapping, self.RM)
+        self._dir_mapping = self._clean_by_op(self._dir_mapping, self.RM)
         return results
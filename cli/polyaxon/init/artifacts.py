@@ -14,17 +14,23 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+import asyncio
+
+from typing import List, Optional, Tuple, Union
+
 from polyaxon.contexts import paths as ctx_paths
 from polyaxon.fs.watcher import FSWatcher
 from polyaxon.logger import logger
 from polyaxon.schemas.types import V1ConnectionType
 from polyaxon.utils.formatting import Printer
+from polyaxon.utils.list_utils import to_list
 
 
-def sync_file_watcher(path: str):
+def sync_file_watcher(path: Union[str, List[str]]):
     try:
         fw = FSWatcher()
-        fw.sync(path)
+        for p in to_list(path, check_none=True):
+            fw.sync(p)
         fw.write(ctx_paths.CONTEXT_MOUNT_FILE_WATCHER)
     except Exception as e:  # File watcher should not prevent job from starting
         logger.warning(
@@ -68,3 +74,50 @@ def download_artifact(
             logger.debug(
                 "Initialization failed, the error was ignored. Error details %s", e
             )
+
+
+def download_artifacts(
+    connection_name: str,
+    connection_kind: str,
+    manifest: List[Tuple[str, str, Optional[bool]]],
+    raise_errors: bool,
+    sync_fw: bool,
+    max_concurrency: int = None,
+):
+    """Downloads all the `(path_from, path_to, is_file)` entries of a manifest.
+
+    A single filesystem is used for all entries and the downloads run concurrently,
+    an entry with `is_file` set to `None` is checked on the store.
+    """
+    from polyaxon.fs.async_manager import download_paths
+    from polyaxon.fs.fs import close_fs, get_async_fs_from_type
+
+    connection_type = V1ConnectionType(name=connection_name, kind=connection_kind)
+
+    async def _download():
+        fs = await get_async_fs_from_type(connection_type=connection_type)
+        try:
+            return await download_paths(
+                fs=fs, paths=manifest, max_concurrency=max_concurrency
+            )
+        finally:
+            await close_fs(fs)
+
+    results = asyncio.run(_download())
+    initialized = []
+    errors = []
+    for (_, path_to, _), result in zip(manifest, results):
+        if isinstance(result, Exception):
+            errors.append(result)
+            logger.debug(
+                "Initialization of path `%s` failed. Error details %s", path_to, result
+            )
+        else:
+            initialized.append(path_to)
+            Printer.print_success(
+                "{} path is initialized, path: `{}`".format(connection_kind, path_to)
+            )
+    if sync_fw and initialized:
+        sync_file_watcher(initialized)
+    if errors and raise_errors:
+        raise errors[0]
@@ -13,9 +13,10 @@
 # WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
 # See the License for the specific language governing permissions and
 # limitations under the License.=
+import copy
 import re
 
-from kubernetes_asyncio import client, config
+from kubernetes_asyncio import client, config, watch
 from kubernetes_asyncio.client import Configuration
 from kubernetes_asyncio.client.rest import ApiException
 
@@ -65,12 +66,25 @@ class AsyncK8SManager:
         api_pattern = re.compile("bearer", re.IGNORECASE)
         return api_pattern.sub("", api_key).strip()
 
-    async def setup(self, k8s_config=None):
+    async def setup(self, k8s_config=None, connection_pool_maxsize=None):
+        """Creates the api clients.
+
+        `connection_pool_maxsize` sets the number of concurrent connections
+        to the API server, it should match the number of concurrent calls.
+        """
         if not k8s_config:
             if self.in_cluster:
                 config.load_incluster_config()
             else:
                 await config.load_kube_config()
+            if connection_pool_maxsize:
+                k8s_config = Configuration.get_default_copy()
+        elif connection_pool_maxsize:
+            # The caller's config can be shared, the pool size is set on a copy
+            k8s_config = copy.copy(k8s_config)
+        if connection_pool_maxsize:
+            k8s_config.connection_pool_maxsize = connection_pool_maxsize
+        if not k8s_config:
             self.api_client = client.api_client.ApiClient()
         else:
             self.api_client = client.api_client.ApiClient(configuration=k8s_config)
@@ -102,6 +116,21 @@ class AsyncK8SManager:
         event = await self.k8s_api.read_namespaced_pod_status(pod_id, self.namespace)
         return is_pod_running(event, container_id)
 
+    async def watch_pod(
+        self, name: str, resource_version: str = None, timeout_seconds: int = None
+    ):
+        """Watches a single pod, yields the event type and the pod."""
+        kwargs = {"field_selector": "metadata.name={}".format(name)}
+        if resource_version:
+            kwargs["resource_version"] = resource_version
+        if timeout_seconds:
+            kwargs["timeout_seconds"] = timeout_seconds
+        async with watch.Watch().stream(
+            self.k8s_api.list_namespaced_pod, namespace=self.namespace, **kwargs
+        ) as stream:
+            async for event in stream:
+                yield event["type"], event["object"]
+
     async def _list_namespace_resource(self, resource_api, reraise=False, **kwargs):
         try:
             res = await resource_api(namespace=self.namespace, **kwargs)
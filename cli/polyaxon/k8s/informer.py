@@ -0,0 +1,276 @@
+#!/usr/bin/python
+#
+# Copyright 2018-2022 Polyaxon, Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.=
+
+import copy
+import threading
+
+from typing import Any, Callable, Dict, Iterator, List, Optional, Set, Tuple
+
+from kubernetes import watch
+from kubernetes.client.rest import ApiException
+
+from polyaxon.logger import logger
+
+INSTANCE_LABEL = "app.kubernetes.io/instance"
+INSTANCE_INDEX = "instance"
+
+
+def _get(obj: Any, key: str) -> Any:
+    if obj is None:
+        return None
+    if isinstance(obj, dict):
+        return obj.get(key)
+    return getattr(obj, key, None)
+
+
+def get_metadata(obj: Any) -> Any:
+    return _get(obj, "metadata")
+
+
+def get_name(obj: Any) -> Optional[str]:
+    return _get(get_metadata(obj), "name")
+
+
+def get_resource_version(obj: Any) -> Optional[str]:
+    return _get(get_metadata(obj), "resource_version") or _get(
+        get_metadata(obj), "resourceVersion"
+    )
+
+
+def get_labels(obj: Any) -> Dict[str, str]:
+    return _get(get_metadata(obj), "labels") or {}
+
+
+def get_instance(obj: Any) -> Optional[str]:
+    return get_labels(obj).get(INSTANCE_LABEL)
+
+
+def _get_list_metadata(res: Any) -> Tuple[List, Optional[str], Optional[str]]:
+    """Returns the items, the continue token and the resource version of a list."""
+    if isinstance(res, dict):
+        metadata = res.get("metadata") or {}
+        return res["items"], metadata.get("continue"), metadata.get("resourceVersion")
+    metadata = res.metadata
+    if metadata is None:
+        return res.items, None, None
+    return res.items, metadata._continue, metadata.resource_version
+
+
+def iter_list_pages(
+    resource_api: Callable, limit: int = None, **kwargs
+) -> Iterator[Tuple[List, Optional[str]]]:
+    """Lists a resource in pages of `limit` items.
+
+    Yields the items of every page with the resource version of the list.
+    """
+    _continue = None
+    while True:
+        if limit:
+            kwargs["limit"] = limit
+        if _continue:
+            kwargs["_continue"] = _continue
+        res = resource_api(**kwargs)
+        items, _continue, resource_version = _get_list_metadata(res)
+        yield items, resource_version
+        if not _continue:
+            return
+
+
+class Informer:
+    """List+watch backed local store of a namespaced resource.
+
+    The informer lists the resource in pages, then watches it
+    starting from the list's resource version,
+    reads are served from memory and never hit the API server,
+    they return copies that can be mutated without altering the store.
+    If the watch expires the resource is listed again.
+
+    Args:
+        resource_api: Callable, the list function of the resource,
+             e.g. `CoreV1Api.list_namespaced_pod`.
+        namespace: str, the namespace to watch.
+        label_selector: str, optional, the label selector of the objects to keep.
+        indexers: Dict[str, Callable], optional, functions returning
+             the index value of an object, by default objects are indexed
+             by their run instance label.
+        page_size: int, optional, the number of items to list per request.
+        watch_timeout: int, optional, the server side timeout of a watch request.
+        kwargs: extra arguments to pass to the list function,
+             e.g. the group, version and plural of a custom object.
+    """
+
+    PAGE_SIZE = 500
+    WATCH_TIMEOUT = 300
+    RETRY_INTERVAL = 5
+
+    def __init__(
+        self,
+        resource_api: Callable,
+        namespace: str,
+        label_selector: str = None,
+        indexers: Dict[str, Callable[[Any], Optional[str]]] = None,
+        page_size: int = None,
+        watch_timeout: int = None,
+        **kwargs,
+    ):
+        self._resource_api = resource_api
+        self._namespace = namespace
+        self._label_selector = label_selector
+        self._indexers = (
+            indexers if indexers is not None else {INSTANCE_INDEX: get_instance}
+        )
+        self._page_size = page_size or self.PAGE_SIZE
+        self._watch_timeout = watch_timeout or self.WATCH_TIMEOUT
+        self._kwargs = kwargs
+        self._lock = threading.RLock()
+        self._store: Dict[str, Any] = {}
+        self._indices: Dict[str, Dict[str, Set[str]]] = {k: {} for k in self._indexers}
+        self._resource_version = None
+        self._synced = threading.Event()
+        self._stop_event = threading.Event()
+        self._watch = None
+        self._thread = None
+
+    @property
+    def has_synced(self) -> bool:
+        return self._synced.is_set()
+
+    @property
+    def resource_version(self) -> Optional[str]:
+        return self._resource_version
+
+    def _get_kwargs(self) -> Dict:
+        kwargs = dict(namespace=self._namespace, **self._kwargs)
+        if self._label_selector:
+            kwargs["label_selector"] = self._label_selector
+        return kwargs
+
+    def _index(self, name: str, obj: Any):
+        for index_name, indexer in self._indexers.items():
+            value = indexer(obj)
+            if value is not None:
+                self._indices[index_name].setdefault(value, set()).add(name)
+
+    def _unindex(self, name: str, obj: Any):
+        for index_name, indexer in self._indexers.items():
+            value = indexer(obj)
+            names = self._indices[index_name].get(value)
+            if names is None:
+                continue
+            names.discard(name)
+            if not names:
+                self._indices[index_name].pop(value)
+
+    def _add(self, obj: Any):
+        name = get_name(obj)
+        with self._lock:
+            previous = self._store.get(name)
+            if previous is not None:
+                self._unindex(name, previous)
+            self._store[name] = obj
+            self._index(name, obj)
+
+    def _delete(self, obj: Any):
+        name = get_name(obj)
+        with self._lock:
+            previous = self._store.pop(name, None)
+            if previous is not None:
+                self._unindex(name, previous)
+
+    def resync(self):
+        """Lists the resource and replaces the content of the store."""
+        store = {}
+        resource_version = None
+        for items, resource_version in iter_list_pages(
+            self._resource_api, limit=self._page_size, **self._get_kwargs()
+        ):
+            for obj in items:
+                store[get_name(obj)] = obj
+        with self._lock:
+            self._store = {}
+            self._indices = {k: {} for k in self._indexers}
+            for obj in store.values():
+                self._add(obj)
+            self._resource_version = resource_version
+        self._synced.set()
+
+    def handle_event(self, event_type: str, obj: Any):
+        resource_version = get_resource_version(obj)
+        if event_type in {"ADDED", "MODIFIED"}:
+            self._add(obj)
+        elif event_type == "DELETED":
+            self._delete(obj)
+        if resource_version:
+            # Bookmark events only carry the resource version
+            self._resource_version = resource_version
+
+    def _watch_once(self):
+        self._watch = watch.Watch()
+        for event in self._watch.stream(
+            self._resource_api,
+            resource_version=self._resource_version,
+            timeout_seconds=self._watch_timeout,
+            **self._get_kwargs(),
+        ):
+            if self._stop_event.is_set():
+                break
+            self.handle_event(event["type"], event["object"])
+
+    def run(self):
+        while not self._stop_event.is_set():
+            try:
+                if self._resource_version is None:
+                    self.resync()
+                self._watch_once()
+            except ApiException as e:
+                if e.status == 410:
+                    logger.debug("Informer watch expired, relisting.")
+                    self._resource_version = None
+                    continue
+                logger.warning("Informer watch error: %s", e)
+                self._stop_event.wait(self.RETRY_INTERVAL)
+            except Exception as e:
+                logger.warning("Informer watch error: %s", e)
+                self._stop_event.wait(self.RETRY_INTERVAL)
+
+    def start(self):
+        """Lists the resource then keeps the store updated in a daemon thread."""
+        if self._thread is not None and self._thread.is_alive():
+            return
+        self._stop_event.clear()
+        self.resync()
+        self._thread = threading.Thread(
+            target=self.run, name="polyaxon.Informer", daemon=True
+        )
+        self._thread.start()
+
+    def stop(self):
+        self._stop_event.set()
+        if self._watch is not None:
+            self._watch.stop()
+
+    def list(self) -> List[Any]:
+        with self._lock:
+            return copy.deepcopy(list(self._store.values()))
+
+    def get(self, name: str) -> Optional[Any]:
+        with self._lock:
+            return copy.deepcopy(self._store.get(name))
+
+    def get_by_index(self, index_name: str, value: str) -> List[Any]:
+        with self._lock:
+            names = self._indices[index_name].get(value, set())
+            return copy.deepcopy([self._store[n] for n in names])
@@ -14,7 +14,11 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
-from typing import List, Optional, Tuple
+import asyncio
+import heapq
+import math
+
+from typing import Dict, Iterable, List, Optional, Tuple
 
 from kubernetes_asyncio.client.models import V1Pod
 from kubernetes_asyncio.client.rest import ApiException
@@ -24,10 +28,33 @@ from polyaxon.types import AwareDT
 from polyaxon.utils.tz_utils import now
 from traceml.logging import V1Log, V1Logs
 
+MAX_CONCURRENCY = 20
+
+# The timestamp of the last line fetched by pod and container name
+LogsCursors = Dict[Tuple[str, str], AwareDT]
+
+
+def get_since_seconds(last_time: AwareDT, new_time: AwareDT) -> int:
+    return max(int(math.ceil((new_time - last_time).total_seconds())) + 1, 1)
+
+
+def merge_logs(logs: Iterable[List[V1Log]]) -> List[V1Log]:
+    """Merges the logs of several containers, each one already sorted by time."""
+    return list(heapq.merge(*logs, key=lambda log: log.timestamp))
+
 
 async def handle_container_logs(
-    k8s_manager: AsyncK8SManager, pod: V1Pod, container_name: str, **params
+    k8s_manager: AsyncK8SManager,
+    pod: V1Pod,
+    container_name: str,
+    cursors: LogsCursors = None,
+    **params,
 ) -> List[V1Log]:
+    cursor_key = (pod.metadata.name, container_name)
+    last_time = cursors.get(cursor_key) if cursors is not None else None
+    if last_time:
+        # Only pull the lines that were logged since the last fetched line
+        params["since_seconds"] = get_since_seconds(last_time, now())
     resp = None
     try:
         resp = await k8s_manager.k8s_api.read_namespaced_pod_log(
@@ -45,30 +72,75 @@ async def handle_container_logs(
     logs = []
     for log_line in resp.split("\n"):
         if log_line:
-            logs.append(
-                V1Log.process_log_line(
-                    value=log_line,
-                    node=pod.spec.node_name,
-                    pod=pod.metadata.name,
-                    container=container_name,
-                )
+            log = V1Log.process_log_line(
+                value=log_line,
+                node=pod.spec.node_name,
+                pod=pod.metadata.name,
+                container=container_name,
             )
+            if last_time and log.timestamp <= last_time:
+                continue
+            logs.append(log)
+    if logs and cursors is not None:
+        cursors[cursor_key] = logs[-1].timestamp
     return logs
 
 
+def get_pod_containers(pod: V1Pod) -> List[str]:
+    return [c.name for c in (pod.spec.init_containers or [])] + [
+        c.name for c in (pod.spec.containers or [])
+    ]
+
+
+async def _gather_logs(
+    k8s_manager: AsyncK8SManager,
+    pods: List[V1Pod],
+    cursors: Optional[LogsCursors],
+    max_concurrency: int = None,
+    **params,
+) -> List[V1Log]:
+    semaphore = asyncio.Semaphore(max_concurrency or MAX_CONCURRENCY)
+
+    async def _handle(pod, container_name):
+        async with semaphore:
+            return await handle_container_logs(
+                k8s_manager=k8s_manager,
+                pod=pod,
+                container_name=container_name,
+                cursors=cursors,
+                **params,
+            )
+
+    results = await asyncio.gather(
+        *[_handle(pod, c) for pod in pods for c in get_pod_containers(pod)]
+    )
+    return merge_logs(results)
+
+
 async def handle_pod_logs(
-    k8s_manager: AsyncK8SManager, pod: V1Pod, **params
+    k8s_manager: AsyncK8SManager,
+    pod: V1Pod,
+    cursors: LogsCursors = None,
+    max_concurrency: int = None,
+    **params,
 ) -> List[V1Log]:
-    logs = []
-    for container in pod.spec.init_containers or []:
-        logs += await handle_container_logs(
-            k8s_manager=k8s_manager, pod=pod, container_name=container.name, **params
-        )
-    for container in pod.spec.containers or []:
-        logs += await handle_container_logs(
-            k8s_manager=k8s_manager, pod=pod, container_name=container.name, **params
-        )
-    return logs
+    return await _gather_logs(
+        k8s_manager=k8s_manager,
+        pods=[pod],
+        cursors=cursors,
+        max_concurrency=max_concurrency,
+        **params,
+    )
+
+
+def _get_params(last_time: Optional[AwareDT], new_time: AwareDT, stream: bool) -> Dict:
+    params = {}
+    if last_time:
+        since_seconds = (new_time - last_time).total_seconds() - 1
+        params["since_seconds"] = int(since_seconds)
+    if stream:
+        params["tail_lines"] = V1Logs.CHUNK_SIZE
+    return params
 
 
 async def query_k8s_operation_logs(
@@ -76,28 +148,27 @@ async def query_k8s_operation_logs(
     instance: str,
     last_time: Optional[AwareDT],
     stream: bool = False,
+    cursors: LogsCursors = None,
+    max_concurrency: int = None,
 ) -> Tuple[List[V1Log], Optional[AwareDT]]:
+    """Fetches the logs of all containers of an operation concurrently.
 
+    If `cursors` is passed, it is updated with the last line fetched
+    for every container, and the next query only pulls the new lines.
+    """
     new_time = now()
-    params = {}
-    if last_time:
-        since_seconds = (new_time - last_time).total_seconds() - 1
-        params["since_seconds"] = int(since_seconds)
-    if stream:
-        params["tail_lines"] = V1Logs.CHUNK_SIZE
-    logs = []
+    params = _get_params(last_time=last_time, new_time=new_time, stream=stream)
 
     pods = await k8s_manager.list_pods(
         label_selector=k8s_manager.get_managed_by_polyaxon(instance)
     )
-
-    for pod in pods:
-        logs += await handle_pod_logs(
-            k8s_manager=k8s_manager,
-            pod=pod,
-            **params,
-        )
-
+    logs = await _gather_logs(
+        k8s_manager=k8s_manager,
+        pods=pods,
+        cursors=cursors,
+        max_concurrency=max_concurrency,
+        **params,
+    )
     return logs, new_time
 
 
@@ -106,16 +177,14 @@ async def query_k8s_pod_logs(
     pod: V1Pod,
     last_time: Optional[AwareDT],
     stream: bool = False,
+    cursors: LogsCursors = None,
 ) -> Tuple[List[V1Log], Optional[AwareDT]]:
     new_time = now()
-    params = {}
-    if last_time:
-        since_seconds = (new_time - last_time).total_seconds() - 1
-        params["since_seconds"] = int(since_seconds)
-    if stream:
-        params["tail_lines"] = V1Logs.CHUNK_SIZE
+    params = _get_params(last_time=last_time, new_time=new_time, stream=stream)
 
-    logs = await handle_pod_logs(k8s_manager=k8s_manager, pod=pod, **params)
+    logs = await handle_pod_logs(
+        k8s_manager=k8s_manager, pod=pod, cursors=cursors, **params
+    )
 
     if logs:
         last_time = logs[-1].timestamp
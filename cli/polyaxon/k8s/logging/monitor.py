@@ -14,16 +14,23 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+import os
+
 from datetime import datetime
-from typing import Any, Iterable, Optional
+from typing import Any, Iterable, Iterator, Optional
 
 from kubernetes.client.rest import ApiException
 
+from polyaxon.api import API_V1_LOCATION
 from polyaxon.client import RunClient
 from polyaxon.exceptions import PolyaxonK8SError
 from polyaxon.k8s.manager import K8SManager
+from polyaxon.utils.http_utils import absolute_uri
 from polyaxon.utils.tz_utils import now
-from traceml.logging import V1Log
+from traceml.logging import V1Log, V1Logs
+
+READ_CHUNK_SIZE = 64 * 1024
+WRITE_BUFFER_SIZE = 1024 * 1024
 
 
 def query_logs(
@@ -32,12 +39,15 @@ def query_logs(
     container_id: str,
     stream: bool = False,
     since_seconds: int = None,
+    preload_content: bool = True,
 ) -> Any:
     params = {}
     if stream:
-        params = {"follow": True, "_preload_content": False}
+        params["follow"] = True
+    if stream or not preload_content:
+        params["_preload_content"] = False
     if since_seconds:
-        params = {"since_seconds": since_seconds}
+        params["since_seconds"] = since_seconds
 
     return k8s_manager.k8s_api.read_namespaced_pod_log(
         pod_id, k8s_manager.namespace, container=container_id, timestamps=True, **params
@@ -54,6 +64,24 @@ def process_log_line(log_line: str):
     )
 
 
+def iter_log_lines(response: Any, chunk_size: int = None) -> Iterator[bytes]:
+    """Yields the lines of a raw log response while it is read in chunks."""
+    buffer = b""
+    try:
+        for chunk in response.stream(chunk_size or READ_CHUNK_SIZE):
+            buffer += chunk
+            lines = buffer.split(b"\n")
+            # The last item is either empty or a partial line
+            buffer = lines.pop()
+            for line in lines:
+                if line:
+                    yield line
+        if buffer:
+            yield buffer
+    finally:
+        response.release_conn()
+
+
 def stream_logs(
     k8s_manager: K8SManager, pod_id: str, container_id: str
 ) -> Iterable[str]:
@@ -87,6 +115,10 @@ def process_logs(
     filepath: str,
     since_seconds: int,
 ) -> bool:
+    """Writes the container logs to a csv file while they are read.
+
+    The logs are never fully loaded in memory.
+    """
     logs = None
     retries = 0
     no_logs = True
@@ -97,6 +129,7 @@ def process_logs(
                 pod_id=pod_id,
                 container_id=container_id,
                 since_seconds=since_seconds,
+                preload_content=False,
             )
             no_logs = False
         except (PolyaxonK8SError, ApiException):
@@ -105,19 +138,52 @@ def process_logs(
     if not logs:
         return False
 
-    log_lines = []
-    for log_line in logs.split("\n"):
-        if log_line:
-            log_lines.append(process_log_line(log_line=log_line))
+    has_logs = False
+    with open(filepath, "w+", buffering=WRITE_BUFFER_SIZE) as destination:
+        for log_line in iter_log_lines(logs):
+            log = process_log_line(log_line=log_line)
+            if not log or not log.value:
+                continue
+            if not has_logs:
+                destination.write(V1Logs.get_csv_header())
+                has_logs = True
+            destination.write("\n")
+            destination.write(log.to_csv())
 
-    # Creating the new file
-    if not log_lines:
-        return False
+    return has_logs
 
-    with open(filepath, "w+") as destination:
-        destination.write("\n".join(log_lines))
 
-    return True
+def iter_file_chunks(filepath: str, chunk_size: int = None) -> Iterator[bytes]:
+    with open(filepath, "rb") as f:
+        while True:
+            chunk = f.read(chunk_size or READ_CHUNK_SIZE)
+            if not chunk:
+                return
+            yield chunk
+
+
+def upload_logs(
+    client: RunClient, owner: str, project: str, run_uuid: str, filepath: str
+):
+    """Uploads a logs file as a stream of multipart chunks."""
+    url = absolute_uri(
+        url="{}{}/{}/runs/{}/logs/upload".format(
+            API_V1_LOCATION, owner, project, run_uuid
+        ),
+        host=client.client.config.host,
+    )
+    response = client.store.upload_stream(
+        url=url,
+        file_type="uploadfile",
+        filename=os.path.basename(filepath),
+        chunks=iter_file_chunks(filepath),
+        params={"path": filepath},
+        show_progress=False,
+        # Logs were uploaded without a size limit, long running jobs can exceed it
+        check_size=False,
+    )
+    response.raise_for_status()
+    return response
 
 
 def sync_logs(
@@ -147,8 +213,12 @@ def sync_logs(
         filepath=filepath,
     )
     if created:
-        client.client.upload_run_logs(
-            owner, project, run_uuid, uploadfile=filepath, path=filepath
+        upload_logs(
+            client=client,
+            owner=owner,
+            project=project,
+            run_uuid=run_uuid,
+            filepath=filepath,
         )
         return new_check
 
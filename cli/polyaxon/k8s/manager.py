@@ -14,17 +14,41 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.=
 
+import threading
+
 from kubernetes import client, config
 from kubernetes.client.rest import ApiException
 
 from polyaxon.exceptions import PolyaxonK8SError
 from polyaxon.k8s import constants
+from polyaxon.k8s.informer import (
+    INSTANCE_INDEX,
+    INSTANCE_LABEL,
+    Informer,
+    iter_list_pages,
+)
 from polyaxon.k8s.monitor import is_pod_running
 from polyaxon.logger import logger
 
 
 class K8SManager:
-    def __init__(self, k8s_config=None, namespace="default", in_cluster=False):
+    """Manager of the k8s resources of a namespace.
+
+    If `use_informers` is set, list calls are served from list+watch backed
+    local stores, one per resource kind and label selector,
+    and get calls are served from these stores when they hold the object.
+    """
+
+    LIST_PAGE_SIZE = 500
+    INFORMER_KWARGS = {"label_selector", "group", "version", "plural"}
+
+    def __init__(
+        self,
+        k8s_config=None,
+        namespace="default",
+        in_cluster=False,
+        use_informers=False,
+    ):
         if not k8s_config:
             if in_cluster:
                 config.load_incluster_config()
@@ -42,6 +66,9 @@ class K8SManager:
         self._k8s_version_api = None
         self.namespace = namespace
         self.in_cluster = in_cluster
+        self.use_informers = use_informers
+        self._informers = {}
+        self._informers_lock = threading.Lock()
 
     @property
     def k8s_api(self):
@@ -90,14 +117,64 @@ class K8SManager:
             if reraise:
                 raise PolyaxonK8SError("Connection error: %s" % e) from e
 
+    @staticmethod
+    def _get_informer_key(resource_api, label_selector=None, **kwargs):
+        return (
+            getattr(resource_api, "__name__", repr(resource_api)),
+            label_selector,
+            tuple(sorted(kwargs.items())),
+        )
+
+    def get_informer(self, resource_api, label_selector=None, **kwargs) -> Informer:
+        """Returns the started informer of a resource kind and a label selector."""
+        key = self._get_informer_key(resource_api, label_selector, **kwargs)
+        # The scheduler threads share the manager, only one informer is started per key
+        with self._informers_lock:
+            informer = self._informers.get(key)
+            if informer is None:
+                informer = Informer(
+                    resource_api=resource_api,
+                    namespace=self.namespace,
+                    label_selector=label_selector,
+                    page_size=self.LIST_PAGE_SIZE,
+                    **kwargs,
+                )
+                informer.start()
+                self._informers[key] = informer
+        return informer
+
+    def stop_informers(self):
+        with self._informers_lock:
+            informers, self._informers = self._informers, {}
+        for informer in informers.values():
+            informer.stop()
+
+    def _get_cached(self, resource_api, name, **kwargs):
+        """Looks up an object in the informers of its kind, if any holds it."""
+        api_name, _, api_kwargs = self._get_informer_key(resource_api, **kwargs)
+        with self._informers_lock:
+            informers = list(self._informers.items())
+        for (key_name, _, key_kwargs), informer in informers:
+            if key_name != api_name or key_kwargs != api_kwargs:
+                continue
+            obj = informer.get(name)
+            if obj is not None:
+                return obj
+        return None
+
     def _list_namespace_resource(self, resource_api, reraise=False, **kwargs):
         try:
-            res = resource_api(namespace=self.namespace, **kwargs)
-            if isinstance(res, dict):
-                items = res["items"]
-            else:
-                items = res.items
-            return [p for p in items]
+            if self.use_informers and set(kwargs.keys()) <= self.INFORMER_KWARGS:
+                return self.get_informer(resource_api, **kwargs).list()
+            items = []
+            for page, _ in iter_list_pages(
+                resource_api,
+                limit=self.LIST_PAGE_SIZE,
+                namespace=self.namespace,
+                **kwargs,
+            ):
+                items += page
+            return items
         except ApiException as e:
             logger.error("K8S error: {}".format(e))
             if reraise:
@@ -159,6 +236,23 @@ class K8SManager:
             **kwargs,
         )
 
+    def list_instance_pods(self, instance, reraise=False):
+        """Lists the pods of a run instance."""
+        if not self.use_informers:
+            return self.list_pods(
+                reraise=reraise,
+                label_selector="{}={}".format(INSTANCE_LABEL, instance),
+            )
+        try:
+            return self.get_informer(self.k8s_api.list_namespaced_pod).get_by_index(
+                INSTANCE_INDEX, instance
+            )
+        except ApiException as e:
+            logger.error("K8S error: {}".format(e))
+            if reraise:
+                raise PolyaxonK8SError("Connection error: %s" % e) from e
+            return []
+
     def update_node_labels(self, node, labels, reraise=False):
         body = {"metadata": {"labels": labels}, "namespace": self.namespace}
         try:
@@ -471,6 +565,9 @@ class K8SManager:
             return None
 
     def get_service(self, name, reraise=False):
+        obj = self._get_cached(self.k8s_api.list_namespaced_service, name)
+        if obj is not None:
+            return obj
         try:
             return self.k8s_api.read_namespaced_service(
                 name=name, namespace=self.namespace
@@ -481,6 +578,9 @@ class K8SManager:
             return None
 
     def get_pod(self, name, reraise=False):
+        obj = self._get_cached(self.k8s_api.list_namespaced_pod, name)
+        if obj is not None:
+            return obj
         try:
             return self.k8s_api.read_namespaced_pod(name=name, namespace=self.namespace)
         except ApiException as e:
@@ -489,6 +589,9 @@ class K8SManager:
             return None
 
     def get_job(self, name, reraise=False):
+        obj = self._get_cached(self.k8s_batch_api.list_namespaced_job, name)
+        if obj is not None:
+            return obj
         try:
             return self.k8s_batch_api.read_namespaced_job(
                 name=name, namespace=self.namespace
@@ -499,6 +602,15 @@ class K8SManager:
             return None
 
     def get_custom_object(self, name, group, version, plural):
+        obj = self._get_cached(
+            self.k8s_custom_object_api.list_namespaced_custom_object,
+            name,
+            group=group,
+            version=version,
+            plural=plural,
+        )
+        if obj is not None:
+            return obj
         return self.k8s_custom_object_api.get_namespaced_custom_object(
             name=name,
             group=group,
@@ -508,6 +620,9 @@ class K8SManager:
         )
 
     def get_deployment(self, name, reraise=False):
+        obj = self._get_cached(self.k8s_apps_api.list_namespaced_deployment, name)
+        if obj is not None:
+            return obj
         try:
             return self.k8s_apps_api.read_namespaced_deployment(
                 name=name, namespace=self.namespace
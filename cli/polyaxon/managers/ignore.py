@@ -19,7 +19,7 @@ import re
 
 from collections import namedtuple
 from pathlib import PurePath
-from typing import List
+from typing import List, Optional, Union
 
 from polyaxon.logger import logger
 from polyaxon.managers.base import BaseConfigManager
@@ -48,6 +48,10 @@ class Pattern(namedtuple("Pattern", "pattern is_exclude re")):
         return bool(self.re.match(path))
 
 
+_RE_FLAGS = "(?ms)"
+_GLOB_CHARS = frozenset("*?[")
+
+
 def translate(pat):
     def _translate_segment():
         # pylint:disable=undefined-loop-variable
@@ -84,7 +88,7 @@ def translate(pat):
                 res += re.escape(c)
         return res
 
-    res = "(?ms)"
+    res = _RE_FLAGS
 
     if pat.startswith("**/"):
         pat = pat[2:]
@@ -108,6 +112,114 @@ def translate(pat):
     return res + "\\Z"
 
 
+def _get_literal(pattern: str):
+    """Returns the kind, the value and the dir only flag of a literal pattern.
+
+    Literal patterns are basenames, e.g. `node_modules` or `.git/`,
+    and basename suffixes, e.g. `*.pyc`, they are matched without a regex.
+    """
+    dir_only = pattern.endswith("/")
+    if dir_only:
+        pattern = pattern[:-1]
+    if not pattern or not pattern.isascii() or "/" in pattern:
+        return None
+    if pattern[0] == "*":
+        suffix = pattern[1:]
+        if suffix and not _GLOB_CHARS.intersection(suffix):
+            return "suffix", suffix.lower(), dir_only
+        return None
+    if _GLOB_CHARS.intersection(pattern):
+        return None
+    return "name", pattern.lower(), dir_only
+
+
+def _compile_patterns(patterns: List[Pattern], indices: List[int]):
+    """Compiles the patterns into a single regex, the last patterns are tried first.
+
+    Every pattern is wrapped in a group named after its index,
+    the group of the matching pattern is the last group closed.
+    """
+    if not indices:
+        return None
+    regex = "|".join(
+        "(?P<p{}>{})".format(i, translate(patterns[i].pattern)[len(_RE_FLAGS) :])
+        for i in reversed(indices)
+    )
+    return re.compile("{}(?:{})".format(_RE_FLAGS, regex), re.IGNORECASE)
+
+
+class IgnoreMatcher:
+    """Compiled matcher of an ordered list of patterns, the last match wins.
+
+    Literal basename and suffix patterns are resolved with dict lookups,
+    the remaining patterns are combined into a single regex.
+    """
+
+    def __init__(self, patterns: List[Pattern]):
+        self.patterns = list(patterns)
+        self._names = {}
+        self._suffixes = {}
+        generic = []
+        # Visiting the patterns in reverse order keeps every lookup list
+        # sorted by decreasing index, the first valid match is the last pattern
+        for index in reversed(range(len(self.patterns))):
+            literal = _get_literal(self.patterns[index].pattern)
+            if literal is None:
+                generic.append(index)
+                continue
+            kind, value, dir_only = literal
+            if kind == "name":
+                self._names.setdefault(value, []).append((index, dir_only))
+            else:
+                self._suffixes.setdefault(value[-1], []).append(
+                    (value, index, dir_only)
+                )
+        self._re = _compile_patterns(self.patterns, generic[::-1])
+        self._full_re = None
+
+    def _match_regex(self, regex, path: str) -> int:
+        if regex is None:
+            return -1
+        m = regex.match(path)
+        return int(m.lastgroup[1:]) if m else -1
+
+    def _match_literals(self, path: str) -> int:
+        is_dir = path.endswith("/")
+        name = (path[:-1] if is_dir else path).rpartition("/")[2].lower()
+        if not name:
+            return -1
+        best = -1
+        for index, dir_only in self._names.get(name, ()):
+            if is_dir or not dir_only:
+                best = index
+                break
+        for suffix, index, dir_only in self._suffixes.get(name[-1], ()):
+            if index <= best:
+                break
+            if (is_dir or not dir_only) and name.endswith(suffix):
+                best = index
+                break
+        return best
+
+    def match(self, path: str) -> Optional[Pattern]:
+        """Returns the last pattern matching the path."""
+        if path.isascii():
+            index = max(self._match_literals(path), self._match_regex(self._re, path))
+        else:
+            # Case folding of non ascii chars is left to the regex engine
+            if self._full_re is None:
+                self._full_re = _compile_patterns(
+                    self.patterns, list(range(len(self.patterns)))
+                )
+            index = self._match_regex(self._full_re, path)
+        return self.patterns[index] if index >= 0 else None
+
+    def is_ignored(self, path: str, is_dir: bool = False) -> Optional[bool]:
+        path = "{}/".format(path.rstrip("/")) if is_dir else path
+        pattern = self.match(path)
+        return pattern.is_exclude if pattern else None
+
+
 class IgnoreConfigManager(BaseConfigManager):
     """Manages .polyaxonignore file in the current directory"""
 
@@ -137,8 +249,15 @@ class IgnoreConfigManager(BaseConfigManager):
                 yield pattern
 
     @classmethod
-    def is_ignored(cls, path, patterns, is_dir: bool = False):
+    def is_ignored(
+        cls,
+        path,
+        patterns: Union[List[Pattern], IgnoreMatcher],
+        is_dir: bool = False,
+    ):
         """Check whether a path is ignored. For directories, include a trailing slash."""
+        if isinstance(patterns, IgnoreMatcher):
+            return patterns.is_ignored(path, is_dir=is_dir)
         status = None
         path = "{}/".format(path.rstrip("/")) if is_dir else path
         for pattern in cls.find_matching(path, patterns):
@@ -184,24 +303,46 @@ class IgnoreConfigManager(BaseConfigManager):
     ):
         config = to_list(cls.get_config(), check_none=True)
         config += to_list(addtional_patterns, check_none=True)
+        matcher = IgnoreMatcher(config)
         unignored_files = []
         path = path or "."
 
-        for root, dirs, files in os.walk(path):
-            logger.debug("Root:%s, Dirs:%s", root, dirs)
+        unix_path = unix_style_path(path)
+        if matcher.is_ignored(unix_path, is_dir=True):
+            logger.debug("Ignoring directory : %s", path)
+            return unignored_files
 
-            if cls.is_ignored(unix_style_path(root), config, is_dir=True):
-                dirs[:] = []
-                logger.debug("Ignoring directory : %s", root)
+        # Same top-down order as `os.walk`, directories are checked before
+        # being scanned and the unix style paths are built incrementally
+        stack = [(path, unix_path)]
+        while stack:
+            root, unix_root = stack.pop()
+            try:
+                with os.scandir(root) as it:
+                    entries = list(it)
+            except OSError:
                 continue
 
-            for file_name in files:
-                filepath = unix_style_path(os.path.join(root, file_name))
-                if cls.is_ignored(filepath, config):
-                    logger.debug("Ignoring file : %s", file_name)
-                    continue
-
-                unignored_files.append(os.path.join(root, file_name))
+            prefix = unix_root if unix_root.endswith("/") else unix_root + "/"
+            dirs = []
+            for entry in entries:
+                try:
+                    is_dir = entry.is_dir()
+                except OSError:
+                    is_dir = False
+                if is_dir:
+                    if entry.is_symlink():
+                        continue
+                    unix_dirpath = prefix + entry.name
+                    if matcher.is_ignored(unix_dirpath, is_dir=True):
+                        logger.debug("Ignoring directory : %s", entry.path)
+                        continue
+                    dirs.append((entry.path, unix_dirpath))
+                elif matcher.is_ignored(prefix + entry.name):
+                    logger.debug("Ignoring file : %s", entry.name)
+                else:
+                    unignored_files.append(entry.path)
+            stack.extend(reversed(dirs))
 
         return unignored_files
 
@@ -17,11 +17,18 @@
 import os
 
 from collections import OrderedDict
-from typing import Dict, List, Union
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Tuple, Union
 
 from polyaxon.cli.errors import handle_cli_error
 from polyaxon.config_reader.spec import ConfigSpec
 from polyaxon.exceptions import PolyaxonfileError, PolyaxonSchemaError
+from polyaxon.polyaxonfile.components_cache import (
+    get_components_cache,
+    get_hub_ref_cache_args,
+    get_path_ref_cache_args,
+    get_url_ref_cache_args,
+)
 from polyaxon.polyaxonfile.manager import (
     get_op_specification,
     is_supported_in_eager_mode,
@@ -32,42 +39,87 @@ from polyaxon.polyflow import V1Dag, V1Init, V1Matrix, V1Operation
 from polyaxon.utils.formatting import Printer, dict_tabulate
 from polyaxon.utils.list_utils import to_list
 
+COLLECT_MAX_WORKERS = 8
+
+
+def _get_reference_key(op: V1Operation) -> Tuple[str, str]:
+    if op.has_hub_reference:
+        return "hub", op.hub_ref
+    if op.has_url_reference:
+        return "url", op.url_ref
+    return "path", op.path_ref
+
 
-def collect_dag_components(dag: V1Dag, path_context: str = None):
-    """Collect components that cannot be resolved by the scheduler"""
+def collect_dag_components(
+    dag: V1Dag, path_context: str = None, max_workers: int = None
+):
+    """Collect components that cannot be resolved by the scheduler.
+
+    Every distinct reference is resolved once, references are resolved concurrently.
+    """
+    ops_by_ref = OrderedDict()
     for op in dag.operations:
-        op_name = op.name
         if op.has_url_reference or op.has_path_reference or op.has_hub_reference:
-            try:
-                op = collect_references(op, path_context)
-            except Exception as e:
-                raise PolyaxonSchemaError(
-                    "Pipeline op with name `{}` requires a component with ref `{}`, "
-                    "the reference could not be resolved. Error: {}".format(
-                        op_name, op.hub_ref or op.url_ref or op.path_ref, e
-                    )
+            ops_by_ref.setdefault(_get_reference_key(op), []).append(op)
+
+    def collect(ops: List[V1Operation]):
+        op = ops[0]
+        try:
+            collect_references(op, path_context)
+        except Exception as e:
+            raise PolyaxonSchemaError(
+                "Pipeline op with name `{}` requires a component with ref `{}`, "
+                "the reference could not be resolved. Error: {}".format(
+                    op.name, op.hub_ref or op.url_ref or op.path_ref, e
                 )
+            )
+        for other_op in ops[1:]:
+            other_op.component = op.component.clone()
+
+    if len(ops_by_ref) <= 1:
+        for ops in ops_by_ref.values():
+            collect(ops)
+        return
+
+    max_workers = min(max_workers or COLLECT_MAX_WORKERS, len(ops_by_ref))
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        futures = [executor.submit(collect, ops) for ops in ops_by_ref.values()]
+        for future in futures:
+            future.result()
+
+
+def _read_component(config: V1Operation, path_context: str = None):
+    cache = get_components_cache()
+    if config.has_hub_reference:
+        key, fetch = get_hub_ref_cache_args(config.hub_ref)
+        return cache.get_or_fetch(key, fetch), path_context
+    if config.has_url_reference:
+        key, fetch = get_url_ref_cache_args(config.url_ref)
+        return cache.get_or_fetch(key, fetch), path_context
+
+    path_ref = config.path_ref
+    if path_context:
+        path_ref = os.path.join(
+            os.path.dirname(os.path.abspath(path_context)), path_ref
+        )
+    if not os.path.isfile(path_ref):
+        return get_specification(data=ConfigSpec.get_from(path_ref).read()), path_ref
+    key, fetch, validator = get_path_ref_cache_args(path_ref)
+    return cache.get_or_fetch(key, fetch, validator=validator), path_ref
 
 
 def collect_references(config: V1Operation, path_context: str = None):
     if config.has_component_reference:
         return config
-    elif config.has_hub_reference:
-        component = ConfigSpec.get_from(config.hub_ref, "hub").read()
-    elif config.has_url_reference:
-        component = ConfigSpec.get_from(config.url_ref, "url").read()
-    elif config.has_path_reference:
-        path_ref = config.path_ref
-        if path_context:
-            path_ref = os.path.join(
-                os.path.dirname(os.path.abspath(path_context)), path_ref
-            )
-        component = ConfigSpec.get_from(path_ref).read()
-        path_context = path_ref
+    elif (
+        config.has_hub_reference
+        or config.has_url_reference
+        or config.has_path_reference
+    ):
+        component, path_context = _read_component(config, path_context)
     else:
         raise PolyaxonfileError("Operation found without component")
 
-    component = get_specification(data=component)
     if component.kind != kinds.COMPONENT:
         if config.has_url_reference:
             ref_type = "Url ref"
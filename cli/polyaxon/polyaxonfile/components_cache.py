@@ -0,0 +1,257 @@
+#!/usr/bin/python
+#
+# Copyright 2018-2022 Polyaxon, Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import hashlib
+import os
+import pickle
+import threading
+
+from time import time
+from typing import Callable, Dict, Optional, Tuple
+
+from polyaxon import pkg
+from polyaxon.contexts import paths as ctx_paths
+from polyaxon.logger import logger
+from polyaxon.polyaxonfile.specs import get_specification
+from polyaxon.polyflow import V1Component
+from polyaxon.utils.path_utils import check_or_create_path, delete_path
+
+
+class ComponentsCache:
+    """Content addressed on-disk cache of the components resolved from references.
+
+    Every entry is keyed by the hash of (registry, name, version)
+    and holds the dumped component next to its fetch metadata.
+    Entries written by a different Polyaxon version are dropped,
+    so a cached component is always re-read with the current schemas.
+    Entries with an etag are revalidated with a conditional request
+    once their ttl expires, entries with a validator, e.g. the mtime of a local file,
+    are only used if the validator did not change.
+    Only components are cached, other specifications are always fetched.
+
+    Args:
+        path: str, optional, the cache directory.
+        ttl: int, optional, seconds during which an entry is used without revalidation.
+        enabled: bool, optional, if disabled every reference is fetched.
+    """
+
+    TTL = 10 * 60
+    DIR_NAME = "components"
+
+    def __init__(self, path: str = None, ttl: int = None, enabled: bool = True):
+        self._path = path or os.path.join(
+            ctx_paths.CONTEXT_USER_POLYAXON_PATH, self.DIR_NAME
+        )
+        self._ttl = ttl if ttl is not None else self.TTL
+        self._enabled = enabled
+        self._lock = threading.Lock()
+        self._hits = 0
+        self._misses = 0
+        self._revalidated = 0
+
+    @property
+    def path(self) -> str:
+        return self._path
+
+    @property
+    def enabled(self) -> bool:
+        return self._enabled
+
+    @staticmethod
+    def get_key(*parts: str) -> str:
+        return hashlib.sha256("\0".join(parts).encode("utf-8")).hexdigest()
+
+    def _get_entry_path(self, key: str) -> str:
+        return os.path.join(self._path, key[:2], "{}.plx.pickle".format(key))
+
+    def load(self, key: str) -> Optional[Dict]:
+        entry_path = self._get_entry_path(key)
+        try:
+            with open(entry_path, "rb") as f:
+                entry = pickle.load(f)
+        except FileNotFoundError:
+            return None
+        except Exception as e:
+            # A partial entry can be written if the process was killed
+            logger.debug("Dropping corrupted component cache entry %s: %s", key, e)
+            delete_path(entry_path)
+            return None
+        if not isinstance(entry, dict) or entry.get("version") != pkg.VERSION:
+            logger.debug("Dropping outdated component cache entry %s", key)
+            delete_path(entry_path)
+            return None
+        return entry
+
+    def save(
+        self,
+        key: str,
+        component: V1Component,
+        etag: str = None,
+        validator: Tuple = None,
+        fetched_at: float = None,
+    ):
+        entry = {
+            "version": pkg.VERSION,
+            "component": component.to_dict(),
+            "etag": etag,
+            "validator": validator,
+            "fetched_at": fetched_at or time(),
+        }
+        entry_path = self._get_entry_path(key)
+        tmp_path = "{}.{}.{}.tmp".format(entry_path, os.getpid(), threading.get_ident())
+        try:
+            check_or_create_path(entry_path, is_dir=False)
+            with open(tmp_path, "wb") as f:
+                pickle.dump(entry, f, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(tmp_path, entry_path)
+        except Exception as e:
+            # The cache is an optimization, failing to write it is not an error
+            logger.debug("Could not write component cache entry %s: %s", key, e)
+            delete_path(tmp_path)
+
+    def is_fresh(self, entry: Dict) -> bool:
+        return time() - entry["fetched_at"] < self._ttl
+
+    def get_or_fetch(
+        self,
+        key: str,
+        fetch: Callable[[Optional[str]], Tuple[Optional[Dict], Optional[str]]],
+        validator: Tuple = None,
+    ) -> V1Component:
+        """Returns the cached component or fetches it.
+
+        The fetched specification is returned as is if it's not a component,
+        so that the caller can report its kind.
+
+        Args:
+            key: str, the cache key.
+            fetch: callable, called with the cached etag,
+                 it should return the config and its etag,
+                 or `None` as config if the content was not modified.
+            validator: tuple, optional, if provided the entry is only used
+                 when its validator is equal, the ttl is not checked.
+        """
+        entry = self.load(key) if self._enabled else None
+        if entry is not None:
+            if validator is not None:
+                is_valid = entry["validator"] == validator
+            else:
+                is_valid = self.is_fresh(entry)
+            if is_valid:
+                self._inc("_hits")
+                return V1Component.from_dict(entry["component"])
+            if validator is not None:
+                entry = None
+
+        config, etag = fetch(entry["etag"] if entry else None)
+        if config is None and entry is not None:
+            self._inc("_revalidated")
+            component = V1Component.from_dict(entry["component"])
+            self.save(key, component, etag=entry["etag"])
+            return component
+
+        self._inc("_misses")
+        component = get_specification(data=config)
+        if self._enabled and isinstance(component, V1Component):
+            self.save(key, component, etag=etag, validator=validator)
+        return component
+
+    def _inc(self, name: str):
+        with self._lock:
+            setattr(self, name, getattr(self, name) + 1)
+
+    def get_metrics(self) -> Dict:
+        return {
+            "hits": self._hits,
+            "misses": self._misses,
+            "revalidated": self._revalidated,
+        }
+
+    def clear(self):
+        delete_path(self._path)
+
+
+def _fetch_polyaxon_hub(hub: str):
+    from polyaxon.config_reader.spec import _read_from_polyaxon_hub
+
+    return _read_from_polyaxon_hub(hub), None
+
+
+def get_hub_ref_cache_args(hub: str) -> Tuple[str, Callable]:
+    """Returns the cache key and the fetch function of a hub reference."""
+    from polyaxon import settings
+    from polyaxon.api import POLYAXON_CLOUD_HOST
+    from polyaxon.config_reader.spec import fetch_public_hub, get_public_hub_info
+    from polyaxon.constants.globals import DEFAULT_HUB
+    from polyaxon.env_vars.getters import get_component_info
+    from polyaxon.env_vars.keys import EV_KEYS_USE_GIT_REGISTRY
+
+    if os.environ.get(EV_KEYS_USE_GIT_REGISTRY, False):
+        registry, name, version = get_public_hub_info(hub)
+        return (
+            ComponentsCache.get_key("hub", registry, name, version),
+            lambda etag: fetch_public_hub(hub, etag=etag),
+        )
+
+    owner, component, version = get_component_info(hub)
+    if owner == DEFAULT_HUB:
+        registry = POLYAXON_CLOUD_HOST
+    else:
+        registry = settings.CLIENT_CONFIG.host if settings.CLIENT_CONFIG else ""
+    return (
+        ComponentsCache.get_key(
+            "hub", registry, "{}/{}".format(owner, component), version
+        ),
+        lambda _: _fetch_polyaxon_hub(hub),
+    )
+
+
+def get_url_ref_cache_args(url: str) -> Tuple[str, Callable]:
+    from polyaxon.config_reader.spec import fetch_url
+
+    return (
+        ComponentsCache.get_key("url", url),
+        lambda etag: fetch_url(url, etag=etag),
+    )
+
+
+def get_path_ref_cache_args(path: str) -> Tuple[str, Callable, Tuple]:
+    from polyaxon.config_reader.spec import ConfigSpec
+
+    path = os.path.abspath(path)
+    stat = os.stat(path)
+    return (
+        ComponentsCache.get_key("path", path),
+        lambda _: (ConfigSpec.get_from(path).read(), None),
+        (stat.st_mtime_ns, stat.st_size),
+    )
+
+
+_COMPONENTS_CACHE = None
+
+
+def get_components_cache() -> ComponentsCache:
+    global _COMPONENTS_CACHE
+
+    if _COMPONENTS_CACHE is None:
+        from polyaxon import settings
+
+        client_config = settings.CLIENT_CONFIG
+        _COMPONENTS_CACHE = ComponentsCache(
+            ttl=client_config.components_cache_ttl if client_config else None,
+            enabled=client_config.components_cache if client_config else True,
+        )
+    return _COMPONENTS_CACHE
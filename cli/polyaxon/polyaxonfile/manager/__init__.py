@@ -17,6 +17,7 @@
 from polyaxon.polyaxonfile.manager.operations import get_op_specification
 from polyaxon.polyaxonfile.manager.workflows import (
     get_eager_matrix_operations,
+    get_eager_matrix_suggestions,
     get_ops_from_suggestions,
     is_supported_in_eager_mode,
 )
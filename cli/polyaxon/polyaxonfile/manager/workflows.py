@@ -13,13 +13,23 @@
 # WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
 # See the License for the specific language governing permissions and
 # limitations under the License.
+
 import copy
+import itertools
 
-from typing import Dict, List, Union
+from functools import reduce
+from operator import mul
+from typing import Dict, Iterable, Iterator, Tuple, Union
 
 from polyaxon.exceptions import PolyaxonSchemaError
 from polyaxon.polyaxonfile.specs.libs.parser import Parser
-from polyaxon.polyflow import V1CompiledOperation, V1MatrixKind, V1Operation, V1Param
+from polyaxon.polyflow import (
+    V1CompiledOperation,
+    V1GridSearch,
+    V1MatrixKind,
+    V1Operation,
+    V1Param,
+)
 from polyaxon.utils.formatting import Printer
 
 
@@ -47,10 +57,14 @@ def get_op_from_schedule(
 def get_ops_from_suggestions(
     content: str,
     compiled_operation: V1CompiledOperation,
-    suggestions: List[Dict],
-) -> List[V1Operation]:
+    suggestions: Iterable[Dict],
+) -> Iterator[V1Operation]:
+    """Generates an operation per suggestion.
 
-    io_keys = compiled_operation.get_io_names()
+    The operations are shallow copies of the same base operation,
+    only their `params` differ, they should not be mutated in place.
+    """
+    io_keys = set(compiled_operation.get_io_names())
 
     def has_param(k: str):
         if not compiled_operation.matrix:
@@ -58,36 +72,50 @@ def get_ops_from_suggestions(
         return k not in io_keys
 
     op_content = V1Operation.read(content)
+    op_content.matrix = None
+    op_content.conditions = None
+    op_content.schedule = None
+    op_content.events = None
+    op_content.dependencies = None
+    op_content.trigger = None
+    op_content.build = None
+    op_content.is_approved = None
+    op_content.skip_on_upstream_skip = None
+    op_content.cache = compiled_operation.cache
+    op_content.queue = compiled_operation.queue
+    op_content.component.inputs = compiled_operation.inputs
+    op_content.component.outputs = compiled_operation.outputs
+    op_content.component.contexts = compiled_operation.contexts
+    op_content.component.run = compiled_operation.run
     for suggestion in suggestions:
-        params = {
+        op_spec = copy.copy(op_content)
+        op_spec.params = {
             k: V1Param(value=Parser.parse_expression(v, {}), context_only=has_param(k))
             for (k, v) in suggestion.items()
         }
-        op_spec = copy.deepcopy(op_content)
-        op_spec.matrix = None
-        op_spec.conditions = None
-        op_spec.schedule = None
-        op_spec.events = None
-        op_spec.dependencies = None
-        op_spec.trigger = None
-        op_spec.build = None
-        op_spec.is_approved = None
-        op_spec.skip_on_upstream_skip = None
-        op_spec.cache = compiled_operation.cache
-        op_spec.queue = compiled_operation.queue
-        op_spec.params = params
-        op_spec.component.inputs = compiled_operation.inputs
-        op_spec.component.outputs = compiled_operation.outputs
-        op_spec.component.contexts = compiled_operation.contexts
-        op_spec.component.run = compiled_operation.run
         yield op_spec
 
 
-def get_eager_matrix_operations(
-    content: str,
+def get_grid_search_suggestions(matrix: V1GridSearch) -> Tuple[int, Iterator[Dict]]:
+    """Returns the number of grid suggestions and a lazy iterator over them."""
+    from hypertune.matrix.utils import to_numpy
+
+    keys = list(matrix.params.keys())
+    values = [to_numpy(v) for v in matrix.params.values()]
+    num_suggestions = reduce(mul, [len(v) for v in values], 1)
+    if matrix.num_runs:
+        num_suggestions = min(num_suggestions, matrix.num_runs)
+    suggestions = (
+        dict(zip(keys, v))
+        for v in itertools.islice(itertools.product(*values), num_suggestions)
+    )
+    return num_suggestions, suggestions
+
+
+def get_eager_matrix_suggestions(
     compiled_operation: V1CompiledOperation,
     is_cli: bool = False,
-) -> List[V1Operation]:
+) -> Tuple[int, Iterable[Dict]]:
     is_supported_in_eager_mode(compiled_operation)
 
     try:
@@ -100,23 +128,34 @@ def get_eager_matrix_operations(
             )
         raise e
 
-    from hypertune.search_managers.grid_search.manager import GridSearchManager
     from hypertune.search_managers.mapping.manager import MappingManager
     from hypertune.search_managers.random_search.manager import RandomSearchManager
 
     if compiled_operation.has_random_search_matrix:
         suggestions = RandomSearchManager(compiled_operation.matrix).get_suggestions()
-    elif compiled_operation.has_grid_search_matrix:
-        suggestions = GridSearchManager(compiled_operation.matrix).get_suggestions()
-    elif compiled_operation.has_mapping_matrix:
+        return len(suggestions), suggestions
+    if compiled_operation.has_grid_search_matrix:
+        # Grid suggestions are generated lazily, large grids are never materialized
+        return get_grid_search_suggestions(compiled_operation.matrix)
+    if compiled_operation.has_mapping_matrix:
         suggestions = MappingManager(compiled_operation.matrix).get_suggestions()
-    else:
-        raise PolyaxonSchemaError(
-            "Received a bad configuration, eager mode not supported, "
-            "I should not be here!"
-        )
+        return len(suggestions), suggestions
+    raise PolyaxonSchemaError(
+        "Received a bad configuration, eager mode not supported, "
+        "I should not be here!"
+    )
+
+
+def get_eager_matrix_operations(
+    content: str,
+    compiled_operation: V1CompiledOperation,
+    is_cli: bool = False,
+) -> Iterator[V1Operation]:
+    num_suggestions, suggestions = get_eager_matrix_suggestions(
+        compiled_operation=compiled_operation, is_cli=is_cli
+    )
     if is_cli:
-        Printer.print_heading("Creating {} operations".format(len(suggestions)))
+        Printer.print_heading("Creating {} operations".format(num_suggestions))
     return get_ops_from_suggestions(
         content=content, compiled_operation=compiled_operation, suggestions=suggestions
     )
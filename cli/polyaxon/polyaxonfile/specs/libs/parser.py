@@ -19,6 +19,7 @@ import jinja2
 
 from collections.abc import Mapping
 from datetime import date, datetime
+from functools import lru_cache
 from typing import Dict
 
 from polyaxon.exceptions import PolyaxonSchemaError
@@ -33,6 +34,28 @@ except (ImportError, ModuleNotFoundError):
     np = None
 
 
+TEMPLATES_CACHE_SIZE = 2048
+TEMPLATE_MARKERS = ("{{", "{%", "{#")
+
+
+@lru_cache(maxsize=TEMPLATES_CACHE_SIZE)
+def _compile_template(engine: jinja2.Environment, source: str) -> jinja2.Template:
+    return engine.from_string(source)
+
+
+def is_template(expression: str) -> bool:
+    """Returns `False` if rendering the expression would return it unchanged.
+
+    Jinja also normalizes newlines and drops a single trailing newline,
+    such expressions are considered templates.
+    """
+    return (
+        any(marker in expression for marker in TEMPLATE_MARKERS)
+        or "\r" in expression
+        or expression.endswith("\n")
+    )
+
+
 class Parser:
     """Parses the Polyaxonfile."""
 
@@ -257,8 +280,14 @@ class Parser:
 
     @classmethod
     def _evaluate_expression(cls, expression, params, check_operators):
+        if not is_template(expression):
+            try:
+                return ast.literal_eval(expression)
+            except (ValueError, SyntaxError):
+                pass
+            return expression
         try:
-            result = cls.engine.from_string(expression).render(**params)
+            result = _compile_template(cls.engine, expression).render(**params)
         except (ValueError, TypeError) as e:
             raise PolyaxonSchemaError(
                 "Encountered a problem parsing the template, "
@@ -27,7 +27,7 @@ def validate(spec, data):
 
     def validate_keys(section, config, section_data):
         extra_args = [
-            key for key in section_data.keys() if key not in config.SCHEMA().fields
+            key for key in section_data.keys() if key not in config.get_schema().fields
         ]
         if extra_args:
             raise PolyaxonfileError(
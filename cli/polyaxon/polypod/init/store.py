@@ -15,9 +15,12 @@
 # limitations under the License.
 
 import os
+import shlex
 
 from typing import List, Optional, Tuple, Union
 
+import ujson
+
 from polyaxon.auxiliaries import V1PolyaxonInitContainer
 from polyaxon.containers.names import (
     INIT_ARTIFACTS_CONTAINER_PREFIX,
@@ -89,6 +92,21 @@ def cp_store_args(
     )
 
 
+def cp_store_paths_args(
+    backend: str,
+    manifest: List[Tuple[str, str, Optional[bool]]],
+    sync_fw: bool,
+) -> str:
+    args = []
+    if sync_fw:
+        args.append("--sync-fw")
+    return "polyaxon initializer paths --connection-kind={} --manifest={} {};".format(
+        backend,
+        shlex.quote(ujson.dumps(manifest, escape_forward_slashes=False)),
+        " ".join(args),
+    )
+
+
 def get_volume_args(
     store: V1ConnectionType,
     mount_path: str,
@@ -106,6 +124,7 @@ def get_volume_args(
     if not files and not dirs and not paths:
         dirs = [""]
     args = []
+    store_paths = []
     base_path_from = store.store_path
 
     def _copy():
@@ -127,60 +146,17 @@ def get_volume_args(
         args.append(get_or_create_args(path=base_path_to))
 
         # copy to context
-        if store.is_wasb:
-            args.append(
-                cp_store_args(
-                    backend="wasb",
-                    path_from=path_from,
-                    path_to=path_to,
-                    is_file=is_file,
-                    sync_fw=sync_fw,
-                    check_path=check_path,
-                )
-            )
-        elif store.is_s3:
-            args.append(
-                cp_store_args(
-                    backend="s3",
-                    path_from=path_from,
-                    path_to=path_to,
-                    is_file=is_file,
-                    sync_fw=sync_fw,
-                    check_path=check_path,
-                )
-            )
-        elif store.is_gcs:
+        if store.is_bucket or check_path:
+            store_paths.append((path_from, path_to, is_file, check_path))
+        else:
             args.append(
-                cp_store_args(
-                    backend="gcs",
+                cp_mount_args(
                     path_from=path_from,
                     path_to=path_to,
                     is_file=is_file,
                     sync_fw=sync_fw,
-                    check_path=check_path,
                 )
             )
-        else:
-            if check_path:
-                args.append(
-                    cp_store_args(
-                        backend=store.kind,
-                        path_from=path_from,
-                        path_to=path_to,
-                        is_file=is_file,
-                        sync_fw=sync_fw,
-                        check_path=check_path,
-                    )
-                )
-            else:
-                args.append(
-                    cp_mount_args(
-                        path_from=path_from,
-                        path_to=path_to,
-                        is_file=is_file,
-                        sync_fw=sync_fw,
-                    )
-                )
 
     check_path = False
     is_file = True
@@ -196,6 +172,39 @@ def get_volume_args(
     for p in paths:
         _copy()
 
+    if store.is_wasb:
+        backend = "wasb"
+    elif store.is_s3:
+        backend = "s3"
+    elif store.is_gcs:
+        backend = "gcs"
+    else:
+        backend = store.kind
+    if len(store_paths) == 1:
+        path_from, path_to, is_file, check_path = store_paths[0]
+        args.append(
+            cp_store_args(
+                backend=backend,
+                path_from=path_from,
+                path_to=path_to,
+                is_file=is_file,
+                sync_fw=sync_fw,
+                check_path=check_path,
+            )
+        )
+    elif store_paths:
+        # A single initializer process downloads all the paths concurrently
+        args.append(
+            cp_store_paths_args(
+                backend=backend,
+                manifest=[
+                    (path_from, path_to, None if check_path else is_file)
+                    for path_from, path_to, is_file, check_path in store_paths
+                ],
+                sync_fw=sync_fw,
+            )
+        )
+
     return " ".join(args)
 
 
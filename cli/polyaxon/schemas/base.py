@@ -13,11 +13,15 @@
 # WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
 # See the License for the specific language governing permissions and
 # limitations under the License.
+import copy
 import os
+import threading
 
 from collections import OrderedDict
 from collections.abc import Mapping
 from datetime import timezone
+from enum import Enum
+from typing import Dict
 
 import ujson
 
@@ -61,6 +65,59 @@ class BaseCamelSchema(BaseSchema):
         field_obj.data_key = to_camel_case(field_obj.data_key or field_name)
 
 
+_SCHEMAS = {}
+_SCHEMAS_LOCK = threading.Lock()
+
+
+def get_schema_instance(schema_cls, unknown=None) -> Schema:
+    """Returns a shared schema instance per schema class and unknown behaviour.
+
+    Schemas do not keep state between loads and dumps,
+    instances are reused since creating them is expensive.
+    """
+    key = (schema_cls, unknown)
+    schema = _SCHEMAS.get(key)
+    if schema is None:
+        with _SCHEMAS_LOCK:
+            schema = _SCHEMAS.get(key)
+            if schema is None:
+                schema = schema_cls(unknown=unknown) if unknown else schema_cls()
+                _SCHEMAS[key] = schema
+    return schema
+
+
+def _clone_value(value, memo: Dict):
+    """Deep copies configs and swagger models attribute by attribute.
+
+    The swagger models' client configuration is shared with the copy,
+    copying it would be more expensive than copying the model itself.
+    """
+    if value is None or isinstance(value, (str, int, float, bool, Enum)):
+        return value
+    value_id = id(value)
+    if value_id in memo:
+        return memo[value_id]
+    if isinstance(value, list):
+        result = [_clone_value(v, memo) for v in value]
+    elif isinstance(value, tuple):
+        result = tuple(_clone_value(v, memo) for v in value)
+    elif type(value) in (dict, OrderedDict):
+        result = type(value)(
+            (_clone_value(k, memo), _clone_value(v, memo)) for k, v in value.items()
+        )
+    elif isinstance(value, BaseConfig) or hasattr(value, "openapi_types"):
+        result = copy.copy(value)
+        memo[value_id] = result
+        for k, v in value.__dict__.items():
+            if k != "local_vars_configuration":
+                result.__dict__[k] = _clone_value(v, memo)
+        return result
+    else:
+        return copy.deepcopy(value, memo)
+    memo[value_id] = result
+    return result
+
+
 class BaseConfig:
     """Base for config classes."""
 
@@ -82,6 +139,10 @@ class BaseConfig:
     def _dump(obj_dict):
         return ujson.dumps(obj_dict)
 
+    @classmethod
+    def get_schema(cls, unknown=None) -> BaseSchema:
+        return get_schema_instance(cls.SCHEMA, unknown=unknown or cls.UNKNOWN_BEHAVIOUR)
+
     def to_light_dict(
         self,
         humanize_values=False,
@@ -154,9 +215,7 @@ class BaseConfig:
     ):
         unknown = unknown or cls.UNKNOWN_BEHAVIOUR
         humanized_attrs = cls.humanize_attrs(obj) if humanize_values else {}
-        data_dict = cls.SCHEMA(unknown=unknown).dump(  # pylint: disable=not-callable
-            obj
-        )
+        data_dict = cls.get_schema(unknown=unknown).dump(obj)
 
         if include_kind and "kind" not in data_dict and hasattr(obj, "kind"):
             data_dict["kind"] = obj.IDENTIFIER
@@ -184,9 +243,7 @@ class BaseConfig:
     @classmethod
     def from_dict(cls, value, unknown=None, partial: bool = False):
         unknown = unknown or cls.UNKNOWN_BEHAVIOUR
-        return cls.SCHEMA(unknown=unknown).load(  # pylint: disable=not-callable
-            value, partial=partial
-        )
+        return cls.get_schema(unknown=unknown).load(value, partial=partial)
 
     @classmethod
     def read(cls, values, unknown=None, partial: bool = False, config_type=None):
@@ -205,7 +262,8 @@ class BaseConfig:
                 os.chmod(filepath, mode)
 
     def clone(self):
-        return self.from_dict(self.to_dict())
+        """Returns a deep copy of the config without a serialization round trip."""
+        return _clone_value(self, {})
 
     @staticmethod
     def patch_normal_merge(current_value, value, strategy: V1PatchStrategy = None):
@@ -414,7 +472,11 @@ class BaseOneOfSchema(Schema):
         if not type_schema:
             return None, {"_schema": "Unsupported object type: %s" % obj_type}
 
-        schema = type_schema if isinstance(type_schema, Schema) else type_schema()
+        schema = (
+            type_schema
+            if isinstance(type_schema, Schema)
+            else get_schema_instance(type_schema)
+        )
 
         schema.context.update(getattr(self, "context", {}))
 
@@ -479,7 +541,11 @@ class BaseOneOfSchema(Schema):
                 {self.TYPE_FIELD: ["Unsupported value: %s" % data_type]}
             )
 
-        schema = type_schema if isinstance(type_schema, Schema) else type_schema()
+        schema = (
+            type_schema
+            if isinstance(type_schema, Schema)
+            else get_schema_instance(type_schema)
+        )
 
         schema.context.update(getattr(self, "context", {}))
 
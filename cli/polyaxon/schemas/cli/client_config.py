@@ -15,7 +15,7 @@
 # limitations under the License.
 import urllib3
 
-from marshmallow import EXCLUDE, fields
+from marshmallow import EXCLUDE, fields, validate
 
 import polyaxon_sdk
 
@@ -27,9 +27,15 @@ from polyaxon.env_vars.keys import (
     EV_KEYS_ASSERT_HOSTNAME,
     EV_KEYS_AUTHENTICATION_TYPE,
     EV_KEYS_CERT_FILE,
+    EV_KEYS_COALESCE_INTERVAL,
+    EV_KEYS_COALESCE_UPDATES,
+    EV_KEYS_COMPONENTS_CACHE,
+    EV_KEYS_COMPONENTS_CACHE_TTL,
     EV_KEYS_CONNECTION_POOL_MAXSIZE,
     EV_KEYS_DEBUG,
     EV_KEYS_DISABLE_ERRORS_REPORTING,
+    EV_KEYS_DOWNLOAD_STREAM_UNTAR,
+    EV_KEYS_DOWNLOAD_WORKERS,
     EV_KEYS_HEADER,
     EV_KEYS_HEADER_SERVICE,
     EV_KEYS_HOST,
@@ -37,16 +43,26 @@ from polyaxon.env_vars.keys import (
     EV_KEYS_INTERVALS_COMPATIBILITY_CHECK,
     EV_KEYS_IS_MANAGED,
     EV_KEYS_IS_OFFLINE,
+    EV_KEYS_JOURNAL_REQUESTS,
     EV_KEYS_K8S_IN_CLUSTER,
     EV_KEYS_K8S_NAMESPACE,
     EV_KEYS_KEY_FILE,
     EV_KEYS_LOG_LEVEL,
     EV_KEYS_NO_API,
     EV_KEYS_NO_OP,
+    EV_KEYS_SPAWNER_CONCURRENCY,
     EV_KEYS_SSL_CA_CERT,
     EV_KEYS_TIME_ZONE,
     EV_KEYS_TIMEOUT,
     EV_KEYS_TRACKING_TIMEOUT,
+    EV_KEYS_TRANSPORT_FULL_POLICY,
+    EV_KEYS_TRANSPORT_QUEUE_SIZE,
+    EV_KEYS_TRANSPORT_WORKERS,
+    EV_KEYS_UPLOAD_BANDWIDTH,
+    EV_KEYS_UPLOAD_COMPRESSION_LEVEL,
+    EV_KEYS_UPLOAD_CONCURRENCY,
+    EV_KEYS_UPLOAD_PART_SIZE,
+    EV_KEYS_UPLOAD_STREAMING,
     EV_KEYS_VERIFY_SSL,
     EV_KEYS_WATCH_INTERVAL,
 )
@@ -76,6 +92,40 @@ class ClientSchema(BaseSchema):
     timezone = fields.Str(allow_none=True, data_key=EV_KEYS_TIME_ZONE)
     watch_interval = fields.Int(allow_none=True, data_key=EV_KEYS_WATCH_INTERVAL)
     interval = fields.Float(allow_none=True, data_key=EV_KEYS_INTERVAL)
+    coalesce_updates = fields.Bool(allow_none=True, data_key=EV_KEYS_COALESCE_UPDATES)
+    coalesce_interval = fields.Float(
+        allow_none=True, data_key=EV_KEYS_COALESCE_INTERVAL
+    )
+    transport_workers = fields.Int(allow_none=True, data_key=EV_KEYS_TRANSPORT_WORKERS)
+    transport_queue_size = fields.Int(
+        allow_none=True, data_key=EV_KEYS_TRANSPORT_QUEUE_SIZE
+    )
+    transport_full_policy = fields.Str(
+        allow_none=True, data_key=EV_KEYS_TRANSPORT_FULL_POLICY
+    )
+    upload_concurrency = fields.Int(
+        allow_none=True, data_key=EV_KEYS_UPLOAD_CONCURRENCY
+    )
+    upload_bandwidth = fields.Int(allow_none=True, data_key=EV_KEYS_UPLOAD_BANDWIDTH)
+    upload_part_size = fields.Int(allow_none=True, data_key=EV_KEYS_UPLOAD_PART_SIZE)
+    download_workers = fields.Int(allow_none=True, data_key=EV_KEYS_DOWNLOAD_WORKERS)
+    download_stream_untar = fields.Bool(
+        allow_none=True, data_key=EV_KEYS_DOWNLOAD_STREAM_UNTAR
+    )
+    upload_streaming = fields.Bool(allow_none=True, data_key=EV_KEYS_UPLOAD_STREAMING)
+    upload_compression_level = fields.Int(
+        allow_none=True,
+        data_key=EV_KEYS_UPLOAD_COMPRESSION_LEVEL,
+        validate=validate.Range(min=0, max=9),
+    )
+    journal_requests = fields.Bool(allow_none=True, data_key=EV_KEYS_JOURNAL_REQUESTS)
+    spawner_concurrency = fields.Int(
+        allow_none=True, data_key=EV_KEYS_SPAWNER_CONCURRENCY
+    )
+    components_cache = fields.Bool(allow_none=True, data_key=EV_KEYS_COMPONENTS_CACHE)
+    components_cache_ttl = fields.Int(
+        allow_none=True, data_key=EV_KEYS_COMPONENTS_CACHE_TTL
+    )
     verify_ssl = fields.Bool(allow_none=True, data_key=EV_KEYS_VERIFY_SSL)
     ssl_ca_cert = fields.Str(allow_none=True, data_key=EV_KEYS_SSL_CA_CERT)
     cert_file = fields.Str(allow_none=True, data_key=EV_KEYS_CERT_FILE)
@@ -118,6 +168,10 @@ class ClientConfig(BaseConfig):
         EV_KEYS_ASSERT_HOSTNAME,
         EV_KEYS_AUTHENTICATION_TYPE,
         EV_KEYS_CERT_FILE,
+        EV_KEYS_COALESCE_INTERVAL,
+        EV_KEYS_COALESCE_UPDATES,
+        EV_KEYS_COMPONENTS_CACHE,
+        EV_KEYS_COMPONENTS_CACHE_TTL,
         EV_KEYS_CONNECTION_POOL_MAXSIZE,
         EV_KEYS_ARCHIVE_ROOT,
         EV_KEYS_DEBUG,
@@ -127,14 +181,26 @@ class ClientConfig(BaseConfig):
         EV_KEYS_INTERVAL,
         EV_KEYS_IS_MANAGED,
         EV_KEYS_IS_OFFLINE,
+        EV_KEYS_JOURNAL_REQUESTS,
         EV_KEYS_K8S_NAMESPACE,
         EV_KEYS_KEY_FILE,
         EV_KEYS_LOG_LEVEL,
         EV_KEYS_NO_API,
         EV_KEYS_NO_OP,
+        EV_KEYS_SPAWNER_CONCURRENCY,
         EV_KEYS_SSL_CA_CERT,
         EV_KEYS_TIMEOUT,
         EV_KEYS_TRACKING_TIMEOUT,
+        EV_KEYS_TRANSPORT_FULL_POLICY,
+        EV_KEYS_TRANSPORT_QUEUE_SIZE,
+        EV_KEYS_TRANSPORT_WORKERS,
+        EV_KEYS_DOWNLOAD_STREAM_UNTAR,
+        EV_KEYS_DOWNLOAD_WORKERS,
+        EV_KEYS_UPLOAD_BANDWIDTH,
+        EV_KEYS_UPLOAD_COMPRESSION_LEVEL,
+        EV_KEYS_UPLOAD_CONCURRENCY,
+        EV_KEYS_UPLOAD_PART_SIZE,
+        EV_KEYS_UPLOAD_STREAMING,
         EV_KEYS_VERIFY_SSL,
         EV_KEYS_WATCH_INTERVAL,
         EV_KEYS_DISABLE_ERRORS_REPORTING,
@@ -158,6 +224,22 @@ class ClientConfig(BaseConfig):
         timezone=None,
         watch_interval=None,
         interval=None,
+        coalesce_updates=None,
+        coalesce_interval=None,
+        transport_workers=None,
+        transport_queue_size=None,
+        transport_full_policy=None,
+        upload_concurrency=None,
+        upload_bandwidth=None,
+        upload_part_size=None,
+        download_workers=None,
+        download_stream_untar=None,
+        upload_streaming=None,
+        upload_compression_level=None,
+        journal_requests=None,
+        spawner_concurrency=None,
+        components_cache=None,
+        components_cache_ttl=None,
         verify_ssl=None,
         ssl_ca_cert=None,
         cert_file=None,
@@ -201,6 +283,24 @@ class ClientConfig(BaseConfig):
         self.timezone = timezone
         self.interval = interval or 5
         self.watch_interval = watch_interval or 5
+        self.coalesce_updates = self._get_bool(coalesce_updates, False)
+        self.coalesce_interval = coalesce_interval or 2
+        self.transport_workers = transport_workers
+        self.transport_queue_size = transport_queue_size
+        self.transport_full_policy = transport_full_policy
+        self.upload_concurrency = upload_concurrency
+        self.upload_bandwidth = upload_bandwidth
+        self.upload_part_size = upload_part_size or 64 * 1024 * 1024
+        self.download_workers = download_workers or 4
+        self.download_stream_untar = self._get_bool(download_stream_untar, True)
+        self.upload_streaming = self._get_bool(upload_streaming, False)
+        self.upload_compression_level = (
+            upload_compression_level if upload_compression_level is not None else 9
+        )
+        self.journal_requests = self._get_bool(journal_requests, False)
+        self.spawner_concurrency = spawner_concurrency
+        self.components_cache = self._get_bool(components_cache, True)
+        self.components_cache_ttl = components_cache_ttl
         self.namespace = namespace
         self.no_api = self._get_bool(no_api, False)
         self.authentication_type = authentication_type or AuthenticationTypes.TOKEN
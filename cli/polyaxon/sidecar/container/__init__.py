@@ -33,7 +33,8 @@ from polyaxon.k8s.async_manager import AsyncK8SManager
 from polyaxon.logger import logger
 from polyaxon.settings import CLIENT_CONFIG
 from polyaxon.sidecar.container.intervals import get_sync_interval
-from polyaxon.sidecar.container.monitors import sync_artifacts, sync_logs
+from polyaxon.sidecar.container.monitors import LogsCollector, sync_artifacts, sync_logs
+from polyaxon.sidecar.container.pod_watcher import PodStatusWatcher
 from polyaxon.sidecar.ignore import IGNORE_FOLDERS
 from polyaxon.utils.tz_utils import now
 
@@ -67,7 +68,8 @@ async def start_sidecar(
     pod = await k8s_manager.get_pod(pod_id, reraise=True)
     connection_type = get_artifacts_connection_type()
     fs = await get_async_fs_from_type(connection_type=connection_type)
-    fw = FSWatcher.read(ctx_paths.CONTEXT_MOUNT_FILE_WATCHER)
+    fw = FSWatcher.read(ctx_paths.CONTEXT_MOUNT_FILE_WATCHER, use_events=True)
+    logs_collector = LogsCollector(run_uuid=run_uuid, pod_name=pod.metadata.name)
 
     retry = 0
     is_running = True
@@ -80,10 +82,9 @@ async def start_sidecar(
     async def monitor():
         if monitor_logs:
             await sync_logs(
-                run_uuid=run_uuid,
                 k8s_manager=k8s_manager,
                 pod=pod,
-                last_time=None,
+                collector=logs_collector,
                 stream=True,
                 is_running=is_running,
             )
@@ -119,12 +120,17 @@ async def start_sidecar(
             if update_last_check:
                 state["last_artifacts_check"] = now()
 
+    pod_watcher = PodStatusWatcher(
+        k8s_manager=k8s_manager, pod_id=pod_id, container_id=container_id, pod=pod
+    )
+    pod_watcher.start()
     while is_running and retry <= 3:
-        await asyncio.sleep(sleep_interval)
+        # Returns early if the watch reports that the main container stopped
+        await pod_watcher.wait(sleep_interval)
         if retry:
             await asyncio.sleep(retry * 2)
         try:
-            is_running = await k8s_manager.is_pod_running(pod_id, container_id)
+            is_running = await pod_watcher.is_running()
         except ApiException as e:
             retry += 1
             logger.info("Exception %s" % repr(e))
@@ -143,6 +149,7 @@ async def start_sidecar(
             except Exception as e:
                 logger.warning("Polyaxon sidecar error: %s" % repr(e))
 
+    await pod_watcher.stop()
     await monitor()
     logger.info("Cleaning non main containers")
     if k8s_manager:
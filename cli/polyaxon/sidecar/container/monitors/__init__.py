@@ -15,4 +15,4 @@
 # limitations under the License.
 
 from polyaxon.sidecar.container.monitors.artifacts import sync_artifacts
-from polyaxon.sidecar.container.monitors.logs import sync_logs
+from polyaxon.sidecar.container.monitors.logs import LogsCollector, sync_logs
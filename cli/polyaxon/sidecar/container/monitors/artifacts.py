@@ -14,22 +14,35 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 import os
+import time
 
+from functools import partial
 from typing import List
 
+from polyaxon import settings
 from polyaxon.contexts import paths as ctx_paths
 from polyaxon.fs.async_manager import ensure_async_execution
+from polyaxon.fs.multipart import (
+    MultipartUpload,
+    get_transfer_budget,
+    supports_multipart,
+)
 from polyaxon.fs.types import FSSystem
 from polyaxon.fs.watcher import FSWatcher
 from polyaxon.logger import logger
+from polyaxon.utils.coroutine import run_sync
 
 from fsspec.asyn import _run_coros_in_chunks  # noqa
 
+# Seconds between the checkpoints of the index during the multipart uploads
+CHECKPOINT_INTERVAL = 10
+
 
 async def sync_fs(
     fs: FSSystem,
     fw: FSWatcher,
     store_base_path: str,
+    index_path: str = None,
 ):
     def get_store_path(subpath: str):
         return os.path.join(store_base_path, subpath)
@@ -67,11 +80,26 @@ async def sync_fs(
         return_exceptions=True,
         nofiles=True,
     )
-    put_files = fw.get_files_to_put()
-    logger.debug("put_files {}".format(put_files))
-    await _run_coros_in_chunks(
-        [
-            ensure_async_execution(
+    mv_files = list(fw.get_files_to_mv())
+    logger.debug("mv_files {}".format(mv_files))
+
+    async def mv_file(r_base_path: str, src_subpath: str, subpath: str):
+        # Renamed files are copied on the store instead of being uploaded again
+        try:
+            await ensure_async_execution(
+                fs=fs,
+                fct="cp_file",
+                is_async=fs.async_impl,
+                path1=get_store_path(src_subpath),
+                path2=get_store_path(subpath),
+            )
+        except Exception as e:
+            logger.debug(
+                "Could not move {} to {}, uploading it, error: {}".format(
+                    src_subpath, subpath, e
+                )
+            )
+            await ensure_async_execution(
                 fs=fs,
                 fct="put",
                 is_async=fs.async_impl,
@@ -79,11 +107,92 @@ async def sync_fs(
                 rpath=get_store_path(subpath),
                 recursive=False,
             )
-            for (r_base_path, subpath) in put_files
+        try:
+            await ensure_async_execution(
+                fs=fs,
+                fct="rm_file",
+                is_async=fs.async_impl,
+                path=get_store_path(src_subpath),
+            )
+        except Exception as e:
+            # The file is already synced under its new name
+            logger.debug("Could not remove {}, error: {}".format(src_subpath, e))
+
+    results = await _run_coros_in_chunks(
+        [
+            mv_file(r_base_path, src_subpath, subpath)
+            for (r_base_path, src_subpath, subpath) in mv_files
         ],
         return_exceptions=True,
         nofiles=True,
     )
+    failed_mv_files = [
+        (r_base_path, subpath)
+        for (r_base_path, _, subpath), result in zip(mv_files, results)
+        if isinstance(result, Exception)
+    ]
+    if failed_mv_files:
+        logger.debug("failed_mv_files {}".format(failed_mv_files))
+        fw.retry_files(failed_mv_files)
+    put_files = fw.get_files_to_put()
+    logger.debug("put_files {}".format(put_files))
+    budget = get_transfer_budget()
+    part_size = settings.CLIENT_CONFIG.upload_part_size
+    use_multipart = supports_multipart(fs)
+
+    checkpoint_at = [time.monotonic()]
+
+    def on_upload_state(subpath: str, state):
+        fw.set_upload_state(subpath, state)
+        # Checkpoint the parts to resume the upload if the sidecar is killed,
+        # the index is written at most once per interval, not after every part
+        if index_path and time.monotonic() - checkpoint_at[0] >= CHECKPOINT_INTERVAL:
+            fw.write(index_path, include_pending=False)
+            checkpoint_at[0] = time.monotonic()
+
+    async def put_file(r_base_path: str, subpath: str):
+        lpath = os.path.join(r_base_path, subpath)
+        size = os.path.getsize(lpath)
+        # Recorded once uploaded, to not upload again an identical re-save
+        digest = await run_sync(fw.get_upload_digest, lpath, subpath)
+        if use_multipart and size > part_size:
+            await MultipartUpload(
+                fs=fs,
+                lpath=lpath,
+                rpath=get_store_path(subpath),
+                state=fw.get_upload_state(subpath),
+                on_state=partial(on_upload_state, subpath),
+                budget=budget,
+                part_size=part_size,
+            ).upload()
+        else:
+            async with budget.acquire(size):
+                await ensure_async_execution(
+                    fs=fs,
+                    fct="put",
+                    is_async=fs.async_impl,
+                    lpath=lpath,
+                    rpath=get_store_path(subpath),
+                    recursive=False,
+                )
+        fw.set_digest(subpath, digest)
+
+    put_files = list(put_files)
+    results = await _run_coros_in_chunks(
+        [put_file(r_base_path, subpath) for (r_base_path, subpath) in put_files],
+        return_exceptions=True,
+        nofiles=True,
+    )
+    failed_files = [
+        (r_base_path, subpath)
+        for (r_base_path, subpath), result in zip(put_files, results)
+        if isinstance(result, Exception)
+    ]
+    if failed_files:
+        logger.debug("failed_files {}".format(failed_files))
+        fw.retry_files(failed_files)
+    if index_path:
+        fw.write(index_path)
 
 
 async def sync_artifacts(
@@ -93,21 +202,26 @@ async def sync_artifacts(
     run_uuid: str,
     exclude: List[str] = None,
 ):
-    fw.init()
-    path_from = ctx_paths.CONTEXT_MOUNT_ARTIFACTS_FORMAT.format(run_uuid)
-    fw.sync(path_from, exclude=exclude)
-
-    # Check if this run has triggered some related run paths
-    if os.path.exists(ctx_paths.CONTEXT_MOUNT_ARTIFACTS_RELATED):
-        for sub_path in os.listdir(ctx_paths.CONTEXT_MOUNT_ARTIFACTS_RELATED):
-            # check if there's a path to sync
-            path_from = ctx_paths.CONTEXT_MOUNT_ARTIFACTS_RELATED_FORMAT.format(
-                sub_path
-            )
-            fw.sync(path_from, exclude=exclude)
+    def scan():
+        fw.init()
+        path_from = ctx_paths.CONTEXT_MOUNT_ARTIFACTS_FORMAT.format(run_uuid)
+        fw.sync(path_from, exclude=exclude)
+
+        # Check if this run has triggered some related run paths
+        if os.path.exists(ctx_paths.CONTEXT_MOUNT_ARTIFACTS_RELATED):
+            for sub_path in os.listdir(ctx_paths.CONTEXT_MOUNT_ARTIFACTS_RELATED):
+                # check if there's a path to sync
+                path_from = ctx_paths.CONTEXT_MOUNT_ARTIFACTS_RELATED_FORMAT.format(
+                    sub_path
+                )
+                fw.sync(path_from, exclude=exclude)
+
+    # The scan stats and can hash files, it should not block the event loop
+    await run_sync(scan)
 
     await sync_fs(
         fs=fs,
         fw=fw,
         store_base_path=store_path,
+        index_path=ctx_paths.CONTEXT_MOUNT_FILE_WATCHER,
     )
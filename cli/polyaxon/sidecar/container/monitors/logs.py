@@ -14,46 +14,134 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
-from typing import Optional
+import os
+
+from typing import List, Optional
 
 import aiofiles
+import ujson
 
 from kubernetes_asyncio.client.models import V1Pod
 
 from polyaxon.contexts import paths as ctx_paths
 from polyaxon.k8s.async_manager import AsyncK8SManager
-from polyaxon.k8s.logging.async_monitor import query_k8s_pod_logs
-from polyaxon.types import AwareDT
+from polyaxon.k8s.logging.async_monitor import LogsCursors, query_k8s_pod_logs
+from polyaxon.utils.date_utils import parse_datetime
 from polyaxon.utils.path_utils import check_or_create_path, delete_path
-from traceml.logging import V1Logs
+from traceml.logging import V1Log, V1Logs
+
+
+MAX_LOGS_FILE_SIZE = 10 * 1024 * 1024
+
+
+def get_tmp_logs_path(run_uuid: str) -> str:
+    path = ctx_paths.CONTEXT_MOUNT_ARTIFACTS_FORMAT.format(run_uuid)
+    return "{}/.tmpplxlogs".format(path)
+
+
+def decode_log_line(line: str) -> V1Log:
+    """Decodes a line written by `V1Log.to_csv`."""
+    timestamp, node, pod, container, value = line.rstrip("\n").split(V1Log.SEPARATOR, 4)
+    return V1Log(
+        timestamp=parse_datetime(timestamp) if timestamp else None,
+        node=node or None,
+        pod=pod or None,
+        container=container or None,
+        value=ujson.loads(value)["_"] if value else None,
+    )
+
+
+class LogsCollector:
+    """Appends the new log lines of a pod to its logs file.
+
+    The collector keeps the last timestamp fetched for every container,
+    so that every sync only pulls and appends the new lines
+    to `.tmpplxlogs/<pod>.plx`, the file read by the logs consumers.
+    Once the file reaches `max_size` bytes, it's rotated to `<pod>.plx.1`,
+    replacing the previous rotation, and a new file is started.
+    The cursors are restored from both files,
+    so that a restarted sidecar does not append the same lines again.
+
+    Args:
+        run_uuid: str, the run uuid.
+        pod_name: str, the pod name.
+        max_size: int, optional, the size in bytes after which the file is rotated.
+    """
+
+    def __init__(
+        self, run_uuid: str, pod_name: str, max_size: int = MAX_LOGS_FILE_SIZE
+    ):
+        self.pod_name = pod_name
+        self.max_size = max_size
+        self.path = "{}/{}.plx".format(get_tmp_logs_path(run_uuid), pod_name)
+        self.rotated_path = "{}.1".format(self.path)
+        self._cursors: Optional[LogsCursors] = None
+
+    @property
+    def cursors(self) -> LogsCursors:
+        if self._cursors is None:
+            self._cursors = self._read_cursors()
+        return self._cursors
+
+    def _read_cursors(self) -> LogsCursors:
+        cursors = {}
+        # The rotated file is read first, the current file holds the latest lines
+        for path in [self.rotated_path, self.path]:
+            if not os.path.exists(path):
+                continue
+            with open(path, "r") as f:
+                # Skip the csv header
+                f.readline()
+                for line in f:
+                    try:
+                        log = decode_log_line(line)
+                    except ValueError:
+                        continue
+                    if log.timestamp:
+                        cursors[(self.pod_name, log.container)] = log.timestamp
+        return cursors
+
+    def _should_rotate(self, size: int) -> bool:
+        return (
+            os.path.exists(self.path)
+            and os.path.getsize(self.path) + size > self.max_size
+        )
+
+    async def append(self, logs: List[V1Log]):
+        logs = [log for log in logs if log.value]
+        if not logs:
+            return
+        data = "".join("\n{}".format(log.to_csv()) for log in logs)
+        if self._should_rotate(len(data)):
+            os.replace(self.path, self.rotated_path)
+        if not os.path.exists(self.path):
+            check_or_create_path(self.path, is_dir=False)
+            data = V1Logs.get_csv_header() + data
+        async with aiofiles.open(self.path, "a") as f:
+            await f.write(data)
+
+    def clean(self):
+        delete_path(os.path.dirname(self.path))
+        self._cursors = {}
 
 
 async def sync_logs(
-    run_uuid: str,
     k8s_manager: AsyncK8SManager,
     pod: V1Pod,
-    last_time: Optional[AwareDT],
+    collector: LogsCollector,
     stream: bool = False,
     is_running: bool = True,
 ):
-    path_from = ctx_paths.CONTEXT_MOUNT_ARTIFACTS_FORMAT.format(run_uuid)
-    path_from = "{}/.tmpplxlogs".format(path_from)
-
     if not is_running:
-        delete_path(path_from)
+        collector.clean()
         return
 
     logs, _ = await query_k8s_pod_logs(
         k8s_manager=k8s_manager,
         pod=pod,
-        last_time=last_time,
+        last_time=None,
         stream=stream,
+        cursors=collector.cursors,
     )
-    if not logs:
-        return
-
-    path_from = "{}/{}.plx".format(path_from, pod.metadata.name)
-    check_or_create_path(path_from, is_dir=False)
-    async with aiofiles.open(path_from, "w") as filepath:
-        _logs = V1Logs(logs=logs)
-        await filepath.write("{}\n{}".format(_logs.get_csv_header(), _logs.to_csv()))
+    if logs:
+        await collector.append(logs)
@@ -0,0 +1,135 @@
+#!/usr/bin/python
+#
+# Copyright 2018-2022 Polyaxon, Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import asyncio
+
+from typing import Optional
+
+from kubernetes_asyncio.client.rest import ApiException
+
+from polyaxon.k8s.async_manager import AsyncK8SManager
+from polyaxon.k8s.monitor import is_pod_running
+from polyaxon.logger import logger
+
+
+class PodStatusWatcher:
+    """Tracks the status of the sidecar's pod using a watch.
+
+    The watch resumes from the last resource version it received,
+    while it is not connected, or if it keeps failing,
+    the watcher falls back to polling the pod status.
+
+    Args:
+        k8s_manager: AsyncK8SManager, the k8s manager.
+        pod_id: str, the pod to watch.
+        container_id: str, the main container to track.
+        pod: V1Pod, optional, the current pod.
+    """
+
+    WATCH_TIMEOUT = 300
+    MAX_FAILURES = 3
+
+    def __init__(
+        self,
+        k8s_manager: AsyncK8SManager,
+        pod_id: str,
+        container_id: str,
+        pod=None,
+    ):
+        self._k8s_manager = k8s_manager
+        self._pod_id = pod_id
+        self._container_id = container_id
+        self._pod = pod
+        # The first watch lists the pod to get its current state right away
+        self._resource_version = None
+        self._healthy = False
+        self._task = None
+        self._stopped = asyncio.Event()
+
+    @property
+    def is_watching(self) -> bool:
+        return self._healthy and self._task is not None and not self._task.done()
+
+    def _set_pod(self, pod):
+        self._pod = pod
+        if pod.metadata and pod.metadata.resource_version:
+            self._resource_version = pod.metadata.resource_version
+        if not is_pod_running(pod, self._container_id):
+            self._stopped.set()
+
+    async def _watch(self):
+        failures = 0
+        while failures < self.MAX_FAILURES:
+            try:
+                async for event_type, pod in self._k8s_manager.watch_pod(
+                    self._pod_id,
+                    resource_version=self._resource_version,
+                    timeout_seconds=self.WATCH_TIMEOUT,
+                ):
+                    self._healthy = True
+                    failures = 0
+                    if event_type == "DELETED":
+                        self._stopped.set()
+                        return
+                    self._set_pod(pod)
+                    if self._stopped.is_set():
+                        return
+                # The server closed the watch, it is resumed from the last version
+                continue
+            except asyncio.CancelledError:
+                raise
+            except ApiException as e:
+                if e.status == 410:
+                    # The resource version is too old, resync from the current pod
+                    logger.debug("Pod watch expired, resyncing.")
+                    self._resource_version = None
+                    continue
+                failures += 1
+                logger.info("Pod watch error: %s" % repr(e))
+            except Exception as e:
+                failures += 1
+                logger.info("Pod watch error: %s" % repr(e))
+            self._healthy = False
+            await asyncio.sleep(failures * 2)
+        logger.info("Pod watch failed, falling back to polling the pod status.")
+
+    def start(self):
+        if self._task is None:
+            self._task = asyncio.ensure_future(self._watch())
+
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except (asyncio.CancelledError, Exception):
+                pass
+            self._task = None
+
+    async def wait(self, timeout: float) -> bool:
+        """Waits for the main container to stop, returns `True` if it stopped."""
+        try:
+            await asyncio.wait_for(self._stopped.wait(), timeout=timeout)
+        except asyncio.TimeoutError:
+            pass
+        return self._stopped.is_set()
+
+    async def is_running(self) -> Optional[bool]:
+        if self._stopped.is_set():
+            return False
+        if self.is_watching and self._pod is not None:
+            return is_pod_running(self._pod, self._container_id)
+        return await self._k8s_manager.is_pod_running(self._pod_id, self._container_id)
@@ -40,7 +40,7 @@ class SidecarThread(threading.Thread):
         threading.Thread.__init__(self)
         self.daemon = True
         self._client = client
-        self._fw = FSWatcher()
+        self._fw = FSWatcher(use_events=True)
         self._path = run_path
         self._flush_secs = flush_secs
         self._sleep_secs = sleep_secs
@@ -73,6 +73,21 @@ class SidecarThread(threading.Thread):
                 path=get_path(subpath, False),
             )
 
+        mv_files = self._fw.get_files_to_mv()
+        logger.debug("mv_files {}".format(mv_files))
+        for (r_base_path, src_subpath, subpath) in mv_files:
+            try:
+                self._client.upload_artifact(
+                    filepath=os.path.join(r_base_path, subpath),
+                    path=get_path(subpath, True),
+                    show_progress=False,
+                )
+                self._client.delete_artifact(
+                    path=get_path(src_subpath, False),
+                )
+            except OSError as e:
+                logger.warning("Could not perform move operation, error: %s", e)
+
         put_files = self._fw.get_files_to_put()
         logger.debug("put_files {}".format(put_files))
         for (r_base_path, subpath) in put_files:
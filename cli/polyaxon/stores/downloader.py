@@ -0,0 +1,237 @@
+#!/usr/bin/python
+#
+# Copyright 2018-2022 Polyaxon, Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+import json
+import math
+import os
+import threading
+
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, List, Optional
+
+import ujson
+
+from polyaxon.exceptions import PolyaxonClientException
+from polyaxon.logger import logger
+
+
+class RangedDownloader:
+    """Downloads a response body to a `.part` file that can be resumed.
+
+    If the server supports range requests, the file is split in segments
+    fetched in parallel, the progress of every segment is saved next to the
+    `.part` file, so an interrupted download only fetches the missing bytes.
+    Otherwise, the response is streamed sequentially.
+
+    Args:
+        session: requests.Session, the session to use for the range requests.
+        url: str, the download url.
+        filename: str, the final file path.
+        params: Dict, optional, the request params.
+        headers: Dict, optional, the request headers.
+        timeout: int, optional, the request timeout.
+        num_workers: int, optional, the max number of parallel segments.
+        progress_callback: Callable, optional, called with the bytes written.
+    """
+
+    NUM_WORKERS = 4
+    SEGMENT_SIZE_MIN = 16 * 1024 * 1024
+    CHUNK_SIZE_MIN = 64 * 1024
+    CHUNK_SIZE_MAX = 1024 * 1024
+    STATE_INTERVAL = 8 * 1024 * 1024
+
+    def __init__(
+        self,
+        session,
+        url: str,
+        filename: str,
+        params: Dict = None,
+        headers: Dict = None,
+        timeout: int = None,
+        num_workers: int = None,
+        progress_callback: Callable[[int], None] = None,
+    ):
+        self._session = session
+        self._url = url
+        self._filename = filename
+        self._params = params
+        self._headers = headers or {}
+        self._timeout = timeout
+        self._num_workers = num_workers or self.NUM_WORKERS
+        self._progress_callback = progress_callback
+        self._lock = threading.Lock()
+        self._state = None
+
+    @property
+    def part_path(self) -> str:
+        return "{}.part".format(self._filename)
+
+    @property
+    def state_path(self) -> str:
+        return "{}.part.json".format(self._filename)
+
+    @classmethod
+    def get_chunk_size(cls, content_length: Optional[int]) -> int:
+        if not content_length:
+            return cls.CHUNK_SIZE_MIN
+        return int(
+            min(max(content_length // 100, cls.CHUNK_SIZE_MIN), cls.CHUNK_SIZE_MAX)
+        )
+
+    @staticmethod
+    def _get_header(headers: Dict, key: str) -> str:
+        for k, v in (headers or {}).items():
+            if k.lower() == key:
+                return v
+        return ""
+
+    def _supports_ranges(self, response) -> bool:
+        return (
+            self._get_header(response.headers, "accept-ranges").lower() == "bytes"
+            and not self._get_header(response.headers, "content-encoding")
+            and bool(self._get_header(response.headers, "content-length"))
+        )
+
+    def _get_segments(self, size: int) -> List[List[int]]:
+        num_segments = max(
+            min(self._num_workers, math.ceil(size / self.SEGMENT_SIZE_MIN)), 1
+        )
+        segment_size = math.ceil(size / num_segments)
+        # Each segment is [start, end (inclusive), written bytes]
+        return [
+            [start, min(start + segment_size, size) - 1, 0]
+            for start in range(0, size, segment_size)
+        ]
+
+    def _load_state(self, size: int, validator: str) -> Optional[Dict]:
+        if not os.path.exists(self.state_path) or not os.path.exists(self.part_path):
+            return None
+        try:
+            with open(self.state_path, "r") as f:
+                state = ujson.load(f)
+        except ValueError:
+            return None
+        if state.get("size") != size or state.get("validator") != validator:
+            logger.debug("The remote file changed, restarting the download.")
+            return None
+        return state
+
+    def _save_state(self):
+        tmp_path = "{}.tmp".format(self.state_path)
+        with open(tmp_path, "w") as f:
+            f.write(ujson.dumps(self._state))
+        os.replace(tmp_path, self.state_path)
+
+    def _progress(self, nbytes: int):
+        if self._progress_callback:
+            self._progress_callback(nbytes)
+
+    def _fetch_segment(self, segment: List[int], chunk_size: int):
+        start, end, written = segment
+        if start + written > end:
+            return
+        headers = dict(self._headers)
+        headers["Range"] = "bytes={}-{}".format(start + written, end)
+        with self._session.get(
+            url=self._url,
+            params=self._params,
+            headers=headers,
+            timeout=self._timeout,
+            stream=True,
+        ) as response:
+            if response.status_code != 206:
+                raise PolyaxonClientException(
+                    "Range request failed with status code {}".format(
+                        response.status_code
+                    )
+                )
+            unsaved = 0
+            with open(self.part_path, "r+b") as f:
+                f.seek(start + written)
+                for chunk in response.iter_content(chunk_size=chunk_size):
+                    if not chunk:
+                        continue
+                    f.write(chunk)
+                    with self._lock:
+                        segment[2] += len(chunk)
+                        unsaved += len(chunk)
+                        if unsaved >= self.STATE_INTERVAL:
+                            f.flush()
+                            self._save_state()
+                            unsaved = 0
+                    self._progress(len(chunk))
+        if segment[0] + segment[2] <= segment[1]:
+            raise PolyaxonClientException("The connection was closed early.")
+
+    def _download_ranges(self, size: int, validator: str):
+        state = self._load_state(size, validator)
+        if state:
+            done = sum(s[2] for s in state["segments"])
+            logger.debug("Resuming download at %s/%s bytes", done, size)
+            self._progress(done)
+        else:
+            state = {
+                "size": size,
+                "validator": validator,
+                "segments": self._get_segments(size),
+            }
+            with open(self.part_path, "wb") as f:
+                f.truncate(size)
+        self._state = state
+        self._save_state()
+
+        chunk_size = self.get_chunk_size(size)
+        segments = state["segments"]
+        try:
+            if len(segments) == 1:
+                self._fetch_segment(segments[0], chunk_size)
+            else:
+                with ThreadPoolExecutor(max_workers=len(segments)) as executor:
+                    futures = [
+                        executor.submit(self._fetch_segment, s, chunk_size)
+                        for s in segments
+                    ]
+                    for future in futures:
+                        future.result()
+        finally:
+            with self._lock:
+                self._save_state()
+
+    def _download_stream(self, response, content_length: Optional[int]):
+        chunk_size = self.get_chunk_size(content_length)
+        with open(self.part_path, "wb") as f:
+            for chunk in response.iter_content(chunk_size=chunk_size):
+                if chunk:
+                    f.write(chunk)
+                    self._progress(len(chunk))
+
+    def download(self, response) -> str:
+        """Downloads the file using the response of the initial streamed request."""
+        content_length = self._get_header(response.headers, "content-length")
+        content_length = int(content_length) if content_length else None
+        if content_length and self._supports_ranges(response):
+            validator = self._get_header(response.headers, "etag") or (
+                self._get_header(response.headers, "last-modified")
+            )
+            # The segments are fetched with their own requests
+            response.close()
+            self._download_ranges(content_length, validator)
+        else:
+            self._download_stream(response, content_length)
+
+        os.replace(self.part_path, self._filename)
+        if os.path.exists(self.state_path):
+            os.remove(self.state_path)
+        return self._filename
@@ -16,8 +16,9 @@
 import json
 import os
 import requests
+import uuid
 
-from typing import Dict, List
+from typing import Dict, Iterable, List
 
 from requests_toolbelt import MultipartEncoder, MultipartEncoderMonitor
 
@@ -30,13 +31,17 @@ from polyaxon.exceptions import (
     PolyaxonShouldExitError,
 )
 from polyaxon.logger import logger
+from polyaxon.stores.downloader import RangedDownloader
 from polyaxon.utils.formatting import Printer
 from polyaxon.utils.list_utils import to_list
 from polyaxon.utils.path_utils import (
     check_or_create_path,
     create_tarfile_from_path,
     get_files_by_paths,
+    stream_tarfile,
+    unix_style_path,
     untar_file,
+    untar_stream,
 )
 from traceml.processors.units_processors import format_sizeof
 
@@ -52,6 +57,20 @@ class PolyaxonStore:
 
     def __init__(self, client: "RunClient"):  # noqa
         self._client = client
+        self._session = None
+
+    @property
+    def session(self) -> requests.Session:
+        """Session reused by the downloads to keep the connections pooled."""
+        if self._session is None:
+            num_workers = settings.CLIENT_CONFIG.download_workers
+            adapter = requests.adapters.HTTPAdapter(
+                pool_connections=num_workers, pool_maxsize=num_workers
+            )
+            self._session = requests.Session()
+            self._session.mount("http://", adapter)
+            self._session.mount("https://", adapter)
+        return self._session
 
     def ls(self, path):
         return self.list(path=path)
@@ -80,6 +99,42 @@ class PolyaxonStore:
             HTTP_ERROR_MESSAGES_MAPPING.get(response.status_code)
         )
 
+    @staticmethod
+    def _get_upload_size_max() -> int:
+        upload_size_max = os.environ.get(EV_KEYS_UPLOAD_SIZE)
+        if not upload_size_max:
+            # Backwards compatibility
+            upload_size_max = os.environ.get("POLYAXON_UPLOAD_SIZE_MAX")
+        if not upload_size_max:
+            upload_size_max = 1024 * 1024 * 500
+        try:
+            return int(upload_size_max)
+        except Exception as e:
+            raise PolyaxonClientException("Could not parse max upload size") from e
+
+    @staticmethod
+    def _warn_upload_size(files_size: int, upload_size_max: int):
+        logger.warning(
+            "You are uploading %s, there's a hard limit of %s.\n"
+            "If you have data files in the current directory, "
+            "please make sure to add them to .polyaxonignore or "
+            "add them directly to your data volume, or upload them "
+            "separately using `polyaxon data` command and remove them from here.\n",
+            format_sizeof(files_size),
+            format_sizeof(upload_size_max),
+        )
+
+    @staticmethod
+    def _raise_upload_size(upload_size_max: int):
+        raise PolyaxonShouldExitError(
+            "Files too large to sync, please keep it under {}.\n"
+            "If you have data files in the current directory, "
+            "please add them directly to your data volume, or upload them "
+            "separately using `polyaxon data` command and remove them from here.\n".format(
+                format_sizeof(upload_size_max)
+            )
+        )
+
     def upload(
         self,
         url,
@@ -92,37 +147,12 @@ class PolyaxonStore:
         session=None,
         show_progress=True,
     ):
-        upload_size_max = os.environ.get(EV_KEYS_UPLOAD_SIZE)
-        if not upload_size_max:
-            # Backwards compatibility
-            upload_size_max = os.environ.get("POLYAXON_UPLOAD_SIZE_MAX")
-        if not upload_size_max:
-            upload_size_max = 1024 * 1024 * 500
-        try:
-            upload_size_max = int(upload_size_max)
-        except Exception as e:
-            raise PolyaxonClientException("Could not parse max upload size") from e
-
+        upload_size_max = self._get_upload_size_max()
         if files_size > 1024 * 1024 * 50:
-            logger.warning(
-                "You are uploading %s, there's a hard limit of %s.\n"
-                "If you have data files in the current directory, "
-                "please make sure to add them to .polyaxonignore or "
-                "add them directly to your data volume, or upload them "
-                "separately using `polyaxon data` command and remove them from here.\n",
-                format_sizeof(files_size),
-                format_sizeof(upload_size_max),
-            )
+            self._warn_upload_size(files_size, upload_size_max)
 
         if files_size > upload_size_max:
-            raise PolyaxonShouldExitError(
-                "Files too large to sync, please keep it under {}.\n"
-                "If you have data files in the current directory, "
-                "please add them directly to your data volume, or upload them "
-                "separately using `polyaxon data` command and remove them from here.\n".format(
-                    format_sizeof(upload_size_max)
-                )
-            )
+            self._raise_upload_size(upload_size_max)
 
         files = to_list(files)
         if json_data:
@@ -159,6 +189,83 @@ class PolyaxonStore:
 
             return _upload_impl(progress_callback)
 
+    def upload_stream(
+        self,
+        url,
+        file_type,
+        filename,
+        chunks: Iterable[bytes],
+        params=None,
+        json_data=None,
+        timeout=None,
+        headers=None,
+        session=None,
+        show_progress=True,
+        check_size=True,
+    ):
+        """Uploads a stream of chunks as a multipart form with chunked encoding.
+
+        If `check_size` is set, the upload size limit is checked
+        while the chunks are sent.
+        """
+        upload_size_max = self._get_upload_size_max() if check_size else None
+        boundary = uuid.uuid4().hex
+        request_headers = self._client.client.config.get_full_headers(headers=headers)
+        request_headers.update(
+            {"Content-Type": "multipart/form-data; boundary={}".format(boundary)}
+        )
+        timeout = timeout if timeout is not None else settings.LONG_REQUEST_TIMEOUT
+        session = session or requests.Session()
+
+        def _get_body(callback=None):
+            if json_data:
+                yield (
+                    "--{}\r\n"
+                    'Content-Disposition: form-data; name="json"\r\n\r\n'
+                    "{}\r\n".format(boundary, json.dumps(json_data))
+                ).encode()
+            yield (
+                "--{}\r\n"
+                'Content-Disposition: form-data; name="{}"; filename="{}"\r\n'
+                "Content-Type: text/plain\r\n\r\n".format(
+                    boundary, file_type, unix_style_path(filename)
+                )
+            ).encode()
+            bytes_sent = 0
+            warned = False
+            for chunk in chunks:
+                bytes_sent += len(chunk)
+                if check_size:
+                    if not warned and bytes_sent > 1024 * 1024 * 50:
+                        warned = True
+                        self._warn_upload_size(bytes_sent, upload_size_max)
+                    if bytes_sent > upload_size_max:
+                        self._raise_upload_size(upload_size_max)
+                yield chunk
+                if callback:
+                    callback(bytes_sent)
+            yield "\r\n--{}--\r\n".format(boundary).encode()
+
+        def _upload_impl(callback=None):
+            return session.post(
+                url=url,
+                params=params,
+                data=_get_body(callback),
+                headers=request_headers,
+                timeout=timeout,
+            )
+
+        if not show_progress:
+            return _upload_impl()
+
+        with Printer.get_progress() as progress:
+            task = progress.add_task("[cyan]Uploading contents:", total=None)
+
+            def progress_callback(bytes_sent):
+                progress.update(task, completed=bytes_sent)
+
+            return _upload_impl(progress_callback)
+
     def _get_header_value(self, headers: Dict, key: str):
         headers = headers or {}
         for k in headers.keys():
@@ -167,6 +274,39 @@ class PolyaxonStore:
                 return headers.get(k, "")
         return ""
 
+    def _download_untar_stream(
+        self,
+        response,
+        filename: str,
+        extract_path: str = None,
+        use_filepath: bool = True,
+        show_progress: bool = True,
+    ) -> str:
+        """Extracts the archive members while the response is downloaded."""
+        extract_path = extract_path or "."
+        if use_filepath:
+            extract_path = os.path.join(extract_path, filename.split(".tar.gz")[0])
+        # Let urllib3 handle any content encoding before the tar decompression
+        response.raw.decode_content = True
+        logger.info("Untarring the contents while downloading ...")
+
+        if not show_progress:
+            return untar_stream(response.raw, extract_path=extract_path)
+
+        with Printer.get_progress() as progress:
+            task = progress.add_task("Extracting contents:", total=None)
+
+            def progress_callback(member):
+                progress.update(
+                    task,
+                    advance=member.size,
+                    description="Extracting {}".format(member.name),
+                )
+
+            return untar_stream(
+                response.raw, extract_path=extract_path, callback=progress_callback
+            )
+
     def download(
         self,
         url,
@@ -189,7 +329,7 @@ class PolyaxonStore:
 
         request_headers = self._client.client.config.get_full_headers(headers=headers)
         timeout = timeout if timeout is not None else settings.LONG_REQUEST_TIMEOUT
-        session = session or requests.Session()
+        session = session or self.session
 
         try:
             with Printer.console.status("Loading content ..."):
@@ -213,32 +353,42 @@ class PolyaxonStore:
                 untar = has_tar
 
             self.check_response_status(response, url)
-            with open(filename, "wb") as f:
-                content_length = self._get_header_value(
-                    headers=response.headers,
-                    key="content-length",
+            if untar and delete_tar and settings.CLIENT_CONFIG.download_stream_untar:
+                return self._download_untar_stream(
+                    response=response,
+                    filename=filename,
+                    extract_path=extract_path,
+                    use_filepath=use_filepath,
+                    show_progress=show_progress,
                 )
-                content_length = float(content_length) if content_length else None
-                chunk_size = 1024 * 10
-
-                def _download_impl():
-                    for chunk in response.iter_content(chunk_size=chunk_size):
-                        if progress:
-                            progress.update(
-                                task,
-                                advance=len(chunk),
-                            )
-                        if chunk:
-                            f.write(chunk)
-
-                if show_progress:
-                    with Printer.get_progress() as progress:
-                        task = progress.add_task(
-                            "Writing contents:", total=content_length
-                        )
-                        _download_impl()
-                else:
-                    _download_impl()
+            content_length = self._get_header_value(
+                headers=response.headers,
+                key="content-length",
+            )
+            content_length = float(content_length) if content_length else None
+
+            def _download_impl(progress_callback=None):
+                return RangedDownloader(
+                    session=session,
+                    url=url,
+                    filename=filename,
+                    params=params,
+                    headers=request_headers,
+                    timeout=timeout,
+                    num_workers=settings.CLIENT_CONFIG.download_workers,
+                    progress_callback=progress_callback,
+                ).download(response)
+
+            if show_progress:
+                with Printer.get_progress() as progress:
+                    task = progress.add_task("Writing contents:", total=content_length)
+
+                    def progress_callback(nbytes):
+                        progress.update(task, advance=nbytes)
+
+                    _download_impl(progress_callback)
+            else:
+                _download_impl()
 
             if untar:
                 filename = untar_file(
@@ -318,8 +468,24 @@ class PolyaxonStore:
             "overwrite": kwargs.get("overwrite", True),
         }
         dirname = os.path.basename(path) if path else DEFAULT_UPLOADS_PATH
+        compresslevel = settings.CLIENT_CONFIG.upload_compression_level
+        if settings.CLIENT_CONFIG.upload_streaming:
+            return self.upload_stream(
+                url,
+                file_type="upload_file",
+                filename="{}.tar.gz".format(dirname),
+                chunks=stream_tarfile(
+                    files,
+                    relative_to=kwargs.get("relative_to", None),
+                    compresslevel=compresslevel,
+                ),
+                json_data=json_data,
+            )
         with create_tarfile_from_path(
-            files, dirname, relative_to=kwargs.get("relative_to", None)
+            files,
+            dirname,
+            relative_to=kwargs.get("relative_to", None),
+            compresslevel=compresslevel,
         ) as filepath:
             with get_files_by_paths("upload_file", [filepath]) as (files, files_size):
                 return self.upload(
@@ -16,6 +16,7 @@
 
 import math
 
+from collections.abc import Mapping
 from typing import Dict
 
 try:
@@ -40,6 +41,17 @@ def sanitize_np_types(value):
     return value
 
 
+def sanitize_nested_np_types(value):
+    """Converts the numpy values of nested dicts and lists to python values."""
+    if isinstance(value, Mapping):
+        return {k: sanitize_nested_np_types(v) for k, v in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [sanitize_nested_np_types(v) for v in value]
+    if np and isinstance(value, (np.generic, np.ndarray)):
+        return value.tolist()
+    return value
+
+
 def to_np(value):
     if hasattr(value, "numpy"):  # Torch handling
         value = value.numpy()
@@ -15,13 +15,16 @@
 # limitations under the License.
 
 
+import gzip
 import os
+import queue
 import shutil
 import tarfile
 import tempfile
+import threading
 
 from contextlib import contextmanager
-from typing import List, Tuple
+from typing import Callable, Iterator, List, Tuple
 
 from polyaxon.exceptions import PolyaxonPathException
 from polyaxon.logger import logger
@@ -171,19 +174,105 @@ def create_init_file():
     return True
 
 
-def create_tarfile(files: List[str], tar_path: str, relative_to: str = None) -> None:
+def create_tarfile(
+    files: List[str], tar_path: str, relative_to: str = None, compresslevel: int = 9
+) -> None:
     """Create a tar file based on the list of files passed"""
-    with tarfile.open(tar_path, "w:gz") as tar:
+    with tarfile.open(tar_path, "w:gz", compresslevel=compresslevel) as tar:
         for f in files:
             arcname = os.path.relpath(f, relative_to) if relative_to else None
             tar.add(f, arcname=arcname)
 
 
+class _QueueWriter:
+    """File like object that hands the written bytes to a bounded queue."""
+
+    def __init__(
+        self, chunks: queue.Queue, chunk_size: int, cancelled: threading.Event
+    ):
+        self._chunks = chunks
+        self._chunk_size = chunk_size
+        self._cancelled = cancelled
+        self._buffer = bytearray()
+
+    def write(self, data: bytes) -> int:
+        if self._cancelled.is_set():
+            raise IOError("The tar stream was closed.")
+        self._buffer += data
+        if len(self._buffer) >= self._chunk_size:
+            self.flush()
+        return len(data)
+
+    def flush(self):
+        if self._buffer:
+            self._chunks.put(bytes(self._buffer))
+            self._buffer = bytearray()
+
+
+def stream_tarfile(
+    files: List[str],
+    relative_to: str = None,
+    compresslevel: int = 9,
+    chunk_size: int = 1024 * 1024,
+    max_chunks: int = 8,
+) -> Iterator[bytes]:
+    """Generates a gzip tar stream of the files passed.
+
+    The archive is produced in a background thread,
+    at most `max_chunks` chunks are kept in memory.
+    A `compresslevel` of 0 keeps the gzip format without compressing the data.
+    """
+    chunks = queue.Queue(max_chunks)
+    done = object()
+    errors = []
+    cancelled = threading.Event()
+
+    def produce():
+        writer = _QueueWriter(chunks, chunk_size, cancelled)
+        try:
+            with gzip.GzipFile(
+                fileobj=writer, mode="wb", compresslevel=compresslevel, mtime=0
+            ) as gz:
+                with tarfile.open(fileobj=gz, mode="w|") as tar:
+                    for f in files:
+                        arcname = (
+                            os.path.relpath(f, relative_to) if relative_to else None
+                        )
+                        tar.add(f, arcname=arcname)
+            writer.flush()
+        except Exception as e:  # noqa
+            if not cancelled.is_set():
+                errors.append(e)
+        finally:
+            chunks.put(done)
+
+    producer = threading.Thread(target=produce, daemon=True)
+    producer.start()
+    try:
+        while True:
+            chunk = chunks.get()
+            if chunk is done:
+                break
+            yield chunk
+    finally:
+        cancelled.set()
+        # Unblock the producer if the consumer stopped early
+        while producer.is_alive():
+            try:
+                chunks.get(timeout=0.1)
+            except queue.Empty:
+                pass
+    if errors:
+        raise errors[0]
+
+
 @contextmanager
-def create_tarfile_from_path(files, path_name, relative_to: str = None):
+def create_tarfile_from_path(
+    files, path_name, relative_to: str = None, compresslevel: int = 9
+):
     """Create a tar file based on the list of files passed"""
     fd, filename = tempfile.mkstemp(prefix=path_name, suffix=".tar.gz")
-    create_tarfile(files, filename, relative_to)
+    create_tarfile(files, filename, relative_to, compresslevel=compresslevel)
     yield filename
 
     # clear
@@ -211,6 +300,49 @@ def untar_file(
     return extract_path
 
 
+def is_safe_tar_member(member: tarfile.TarInfo, extract_path: str) -> bool:
+    """Checks that a tar member is extracted under the extract path."""
+    if member.isdev():
+        return False
+    extract_path = os.path.realpath(extract_path)
+
+    def is_under(path: str) -> bool:
+        return os.path.commonpath([extract_path, path]) == extract_path
+
+    member_path = os.path.realpath(os.path.join(extract_path, member.name))
+    if not is_under(member_path):
+        return False
+    if member.issym():
+        link_path = os.path.join(os.path.dirname(member_path), member.linkname)
+        return is_under(os.path.realpath(link_path))
+    if member.islnk():
+        return is_under(os.path.realpath(os.path.join(extract_path, member.linkname)))
+    return True
+
+
+def untar_stream(
+    fileobj,
+    extract_path: str,
+    callback: Callable[[tarfile.TarInfo], None] = None,
+) -> str:
+    """Extracts a gzip tar stream member by member while it is being read.
+
+    Members that would be extracted outside of the extract path are skipped.
+    """
+    check_or_create_path(extract_path, is_dir=True)
+    # Use the builtin extraction filter when available, on top of the checks
+    extract_kwargs = {"filter": "tar"} if hasattr(tarfile, "tar_filter") else {}
+    with tarfile.open(fileobj=fileobj, mode="r|*") as tar:
+        for member in tar:
+            if not is_safe_tar_member(member, extract_path):
+                logger.warning("Skipping unsafe tar member %s", member.name)
+                continue
+            tar.extract(member, extract_path, **extract_kwargs)
+            if callback:
+                callback(member)
+    return extract_path
+
+
 def move_recursively(src, dst):
     files = os.listdir(src)
 
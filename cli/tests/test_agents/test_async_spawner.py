@@ -14,8 +14,11 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+import asyncio
 import pytest
 
+from kubernetes_asyncio.client.rest import ApiException
+
 from polyaxon.agents.spawners.async_spawner import AsyncSpawner
 from polyaxon.exceptions import PolyaxonAgentError
 from polyaxon.polyflow import V1RunKind
@@ -72,3 +75,67 @@ async def test_start_apply_stop_get():
 
     await spawner.get(run_uuid="", run_kind=V1RunKind.JOB)
     assert k8s_manager.get_custom_object.call_count == 1
+
+
+class DummyK8SManager:
+    api_client = object()
+
+    def __init__(self, existing=None):
+        self.existing = set(existing or [])
+        self.calls = []
+        self.active = 0
+        self.max_active = 0
+        self.closed = False
+        # Calls wait until it's set, if provided
+        self.released = None
+
+    async def _call(self, method, name):
+        self.calls.append((method, name))
+        self.active += 1
+        self.max_active = max(self.max_active, self.active)
+        await asyncio.sleep(0.01)
+        while self.released is not None and not self.released.is_set():
+            await asyncio.sleep(0.01)
+        self.active -= 1
+
+    async def create_custom_object(self, name, **kwargs):
+        await self._call("create", name)
+        if name in self.existing:
+            raise ApiException(status=409)
+        self.existing.add(name)
+        return {"name": name}
+
+    async def update_custom_object(self, name, **kwargs):
+        await self._call("update", name)
+        return {"name": name}
+
+    async def delete_custom_object(self, name, **kwargs):
+        await self._call("delete", name)
+        if name not in self.existing:
+            raise ApiException(status=404)
+        self.existing.discard(name)
+
+    async def close(self):
+        self.closed = True
+
+
+@pytest.mark.asyncio
+async def test_limit_calls_concurrency():
+    spawner = AsyncSpawner(max_concurrency=3)
+    k8s_manager = DummyK8SManager()
+    spawner._k8s_manager = k8s_manager
+
+    results = await asyncio.gather(
+        *[
+            spawner.limit(
+                spawner.create(
+                    run_uuid="run{}".format(i), run_kind=V1RunKind.JOB, resource={}
+                )
+            )
+            for i in range(10)
+        ]
+    )
+    assert [r["name"] for r in results] == [
+        "plx-operation-run{}".format(i) for i in range(10)
+    ]
+    assert 1 < k8s_manager.max_active <= 3
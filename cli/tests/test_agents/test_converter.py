@@ -0,0 +1,82 @@
+#!/usr/bin/python
+#
+# Copyright 2018-2022 Polyaxon, Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import pytest
+
+from mock import patch
+
+from polyaxon.agents.converter import AgentConfigCache
+from polyaxon.auxiliaries import get_default_sidecar_container
+from polyaxon.connections.kinds import V1ConnectionKind
+from polyaxon.connections.schemas import V1HostPathConnection
+from polyaxon.schemas.cli.agent_config import AgentConfig
+from polyaxon.schemas.types import V1ConnectionType
+from polyaxon.utils.test_utils import BaseTestCase
+
+
+def get_agent_content(namespace: str) -> str:
+    return AgentConfig(
+        namespace=namespace,
+        artifacts_store=V1ConnectionType(
+            name="test",
+            kind=V1ConnectionKind.HOST_PATH,
+            schema=V1HostPathConnection(host_path="/tmp", mount_path="/tmp"),
+            secret=None,
+        ),
+        connections=[],
+        sidecar=get_default_sidecar_container(),
+    ).to_dict(dump=True)
+
+
+@pytest.mark.agent_mark
+class TestAgentConfigCache(BaseTestCase):
+    def test_config_is_parsed_once_per_content(self):
+        cache = AgentConfigCache()
+        content = get_agent_content("foo")
+        with patch(
+            "polyaxon.agents.converter.AgentConfig.read", wraps=AgentConfig.read
+        ) as read:
+            config = cache.get(content)
+            assert config.namespace == "foo"
+            assert cache.get(content).to_dict() == config.to_dict()
+            # Equal content built separately
+            assert cache.get(get_agent_content("foo")).to_dict() == config.to_dict()
+            assert read.call_count == 1
+
+            new_config = cache.get(get_agent_content("bar"))
+            assert new_config.namespace == "bar"
+            assert read.call_count == 2
+
+    def test_lookups_are_shared_across_conversions(self):
+        cache = AgentConfigCache()
+        content = get_agent_content("foo")
+        config = cache.get(content)
+        other_config = cache.get(content)
+        assert other_config is not config
+        assert list(config.connections_by_names) == ["test"]
+        assert other_config.connections_by_names is config.connections_by_names
+        assert other_config.artifacts_store is config.artifacts_store
+
+    def test_mutations_do_not_leak_across_conversions(self):
+        cache = AgentConfigCache()
+        content = get_agent_content("foo")
+        config = cache.get(content)
+        config.namespace = "mutated"
+        config.sidecar.monitor_logs = True
+        other_config = cache.get(content)
+        assert other_config.namespace == "foo"
+        assert other_config.sidecar is not config.sidecar
+        assert other_config.sidecar.monitor_logs is None
@@ -0,0 +1,164 @@
+#!/usr/bin/python
+#
+# Copyright 2018-2022 Polyaxon, Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import asyncio
+import mock
+import pytest
+import threading
+import time
+
+from kubernetes.client import Configuration
+from kubernetes.client.rest import ApiException
+from kubernetes_asyncio.client import Configuration as AsyncConfiguration
+from kubernetes_asyncio.client.rest import ApiException as AsyncApiException
+
+from polyaxon import settings
+from polyaxon.agents.base import BaseAgent
+from polyaxon.agents.spawners.pipelined_spawner import PipelinedSpawner
+from polyaxon.agents.spawners.spawner import Spawner
+from polyaxon.k8s.async_manager import AsyncK8SManager
+from polyaxon.polyflow import V1RunKind
+from polyaxon.utils.test_utils import BaseTestCase
+from tests.test_agents.test_async_spawner import DummyK8SManager
+
+
+@pytest.mark.agent_mark
+class TestPipelinedSpawner(BaseTestCase):
+    SET_AGENT_SETTINGS = True
+
+    def setUp(self):
+        super().setUp()
+        self.spawner = PipelinedSpawner(max_concurrency=2)
+        self.k8s_manager = DummyK8SManager()
+        self.spawner.async_spawner._k8s_manager = self.k8s_manager
+
+    def tearDown(self):
+        self.spawner.async_spawner._k8s_manager = None
+        self.spawner.close()
+        super().tearDown()
+
+    def test_calls_run_in_the_spawner_loop(self):
+        assert self.spawner.create(
+            run_uuid="run1", run_kind=V1RunKind.JOB, resource={}
+        ) == {"name": "plx-operation-run1"}
+        self.spawner.apply(run_uuid="run1", run_kind=V1RunKind.JOB, resource={})
+        self.spawner.stop(run_uuid="run1", run_kind=V1RunKind.JOB)
+        assert self.k8s_manager.calls == [
+            ("create", "plx-operation-run1"),
+            ("update", "plx-operation-run1"),
+            ("delete", "plx-operation-run1"),
+        ]
+
+    def test_errors_are_raised_as_sync_api_exceptions(self):
+        self.spawner.create(run_uuid="run1", run_kind=V1RunKind.JOB, resource={})
+        with self.assertRaises(ApiException) as ctx:
+            self.spawner.create(run_uuid="run1", run_kind=V1RunKind.JOB, resource={})
+        assert ctx.exception.status == 409
+
+    def test_calls_of_many_threads_share_the_concurrency_limit(self):
+        threads = [
+            threading.Thread(
+                target=self.spawner.create,
+                kwargs=dict(
+                    run_uuid="run{}".format(i), run_kind=V1RunKind.JOB, resource={}
+                ),
+            )
+            for i in range(5)
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        assert len(self.k8s_manager.calls) == 5
+        assert self.k8s_manager.max_active == 2
+
+    def test_errors_keep_the_response_body_and_headers(self):
+        async def get_custom_object(**kwargs):
+            exc = AsyncApiException(status=429, reason="Too Many Requests")
+            exc.body = "body"
+            exc.headers = {"Retry-After": "1"}
+            raise exc
+
+        self.k8s_manager.get_custom_object = get_custom_object
+        with self.assertRaises(ApiException) as ctx:
+            self.spawner.get(run_uuid="run1", run_kind=V1RunKind.JOB)
+        assert ctx.exception.status == 429
+        assert ctx.exception.reason == "Too Many Requests"
+        assert ctx.exception.body == "body"
+        assert ctx.exception.headers == {"Retry-After": "1"}
+
+    @mock.patch("polyaxon.agents.spawners.pipelined_spawner.K8SManager")
+    def test_refresh_closes_the_previous_client_once_its_calls_are_done(self, _):
+        self.k8s_manager.released = threading.Event()
+        thread = threading.Thread(
+            target=self.spawner.create,
+            kwargs=dict(run_uuid="run1", run_kind=V1RunKind.JOB, resource={}),
+        )
+        thread.start()
+        try:
+            while not self.k8s_manager.calls:
+                time.sleep(0.01)
+
+            previous_spawner = self.spawner.async_spawner
+            self.spawner.refresh()
+            assert self.spawner.async_spawner is not previous_spawner
+            assert self.k8s_manager.closed is False
+
+            # New calls use the new spawner
+            k8s_manager = DummyK8SManager()
+            self.spawner.async_spawner._k8s_manager = k8s_manager
+            self.spawner.create(run_uuid="run2", run_kind=V1RunKind.JOB, resource={})
+            assert k8s_manager.calls == [("create", "plx-operation-run2")]
+            assert self.k8s_manager.closed is False
+        finally:
+            self.k8s_manager.released.set()
+            thread.join()
+        assert self.k8s_manager.calls == [("create", "plx-operation-run1")]
+        assert self.k8s_manager.closed is True
+        assert previous_spawner._k8s_manager is None
+
+        # Without calls in flight, the previous client is closed right away
+        self.spawner.refresh()
+        assert k8s_manager.closed is True
+
+    def test_k8s_config_is_passed_to_the_async_spawner(self):
+        k8s_config = Configuration(host="http://k8s:8080")
+        spawner = PipelinedSpawner(k8s_config=k8s_config, max_concurrency=3)
+        assert spawner.async_spawner.k8s_config is k8s_config
+
+    def test_setup_does_not_mutate_the_k8s_config(self):
+        k8s_config = AsyncConfiguration(host="http://k8s:8080")
+        pool_maxsize = k8s_config.connection_pool_maxsize
+        k8s_manager = AsyncK8SManager()
+
+        async def setup():
+            await k8s_manager.setup(k8s_config=k8s_config, connection_pool_maxsize=7)
+            await k8s_manager.close()
+
+        asyncio.run(setup())
+        assert k8s_config.connection_pool_maxsize == pool_maxsize
+        assert k8s_manager.api_client.configuration.connection_pool_maxsize == 7
+        assert k8s_manager.api_client.configuration.host == "http://k8s:8080"
+
+
+@pytest.mark.agent_mark
+class TestAgentSpawner(BaseTestCase):
+    def test_get_spawner(self):
+        assert isinstance(BaseAgent.get_spawner(), Spawner)
+        settings.CLIENT_CONFIG.spawner_concurrency = 100
+        spawner = BaseAgent.get_spawner()
+        assert isinstance(spawner, PipelinedSpawner)
+        assert spawner.async_spawner.max_concurrency == 100
@@ -0,0 +1,142 @@
+#!/usr/bin/python
+#
+# Copyright 2018-2022 Polyaxon, Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import pytest
+import threading
+
+from mock import MagicMock, patch
+
+from polyaxon.agents.base import BaseAgent
+from polyaxon.agents.scheduler import AgentActions, AgentScheduler
+from polyaxon.utils.test_utils import BaseTestCase
+
+
+@pytest.mark.agent_mark
+class TestAgentScheduler(BaseTestCase):
+    def test_priorities_dedupe_and_limits(self):
+        processed = []
+        blocked = threading.Event()
+        release = threading.Event()
+
+        def block():
+            blocked.set()
+            release.wait(5)
+
+        scheduler = AgentScheduler(workers=1, max_in_flight=2)
+        scheduler.start()
+        # Keep the only worker busy while queuing items
+        assert scheduler.submit(AgentActions.CHECK, "blocker", block) is True
+        assert blocked.wait(5)
+
+        assert scheduler.submit(AgentActions.SUBMIT, "run1", processed.append, 1)
+        assert (
+            scheduler.submit(AgentActions.SUBMIT, "run1", processed.append, 1) is False
+        )
+        assert scheduler.submit(AgentActions.SUBMIT, "run2", processed.append, 2)
+        # Over the submissions limit
+        assert (
+            scheduler.submit(AgentActions.SUBMIT, "run3", processed.append, 3) is False
+        )
+        assert scheduler.submit(AgentActions.STOP, "run1", processed.append, "stop1")
+        assert scheduler.submit(AgentActions.DELETE, "run4", processed.append, "del4")
+        assert scheduler.depth == 4
+
+        release.set()
+        scheduler.stop(timeout=5)
+        assert processed == ["stop1", "del4", 1, 2]
+        metrics = scheduler.get_metrics()
+        assert metrics["depth"] == 0
+        assert metrics["in_flight"]["submit"] == 0
+        assert metrics["rejected"] == {"submit": 1}
+        assert set(metrics["latency"].keys()) == {"check", "submit", "stop", "delete"}
+
+        # Processed items can be scheduled again
+        scheduler.start()
+        assert scheduler.submit(AgentActions.SUBMIT, "run1", processed.append, 1)
+        scheduler.stop(timeout=5)
+        assert processed[-1] == 1
+
+    def test_errors_do_not_stop_workers(self):
+        processed = []
+        scheduler = AgentScheduler(workers=1)
+        with scheduler:
+            scheduler.submit(AgentActions.CHECK, "run1", lambda: 1 / 0)
+            scheduler.submit(AgentActions.CHECK, "run2", processed.append, 2)
+        assert processed == [2]
+        assert scheduler.get_metrics()["in_flight"]["check"] == 0
+
+
+@pytest.mark.agent_mark
+class TestAgentProcess(BaseTestCase):
+    SET_AGENT_SETTINGS = True
+
+    @patch("polyaxon.agents.base.Spawner")
+    def test_process_schedules_actions(self, _):
+        agent = BaseAgent()
+        state = MagicMock(
+            schedules=[("o.p.runs.1", "job", "name", "content")],
+            queued=[("o.p.runs.1", "job", "name", "content")],
+            checks=None,
+            stopping=[("o.p.runs.2", "job")],
+            apply=None,
+            deleting=None,
+            hooks=None,
+            watchdogs=None,
+            tuners=[("o.p.runs.3", "job", "name", "content")],
+        )
+        agent.get_state = MagicMock(
+            return_value=MagicMock(state=state, compatible_updates=None)
+        )
+        scheduler = MagicMock()
+        agent.process(scheduler)
+        assert agent.get_state.call_count == 1
+        assert agent._watch_state is False
+        calls = [c[0] for c in scheduler.submit.call_args_list]
+        assert [(c[0], c[1]) for c in calls] == [
+            (AgentActions.STOP, "o.p.runs.2"),
+            (AgentActions.SUBMIT, "o.p.runs.1"),
+            (AgentActions.SUBMIT, "o.p.runs.1"),
+            (AgentActions.CREATE, "o.p.runs.3"),
+        ]
+        assert calls[-1][2] == agent.make_and_create_run
+        assert calls[-1][4] is True
+
+    @patch("polyaxon.agents.base.Spawner")
+    def test_process_watches_state(self, _):
+        agent = BaseAgent()
+        agent_state = MagicMock(compatible_updates=None)
+        agent_state.state = MagicMock(
+            **{
+                k: None
+                for k in [
+                    "schedules",
+                    "queued",
+                    "checks",
+                    "stopping",
+                    "apply",
+                    "deleting",
+                    "hooks",
+                    "watchdogs",
+                    "tuners",
+                ]
+            }
+        )
+        agent.watch_state = MagicMock(return_value=agent_state)
+        agent.get_state = MagicMock()
+        assert agent.process(MagicMock()) is agent_state
+        assert agent.watch_state.call_count == 1
+        assert agent.get_state.call_count == 0
+        assert agent._watch_state is True
@@ -0,0 +1,116 @@
+#!/usr/bin/python
+#
+# Copyright 2018-2022 Polyaxon, Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+
+import pytest
+import threading
+import time
+
+from mock import MagicMock
+
+from polyaxon.agents.status_reporter import StatusReporter
+from polyaxon.lifecycle import V1StatusCondition, V1Statuses
+from polyaxon.utils.test_utils import BaseTestCase
+
+
+def get_condition(status):
+    return V1StatusCondition.get_condition(type=status, status=True)
+
+
+@pytest.mark.agent_mark
+class TestStatusReporter(BaseTestCase):
+    def setUp(self):
+        super().setUp()
+        self.client = MagicMock()
+        self.reporter = StatusReporter(self.client, interval=10, num_workers=2)
+        self.reporter.RETRY_BACKOFF = 0
+
+    def tearDown(self):
+        self.reporter.stop(timeout=5)
+        super().tearDown()
+
+    def test_collapses_transitions_per_run(self):
+        # The runs are flushed concurrently, mock call counting is not thread safe
+        calls = []
+
+        def create_run_status(owner, project, uuid, body):
+            calls.append((uuid, body["condition"].type))
+
+        self.client.runs_v1.create_run_status.side_effect = create_run_status
+        for status in [V1Statuses.SCHEDULED, V1Statuses.RUNNING, V1Statuses.FAILED]:
+            self.reporter.report("owner", "project", "run1", get_condition(status))
+        self.reporter.report(
+            "owner", "project", "run2", get_condition(V1Statuses.SCHEDULED)
+        )
+        self.reporter.stop(timeout=5)
+
+        assert len(calls) == 2
+        assert dict(calls) == {
+            "run1": V1Statuses.FAILED,
+            "run2": V1Statuses.SCHEDULED,
+        }
+        assert self.reporter.get_metrics() == {
+            "sent": 2,
+            "failed": 0,
+            "merged": 2,
+            "retried": 0,
+        }
+
+    def test_retries_and_failures(self):
+        calls = {"run1": 0, "run2": 0}
+
+        def create_run_status(owner, project, uuid, body):
+            calls[uuid] += 1
+            if uuid == "run2" or calls[uuid] == 1:
+                raise ValueError("error")
+
+        self.client.runs_v1.create_run_status.side_effect = create_run_status
+        self.reporter.report("owner", "project", "run1", get_condition("running"))
+        self.reporter.report("owner", "project", "run2", get_condition("failed"))
+        self.reporter.stop(timeout=5)
+
+        assert calls == {"run1": 2, "run2": StatusReporter.MAX_ATTEMPTS}
+        assert self.reporter.get_metrics() == {
+            "sent": 1,
+            "failed": 1,
+            "merged": 0,
+            "retried": 1 + StatusReporter.MAX_ATTEMPTS - 1,
+        }
+
+    def test_flush_on_interval(self):
+        reporter = StatusReporter(self.client, interval=0.05)
+        reporter.report("owner", "project", "run1", get_condition("running"))
+        for _ in range(50):
+            if reporter.get_metrics()["sent"]:
+                break
+            time.sleep(0.02)
+        assert self.client.runs_v1.create_run_status.call_count == 1
+        reporter.stop(timeout=5)
+
+    def test_threads_share_one_worker(self):
+        barrier = threading.Barrier(8)
+        workers = []
+
+        def get_worker():
+            barrier.wait()
+            workers.append(self.reporter.worker)
+
+        threads = [threading.Thread(target=get_worker) for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        assert len({id(w) for w in workers}) == 1
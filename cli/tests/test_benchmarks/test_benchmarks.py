@@ -0,0 +1,260 @@
+#!/usr/bin/python
+#
+# Copyright 2018-2022 Polyaxon, Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import os
+import pytest
+import time
+
+from contextlib import ExitStack
+from mock import patch
+from typing import Callable, List
+
+import ujson
+
+from polyaxon import settings
+from polyaxon.agents import converter
+from polyaxon.connections.kinds import V1ConnectionKind
+from polyaxon.connections.schemas import V1HostPathConnection
+from polyaxon.polyaxonfile.specs import CompiledOperationSpecification
+from polyaxon.polyaxonfile.specs.libs import parser
+from polyaxon.polyaxonfile.specs.libs.parser import Parser
+from polyaxon.polyflow import V1CompiledOperation, V1Operation
+from polyaxon.schemas import base
+from polyaxon.schemas.cli.agent_config import AgentConfig
+from polyaxon.schemas.types import V1ConnectionType
+from polyaxon.utils.test_utils import BaseTestCase
+
+# Benchmarks are slow and machine dependent, they only run on demand:
+# POLYAXON_RUN_BENCHMARKS=true pytest -s -m benchmarks_mark tests/test_benchmarks
+pytestmark = [
+    pytest.mark.benchmarks_mark,
+    pytest.mark.skipif(
+        not os.environ.get("POLYAXON_RUN_BENCHMARKS"),
+        reason="Set POLYAXON_RUN_BENCHMARKS to run the benchmarks",
+    ),
+]
+
+
+def get_rate(fct: Callable, iterations: int) -> float:
+    start = time.perf_counter()
+    for _ in range(iterations):
+        fct()
+    return iterations / (time.perf_counter() - start)
+
+
+def compare(name: str, fct: Callable, iterations: int, baseline_patches: List):
+    """Returns the speedup of `fct` compared to its run with the baseline patches."""
+    with ExitStack() as stack:
+        for p in baseline_patches:
+            stack.enter_context(p)
+        before = get_rate(fct, iterations)
+    after = get_rate(fct, iterations)
+    print(
+        "%s per second: %.1f before, %.1f after, speedup: %.2fx"
+        % (name, before, after, after / before)
+    )
+    return after / before
+
+
+def get_connection(name: str) -> V1ConnectionType:
+    return V1ConnectionType(
+        name=name,
+        kind=V1ConnectionKind.HOST_PATH,
+        schema=V1HostPathConnection(host_path="/data", mount_path="/data"),
+        secret=None,
+    )
+
+
+def get_component(num_params: int) -> dict:
+    return {
+        "kind": "component",
+        "inputs": [
+            {"name": "param{}".format(i), "type": "int", "isOptional": True, "value": i}
+            for i in range(num_params)
+        ],
+        "outputs": [{"name": "loss", "type": "float", "isOptional": True}],
+        "run": {
+            "kind": "job",
+            "init": [{"git": {"url": "https://github.com/polyaxon/polyaxon"}}],
+            "environment": {"nodeSelector": {"polyaxon": "experiments"}},
+            "container": {
+                "image": "test",
+                "command": ["python", "main.py"],
+                "args": [
+                    "--param{i}={{{{ param{i} }}}}".format(i=i)
+                    for i in range(num_params)
+                ],
+            },
+        },
+    }
+
+
+def get_operation(num_params: int) -> dict:
+    return {
+        "version": 1.1,
+        "kind": "operation",
+        "name": "test",
+        "tags": ["foo", "bar"],
+        "params": {"param{}".format(i): {"value": i} for i in range(num_params)},
+        "matrix": {
+            "kind": "random",
+            "numRuns": 10,
+            "params": {
+                "lr": {"kind": "linspace", "value": {"start": 0, "stop": 1, "num": 5}}
+            },
+        },
+        "component": get_component(num_params),
+    }
+
+
+def get_compiled_operation(num_params: int) -> dict:
+    return dict(get_component(num_params), version=1.1, kind="compiled_operation")
+
+
+class TestBenchmarks(BaseTestCase):
+    def test_parser_templates_cache(self):
+        num_params = 200
+        content = get_compiled_operation(num_params)
+        content["matrix"] = {
+            "kind": "grid",
+            "params": {
+                "lr": {
+                    "kind": "choice",
+                    "value": [0.01 * i for i in range(num_params)],
+                },
+                "optimizer": {
+                    "kind": "choice",
+                    "value": ["opt{}".format(i) for i in range(num_params)],
+                },
+            },
+        }
+        config = CompiledOperationSpecification.read(content)
+        param_spec = CompiledOperationSpecification.calculate_context_spec(
+            config=config
+        )
+        parsed_params = Parser.get_parsed_params(param_spec)
+        expression = {
+            "key{}".format(i): {
+                "name": "value{}".format(i),
+                "values": [1, 2.0, "string", "[1, 2]"],
+                "template": "{{ params.param%s.value }}" % (i % 10),
+            }
+            for i in range(num_params)
+        }
+
+        benchmarks = {
+            "Parser.parse_operation": lambda: Parser.parse_operation(
+                config, param_spec
+            ),
+            "Parser.parse_expression": lambda: Parser.parse_expression(
+                expression, parsed_params
+            ),
+        }
+        for name, fct in benchmarks.items():
+            speedup = compare(
+                name,
+                fct,
+                iterations=20,
+                baseline_patches=[
+                    patch.object(parser, "is_template", return_value=True),
+                    patch.object(
+                        parser,
+                        "_compile_template",
+                        lambda engine, source: engine.from_string(source),
+                    ),
+                ],
+            )
+            assert speedup > 1
+
+    def test_schemas_cache_and_clone(self):
+        operation = V1Operation.read(get_operation(20))
+        compiled_operation = V1CompiledOperation.read(get_compiled_operation(20))
+        benchmarks = {
+            "V1Operation.read": lambda: V1Operation.read(get_operation(20)),
+            "V1Operation.to_dict": lambda: operation.to_dict(),
+            "V1Operation.clone": lambda: operation.clone(),
+            "V1CompiledOperation.read": lambda: V1CompiledOperation.read(
+                get_compiled_operation(20)
+            ),
+            "V1CompiledOperation.to_dict": lambda: compiled_operation.to_dict(),
+            "V1CompiledOperation.clone": lambda: compiled_operation.clone(),
+        }
+        for name, fct in benchmarks.items():
+            speedup = compare(
+                name,
+                fct,
+                iterations=200,
+                baseline_patches=[
+                    patch.object(
+                        base,
+                        "get_schema_instance",
+                        lambda schema_cls, unknown=None: schema_cls(unknown=unknown)
+                        if unknown
+                        else schema_cls(),
+                    ),
+                    patch.object(
+                        base.BaseConfig,
+                        "clone",
+                        lambda self: self.from_dict(self.to_dict()),
+                    ),
+                ],
+            )
+            assert speedup > 1
+
+    def test_agent_config_cache(self):
+        agent_content = AgentConfig(
+            namespace="polyaxon",
+            artifacts_store=get_connection("store"),
+            connections=[get_connection("c{}".format(i)) for i in range(50)],
+        ).to_dict(dump=True)
+        content = ujson.dumps(
+            {
+                "version": 1.1,
+                "kind": "compiled_operation",
+                "run": {
+                    "kind": "job",
+                    "connections": ["c1", "c2"],
+                    "container": {"image": "test", "command": ["python", "main.py"]},
+                },
+            }
+        )
+
+        def convert():
+            converter.convert(
+                owner_name="owner",
+                project_name="project",
+                run_name="run",
+                run_uuid="uuid",
+                content=content,
+                default_auth=True,
+                agent_content=agent_content,
+            )
+
+        class NoCache(converter.AgentConfigCache):
+            def get(self, agent_content: str) -> AgentConfig:
+                return AgentConfig.read(agent_content)
+
+        # The agent process always has a global agent config
+        with patch.object(settings, "AGENT_CONFIG", AgentConfig.read(agent_content)):
+            speedup = compare(
+                "converter.convert",
+                convert,
+                iterations=200,
+                baseline_patches=[
+                    patch.object(converter, "AGENT_CONFIG_CACHE", NoCache())
+                ],
+            )
+        assert speedup > 1
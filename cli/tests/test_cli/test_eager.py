@@ -0,0 +1,143 @@
+#!/usr/bin/python
+#
+# Copyright 2018-2022 Polyaxon, Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+
+import mock
+import os
+import pytest
+import shutil
+import tempfile
+import threading
+import time
+
+from urllib3.exceptions import (
+    ConnectTimeoutError,
+    MaxRetryError,
+    NewConnectionError,
+    ProtocolError,
+    ReadTimeoutError,
+)
+
+from polyaxon.cli.executor.eager import EagerRunsSubmitter, get_resume_path
+from polyaxon.utils.test_utils import BaseTestCase
+
+
+class ApiError(Exception):
+    def __init__(self, status):
+        self.status = status
+
+
+@pytest.mark.cli_mark
+class TestEagerRunsSubmitter(BaseTestCase):
+    def setUp(self):
+        super().setUp()
+        tmp_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, tmp_dir, ignore_errors=True)
+        self.resume_path = os.path.join(tmp_dir, "eager", "resume.plx.log")
+        self.created = []
+        self.attempts = {}
+        self.lock = threading.Lock()
+        self.fail = {3: 1, 5: 10}
+
+    def create_run(self, op):
+        with self.lock:
+            self.attempts[op] = self.attempts.get(op, 0) + 1
+            if self.attempts[op] <= self.fail.get(op, 0):
+                raise ApiError(503)
+            self.created.append(op)
+        return op
+
+    def get_submitter(self):
+        submitter = EagerRunsSubmitter(
+            create_run=self.create_run, resume_path=self.resume_path, max_workers=3
+        )
+        submitter.RETRY_BACKOFF = 0
+        return submitter
+
+    def test_resume_path(self):
+        path = get_resume_path("owner", "project", "content")
+        assert path == get_resume_path("owner", "project", "content")
+        assert path != get_resume_path("owner", "project", "other")
+
+    def test_submit_and_resume(self):
+        submitter = self.get_submitter()
+        runs, failed = submitter.submit(iter(range(20)), 20)
+        assert sorted(runs) == [i for i in range(20) if i != 5]
+        assert [f[0] for f in failed] == [5]
+        # Transient errors are retried, the failed op is attempted 3 times
+        assert self.attempts[3] == 2
+        assert self.attempts[5] == submitter.MAX_ATTEMPTS
+        assert submitter.get_created() == set(range(20)) - {5}
+
+        self.fail = {}
+        self.created = []
+        runs, failed = submitter.submit(iter(range(20)), 20)
+        assert runs == [5]
+        assert failed == []
+        assert self.created == [5]
+        assert not os.path.exists(self.resume_path)
+
+    def test_should_retry(self):
+        pool = mock.MagicMock()
+        assert EagerRunsSubmitter.should_retry(ApiError(429))
+        assert EagerRunsSubmitter.should_retry(ApiError(503))
+        assert EagerRunsSubmitter.should_retry(
+            MaxRetryError(pool, "/", NewConnectionError(pool, "refused"))
+        )
+        assert EagerRunsSubmitter.should_retry(ConnectTimeoutError())
+        # The request might have been processed
+        assert not EagerRunsSubmitter.should_retry(ApiError(500))
+        assert not EagerRunsSubmitter.should_retry(ApiError(400))
+        assert not EagerRunsSubmitter.should_retry(
+            MaxRetryError(pool, "/", ReadTimeoutError(pool, "/", "timeout"))
+        )
+        assert not EagerRunsSubmitter.should_retry(ProtocolError("reset"))
+        assert not EagerRunsSubmitter.should_retry(ValueError())
+
+    def test_non_retryable_errors_are_not_retried(self):
+        def create_run(op):
+            self.attempts[op] = self.attempts.get(op, 0) + 1
+            raise ApiError(500)
+
+        submitter = EagerRunsSubmitter(
+            create_run=create_run, resume_path=self.resume_path, max_workers=1
+        )
+        runs, failed = submitter.submit(iter(range(2)), 2)
+        assert runs == []
+        assert [f[0] for f in failed] == [0, 1]
+        assert self.attempts == {0: 1, 1: 1}
+
+    def test_resume_file_expires(self):
+        self.fail = {1: 10}
+        submitter = self.get_submitter()
+        submitter.submit(iter(range(3)), 3)
+        assert submitter.get_created() == {0, 2}
+
+        expired_at = time.time() - submitter.RESUME_TTL - 1
+        os.utime(self.resume_path, (expired_at, expired_at))
+        assert submitter.get_created() == set()
+        assert not os.path.exists(self.resume_path)
+
+    def test_reset(self):
+        self.fail = {1: 10}
+        submitter = self.get_submitter()
+        submitter.submit(iter(range(3)), 3)
+        submitter.reset()
+        self.fail = {}
+        self.created = []
+        runs, failed = submitter.submit(iter(range(3)), 3)
+        assert sorted(self.created) == [0, 1, 2]
+        assert failed == []
@@ -14,7 +14,10 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+import numpy as np
 import pytest
+import tempfile
+import time
 import uuid
 
 from mock import MagicMock, mock
@@ -34,3 +37,143 @@ class TestRunClient(BaseTestCase):
         client.log_tags(["foo", "bar"])
         assert client.run_data.tags == ["foo", "bar"]
         assert sdk_patch_run.call_count == 1
+
+    def test_merge_patches(self):
+        patches = RunClient._merge_patches(
+            [{"outputs": {"loss": 0.5}, "merge": True}],
+            [
+                {"outputs": {"loss": 0.4, "acc": 0.8}, "merge": True},
+                {"tags": ["foo"], "merge": True},
+                {"tags": ["foo", "bar"], "merge": True},
+                {"meta_info": {"key": "value"}, "merge": True},
+            ],
+        )
+        assert patches == [
+            {
+                "outputs": {"loss": 0.4, "acc": 0.8},
+                "tags": ["foo", "bar"],
+                "meta_info": {"key": "value"},
+                "merge": True,
+            }
+        ]
+
+        # Reset patches are not merged with the previous patches
+        patches = RunClient._merge_patches(
+            patches,
+            [{"outputs": {"acc": 0.9}}, {"outputs": {"acc": 1}}],
+        )
+        assert patches[1] == {"outputs": {"acc": 1}}
+        assert len(patches) == 2
+
+    def test_merge_lineages(self):
+        assert RunClient._merge_lineages(
+            {"foo": {"name": "foo", "path": "p1"}},
+            {"foo": {"name": "foo", "path": "p2"}, "bar": {"name": "bar"}},
+        ) == {"foo": {"name": "foo", "path": "p2"}, "bar": {"name": "bar"}}
+
+    @mock.patch("polyaxon_sdk.RunsV1Api.patch_run")
+    def test_coalesce_updates(self, sdk_patch_run):
+        settings.CLIENT_CONFIG.coalesce_updates = True
+        settings.CLIENT_CONFIG.coalesce_interval = 10
+        try:
+            client = RunClient(
+                owner="owner", project="project", run_uuid=uuid.uuid4().hex
+            )
+            for i in range(10):
+                client.log_outputs(step=i)
+            client.log_tags(["foo", "bar"])
+            client.client.transport.coalescing_worker.atexit()
+        finally:
+            settings.CLIENT_CONFIG.coalesce_updates = False
+        assert client.run_data.outputs == {"step": 9}
+        assert sdk_patch_run.call_count == 1
+        assert sdk_patch_run.call_args[1]["body"] == {
+            "outputs": {"step": 9},
+            "tags": ["foo", "bar"],
+            "merge": True,
+        }
+        assert client.client.transport.coalescing_merged == 10
+        assert client.client.transport.coalescing_sent == 1
+
+    @mock.patch("polyaxon_sdk.RunsV1Api.patch_run")
+    def test_sync_update_flushes_coalesced_updates(self, sdk_patch_run):
+        settings.CLIENT_CONFIG.coalesce_updates = True
+        settings.CLIENT_CONFIG.coalesce_interval = 10
+        try:
+            client = RunClient(
+                owner="owner", project="project", run_uuid=uuid.uuid4().hex
+            )
+            client.log_outputs(loss=0.5)
+            client.update({"outputs": {"loss": 0.4}}, async_req=False)
+            client.client.transport.coalescing_worker.atexit()
+        finally:
+            settings.CLIENT_CONFIG.coalesce_updates = False
+        assert sdk_patch_run.call_count == 2
+        bodies = [c[1]["body"] for c in sdk_patch_run.call_args_list]
+        assert bodies == [
+            {"outputs": {"loss": 0.5}, "merge": True},
+            {"outputs": {"loss": 0.4}},
+        ]
+
+    @mock.patch("polyaxon_sdk.RunsV1Api.patch_run")
+    def test_journal_requests(self, sdk_patch_run):
+        client = RunClient(owner="owner", project="project", run_uuid=uuid.uuid4().hex)
+        client._journal_requests = True
+        client._journal = client._get_journal(tempfile.mkdtemp())
+
+        sdk_patch_run.side_effect = ValueError("API is not reachable")
+        client._send_or_journal_patches([{"outputs": {"loss": 0.5}, "merge": True}])
+        client._send_or_journal_patches([{"outputs": {"loss": 0.4}, "merge": True}])
+        assert sdk_patch_run.call_count == 2
+        assert len(client.journal) == 2
+
+        sdk_patch_run.side_effect = None
+        assert client.sync_journal() is True
+        assert sdk_patch_run.call_count == 3
+        assert sdk_patch_run.call_args[1]["body"] == {
+            "outputs": {"loss": 0.4},
+            "merge": True,
+        }
+        assert len(client.journal) == 0
+
+    @mock.patch("polyaxon_sdk.RunsV1Api.patch_run")
+    def test_journal_sanitizes_patches(self, sdk_patch_run):
+        client = RunClient(owner="owner", project="project", run_uuid=uuid.uuid4().hex)
+        client._journal_requests = True
+        client._journal = client._get_journal(tempfile.mkdtemp())
+        client._schedule_journal_replay = MagicMock()
+
+        sdk_patch_run.side_effect = ValueError("API is not reachable")
+        client._send_or_journal_patches(
+            [{"outputs": {"loss": np.float32(0.5), "step": np.int64(2)}}]
+        )
+        assert client.journal.compacted() == [
+            ("patch", [{"outputs": {"loss": 0.5, "step": 2}}])
+        ]
+        assert client._schedule_journal_replay.call_count == 1
+
+    @mock.patch("polyaxon_sdk.RunsV1Api.patch_run")
+    def test_journal_is_replayed_on_timer(self, sdk_patch_run):
+        client = RunClient(owner="owner", project="project", run_uuid=uuid.uuid4().hex)
+        client.JOURNAL_REPLAY_INTERVAL = 0.05
+        client._journal_requests = True
+        client._journal = client._get_journal(tempfile.mkdtemp())
+
+        sdk_patch_run.side_effect = ValueError("API is not reachable")
+        client._send_or_journal_patches([{"outputs": {"loss": 0.5}, "merge": True}])
+        assert len(client.journal) == 1
+        time.sleep(0.2)
+        # The timer is rescheduled while the API is not reachable
+        assert len(client.journal) == 1
+        assert sdk_patch_run.call_count > 1
+
+        sdk_patch_run.side_effect = None
+        for _ in range(50):
+            if not len(client.journal):
+                break
+            time.sleep(0.02)
+        assert len(client.journal) == 0
+        assert sdk_patch_run.call_args[1]["body"] == {
+            "outputs": {"loss": 0.5},
+            "merge": True,
+        }
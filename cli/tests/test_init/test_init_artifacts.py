@@ -0,0 +1,85 @@
+#!/usr/bin/python
+#
+# Copyright 2018-2022 Polyaxon, Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+
+import os
+import pytest
+import tempfile
+
+from mock import patch
+
+from polyaxon.connections.kinds import V1ConnectionKind
+from polyaxon.init.artifacts import download_artifacts
+from polyaxon.utils.test_utils import BaseTestCase, create_tmp_files
+
+
+@pytest.mark.init_mark
+class TestInitArtifacts(BaseTestCase):
+    def setUp(self):
+        super().setUp()
+        self.store_path = tempfile.mkdtemp()
+        self.local_path = tempfile.mkdtemp()
+        os.makedirs(os.path.join(self.store_path, "dir1"))
+        create_tmp_files(os.path.join(self.store_path, "dir1"))
+        create_tmp_files(self.store_path)
+
+    def test_download_artifacts(self):
+        manifest = [
+            (os.path.join(self.store_path, "0"), self.local_path + "/f0", True),
+            (os.path.join(self.store_path, "dir1"), self.local_path + "/d1", False),
+            (os.path.join(self.store_path, "1"), self.local_path + "/f1", None),
+            (os.path.join(self.store_path, "dir1"), self.local_path + "/d2", None),
+        ]
+        with patch("polyaxon.init.artifacts.sync_file_watcher") as sync_fw:
+            download_artifacts(
+                connection_name="test",
+                connection_kind=V1ConnectionKind.HOST_PATH,
+                manifest=manifest,
+                raise_errors=True,
+                sync_fw=True,
+            )
+        assert os.path.isfile(self.local_path + "/f0")
+        assert os.path.isfile(self.local_path + "/f1")
+        assert sorted(os.listdir(self.local_path + "/d1")) == sorted(
+            os.listdir(os.path.join(self.store_path, "dir1"))
+        )
+        assert os.path.isdir(self.local_path + "/d2")
+        # The file watcher is synced once for all paths
+        assert sync_fw.call_count == 1
+        assert sync_fw.call_args[0][0] == [p[1] for p in manifest]
+
+    def test_download_artifacts_errors(self):
+        manifest = [
+            (os.path.join(self.store_path, "0"), self.local_path + "/f0", True),
+            (os.path.join(self.store_path, "missing"), self.local_path + "/m", True),
+        ]
+        download_artifacts(
+            connection_name="test",
+            connection_kind=V1ConnectionKind.HOST_PATH,
+            manifest=manifest,
+            raise_errors=False,
+            sync_fw=False,
+        )
+        assert os.path.isfile(self.local_path + "/f0")
+
+        with self.assertRaises(Exception):
+            download_artifacts(
+                connection_name="test",
+                connection_kind=V1ConnectionKind.HOST_PATH,
+                manifest=manifest,
+                raise_errors=True,
+                sync_fw=False,
+            )
@@ -0,0 +1,117 @@
+#!/usr/bin/python
+#
+# Copyright 2018-2022 Polyaxon, Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import asyncio
+import pytest
+
+from kubernetes_asyncio.client import V1Container, V1ObjectMeta, V1Pod, V1PodSpec
+
+from polyaxon.k8s.logging.async_monitor import (
+    query_k8s_operation_logs,
+    query_k8s_pod_logs,
+)
+
+
+def get_pod(name):
+    return V1Pod(
+        metadata=V1ObjectMeta(name=name),
+        spec=V1PodSpec(
+            node_name="node",
+            init_containers=[V1Container(name="init")],
+            containers=[V1Container(name="main"), V1Container(name="sidecar")],
+        ),
+    )
+
+
+class DummyCoreApi:
+    def __init__(self, lines):
+        self.lines = lines
+        self.calls = []
+        self.active = 0
+        self.max_active = 0
+
+    async def read_namespaced_pod_log(self, name, namespace, container, **params):
+        self.calls.append((name, container, params))
+        self.active += 1
+        self.max_active = max(self.max_active, self.active)
+        await asyncio.sleep(0.01)
+        self.active -= 1
+        return "\n".join(self.lines.get((name, container), []))
+
+
+class DummyK8SManager:
+    namespace = "ns"
+
+    def __init__(self, pods, lines):
+        self.pods = pods
+        self.k8s_api = DummyCoreApi(lines)
+
+    def get_managed_by_polyaxon(self, instance):
+        return instance
+
+    async def list_pods(self, label_selector=None):
+        return self.pods
+
+
+def get_line(second, value):
+    return "2022-01-01T00:00:{:02d}.000000Z {}".format(second, value)
+
+
+@pytest.mark.asyncio
+async def test_operation_logs_are_fetched_concurrently_and_merged():
+    pods = [get_pod("pod{}".format(i)) for i in range(4)]
+    lines = {
+        ("pod0", "main"): [get_line(1, "a"), get_line(5, "e")],
+        ("pod1", "main"): [get_line(2, "b"), get_line(4, "d")],
+        ("pod3", "init"): [get_line(3, "c")],
+    }
+    manager = DummyK8SManager(pods, lines)
+    logs, _ = await query_k8s_operation_logs(
+        k8s_manager=manager, instance="uuid", last_time=None, max_concurrency=5
+    )
+    assert [log.value for log in logs] == ["a", "b", "c", "d", "e"]
+    assert len(manager.k8s_api.calls) == 12
+    assert 1 < manager.k8s_api.max_active <= 5
+
+
+@pytest.mark.asyncio
+async def test_pod_logs_cursors():
+    pod = get_pod("pod0")
+    lines = {
+        ("pod0", "main"): [get_line(1, "a"), get_line(2, "b")],
+        ("pod0", "sidecar"): [get_line(3, "c")],
+    }
+    manager = DummyK8SManager([pod], lines)
+    cursors = {}
+    logs, last_time = await query_k8s_pod_logs(
+        k8s_manager=manager, pod=pod, last_time=None, cursors=cursors
+    )
+    assert [log.value for log in logs] == ["a", "b", "c"]
+    assert last_time == logs[-1].timestamp
+    assert cursors[("pod0", "main")] == logs[1].timestamp
+    assert cursors[("pod0", "sidecar")] == logs[2].timestamp
+    assert ("pod0", "init") not in cursors
+
+    # The lines already fetched are skipped
+    lines[("pod0", "main")].append(get_line(4, "d"))
+    manager.k8s_api.calls = []
+    logs, _ = await query_k8s_pod_logs(
+        k8s_manager=manager, pod=pod, last_time=None, cursors=cursors
+    )
+    assert [log.value for log in logs] == ["d"]
+    params = {c: p for _, c, p in manager.k8s_api.calls}
+    assert "since_seconds" not in params["init"]
+    assert params["main"]["since_seconds"] > 0
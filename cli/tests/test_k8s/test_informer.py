@@ -0,0 +1,176 @@
+#!/usr/bin/python
+#
+# Copyright 2018-2022 Polyaxon, Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import mock
+import threading
+import time
+
+from kubernetes.client import V1ListMeta, V1ObjectMeta, V1Pod, V1PodList
+
+from polyaxon.k8s.informer import INSTANCE_INDEX, Informer, iter_list_pages
+from polyaxon.k8s.manager import K8SManager
+from polyaxon.utils.test_utils import BaseTestCase
+
+
+def get_pod(name, instance=None, resource_version="1"):
+    labels = {"app.kubernetes.io/instance": instance} if instance else None
+    return V1Pod(
+        metadata=V1ObjectMeta(
+            name=name, labels=labels, resource_version=resource_version
+        )
+    )
+
+
+class DummyListApi:
+    """Serves the pods in pages, following the k8s continue tokens."""
+
+    def __init__(self, pods, resource_version="10"):
+        self.pods = pods
+        self.resource_version = resource_version
+        self.calls = []
+
+    def __call__(self, namespace, limit=None, _continue=None, **kwargs):
+        self.calls.append(dict(limit=limit, _continue=_continue, **kwargs))
+        start = int(_continue or 0)
+        end = start + limit if limit else len(self.pods)
+        return V1PodList(
+            items=self.pods[start:end],
+            metadata=V1ListMeta(
+                _continue=str(end) if end < len(self.pods) else None,
+                resource_version=self.resource_version,
+            ),
+        )
+
+
+class TestInformer(BaseTestCase):
+    def test_iter_list_pages(self):
+        api = DummyListApi([get_pod("pod{}".format(i)) for i in range(5)])
+        pages = list(iter_list_pages(api, limit=2, namespace="ns"))
+        assert [len(items) for items, _ in pages] == [2, 2, 1]
+        assert [c["_continue"] for c in api.calls] == [None, "2", "4"]
+        assert pages[-1][1] == "10"
+
+    def test_iter_list_pages_dict_response(self):
+        responses = [
+            {"items": [{"metadata": {"name": "a"}}], "metadata": {"continue": "x"}},
+            {"items": [{"metadata": {"name": "b"}}], "metadata": {}},
+        ]
+        api = mock.MagicMock(side_effect=responses)
+        pages = list(iter_list_pages(api, limit=1, namespace="ns", plural="ops"))
+        assert [items[0]["metadata"]["name"] for items, _ in pages] == ["a", "b"]
+        assert api.call_args_list[1][1]["_continue"] == "x"
+
+    def test_resync_and_events(self):
+        api = DummyListApi(
+            [
+                get_pod("pod1", instance="run1"),
+                get_pod("pod2", instance="run1"),
+                get_pod("pod3", instance="run2"),
+            ]
+        )
+        informer = Informer(api, namespace="ns", label_selector="foo", page_size=2)
+        informer.resync()
+        assert informer.has_synced is True
+        assert informer.resource_version == "10"
+        assert len(api.calls) == 2
+        assert api.calls[0]["label_selector"] == "foo"
+        assert len(informer.list()) == 3
+        assert {
+            p.metadata.name for p in informer.get_by_index(INSTANCE_INDEX, "run1")
+        } == {"pod1", "pod2"}
+
+        informer.handle_event("MODIFIED", get_pod("pod1", "run2", "11"))
+        informer.handle_event("DELETED", get_pod("pod3", "run2", "12"))
+        informer.handle_event("ADDED", get_pod("pod4", None, "13"))
+        assert informer.resource_version == "13"
+        assert informer.get("pod3") is None
+        assert informer.get("pod4") is not None
+        assert [
+            p.metadata.name for p in informer.get_by_index(INSTANCE_INDEX, "run1")
+        ] == ["pod2"]
+        assert [
+            p.metadata.name for p in informer.get_by_index(INSTANCE_INDEX, "run2")
+        ] == ["pod1"]
+
+        # A resync drops the objects that were deleted while not watching
+        api.pods = [get_pod("pod2", instance="run1")]
+        informer.resync()
+        assert [p.metadata.name for p in informer.list()] == ["pod2"]
+        assert informer.get_by_index(INSTANCE_INDEX, "run2") == []
+
+
+class TestK8SManagerInformers(BaseTestCase):
+    def setUp(self):
+        super().setUp()
+        with mock.patch("polyaxon.k8s.manager.config.load_kube_config"):
+            self.manager = K8SManager(namespace="ns")
+        self.manager._k8s_api = mock.MagicMock()
+        self.api = DummyListApi(
+            [get_pod("pod{}".format(i), instance="run1") for i in range(3)]
+        )
+        self.api.__name__ = "list_namespaced_pod"
+        self.manager.k8s_api.list_namespaced_pod = self.api
+
+    def test_list_is_paginated(self):
+        self.manager.LIST_PAGE_SIZE = 2
+        assert len(self.manager.list_pods()) == 3
+        assert len(self.api.calls) == 2
+        assert self.manager._informers == {}
+
+    @mock.patch("polyaxon.k8s.informer.Informer.start", Informer.resync)
+    def test_reads_from_informers(self):
+        self.manager.use_informers = True
+        assert len(self.manager.list_pods()) == 3
+        assert len(self.manager.list_pods()) == 3
+        assert len(self.manager.list_instance_pods("run1")) == 3
+        assert len(self.api.calls) == 1
+
+        assert self.manager.get_pod("pod1").metadata.name == "pod1"
+        assert self.manager.k8s_api.read_namespaced_pod.call_count == 0
+        self.manager.get_pod("pod10")
+        assert self.manager.k8s_api.read_namespaced_pod.call_count == 1
+
+        # Unsupported filters go to the API server
+        self.manager.list_pods(field_selector="status.phase=Running")
+        assert len(self.api.calls) == 2
+
+        # Reads return copies, mutating them does not alter the cache
+        self.manager.get_pod("pod1").metadata.name = "changed"
+        self.manager.list_pods()[0].metadata.labels = None
+        assert self.manager.get_pod("pod1").metadata.name == "pod1"
+        assert len(self.manager.list_instance_pods("run1")) == 3
+
+    def test_informer_is_created_once_across_threads(self):
+        started = []
+
+        def start(informer):
+            started.append(informer)
+            time.sleep(0.05)
+
+        with mock.patch("polyaxon.k8s.informer.Informer.start", start):
+            threads = [
+                threading.Thread(
+                    target=self.manager.get_informer,
+                    args=(self.manager.k8s_api.list_namespaced_pod,),
+                )
+                for _ in range(5)
+            ]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+        assert len(started) == 1
+        assert list(self.manager._informers.values()) == started
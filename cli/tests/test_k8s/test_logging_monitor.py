@@ -0,0 +1,127 @@
+#!/usr/bin/python
+#
+# Copyright 2018-2022 Polyaxon, Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import mock
+import os
+import tempfile
+
+from polyaxon.k8s.logging.monitor import iter_log_lines, process_logs, sync_logs
+from polyaxon.sidecar.container.monitors.logs import decode_log_line
+from polyaxon.utils.test_utils import BaseTestCase
+
+
+class DummyResponse:
+    def __init__(self, data: bytes, chunk_size: int):
+        self.data = data
+        self.chunk_size = chunk_size
+        self.released = False
+
+    def stream(self, amt):
+        for i in range(0, len(self.data), self.chunk_size):
+            yield self.data[i : i + self.chunk_size]
+
+    def release_conn(self):
+        self.released = True
+
+
+def get_data(count: int) -> bytes:
+    return "".join(
+        "2022-01-01T00:00:{:02d}.000000Z line {}\n".format(i % 60, i)
+        for i in range(count)
+    ).encode()
+
+
+class TestLoggingMonitor(BaseTestCase):
+    def setUp(self):
+        super().setUp()
+        self.k8s_manager = mock.MagicMock()
+        self.k8s_manager.namespace = "ns"
+
+    def test_iter_log_lines(self):
+        response = DummyResponse(b"line 1\nline 2\n\nline 3", chunk_size=4)
+        assert list(iter_log_lines(response)) == [b"line 1", b"line 2", b"line 3"]
+        assert response.released is True
+
+    def test_process_logs_streams_lines_to_file(self):
+        response = DummyResponse(get_data(100), chunk_size=7)
+        self.k8s_manager.k8s_api.read_namespaced_pod_log.return_value = response
+        filepath = os.path.join(tempfile.mkdtemp(), "logs")
+        assert process_logs(
+            k8s_manager=self.k8s_manager,
+            pod_id="pod",
+            container_id="main",
+            filepath=filepath,
+            since_seconds=10,
+        )
+        call_kwargs = self.k8s_manager.k8s_api.read_namespaced_pod_log.call_args[1]
+        assert call_kwargs["_preload_content"] is False
+        assert call_kwargs["since_seconds"] == 10
+        with open(filepath) as f:
+            lines = f.read().split("\n")
+        assert len(lines) == 101
+        logs = [decode_log_line(line) for line in lines[1:]]
+        assert [log.value for log in logs] == ["line {}".format(i) for i in range(100)]
+
+    def test_process_logs_without_logs(self):
+        response = DummyResponse(b"", chunk_size=7)
+        self.k8s_manager.k8s_api.read_namespaced_pod_log.return_value = response
+        filepath = os.path.join(tempfile.mkdtemp(), "logs")
+        assert not process_logs(
+            k8s_manager=self.k8s_manager,
+            pod_id="pod",
+            container_id="main",
+            filepath=filepath,
+            since_seconds=None,
+        )
+
+    def test_sync_logs_uploads_a_stream(self):
+        response = DummyResponse(get_data(10), chunk_size=7)
+        self.k8s_manager.k8s_api.read_namespaced_pod_log.return_value = response
+        client = mock.MagicMock()
+        client.client.config.host = "http://localhost:8000"
+        uploaded = []
+
+        def upload_stream(url, chunks, **kwargs):
+            uploaded.append(b"".join(chunks))
+            return mock.MagicMock()
+
+        client.store.upload_stream.side_effect = upload_stream
+        cwd = os.getcwd()
+        os.chdir(tempfile.mkdtemp())
+        try:
+            sync_logs(
+                k8s_manager=self.k8s_manager,
+                client=client,
+                last_check=None,
+                pod_id="pod",
+                container_id="main",
+                owner="owner",
+                project="project",
+                run_uuid="uuid",
+            )
+        finally:
+            os.chdir(cwd)
+        call_kwargs = client.store.upload_stream.call_args[1]
+        assert (
+            call_kwargs["url"]
+            == "http://localhost:8000/api/v1/owner/project/runs/uuid/logs/upload"
+        )
+        assert call_kwargs["filename"] == os.path.basename(
+            call_kwargs["params"]["path"]
+        )
+        assert call_kwargs["check_size"] is False
+        assert len(uploaded) == 1
+        assert uploaded[0].count(b"\n") == 10
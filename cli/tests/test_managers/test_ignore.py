@@ -14,11 +14,13 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 import io
+import os
 import pytest
+import tempfile
 
 from unittest.mock import mock_open, patch
 
-from polyaxon.managers.ignore import IgnoreConfigManager
+from polyaxon.managers.ignore import IgnoreConfigManager, IgnoreMatcher, Pattern
 from polyaxon.utils import cli_constants
 from polyaxon.utils.test_utils import BaseTestCase
 
@@ -149,3 +151,88 @@ class TestIgnoreConfigManager(BaseTestCase):
             (self.get_ignored(patterns), self.get_allowed(patterns)),
             (["#file1", "!file2"], []),
         )
+
+    def test_matcher_last_match_wins(self):
+        patterns = [
+            Pattern.create(p)
+            for p in ["*.py", "!keep.py", "build/", "!build/", "docs/*.md", "Lib"]
+        ]
+        matcher = IgnoreMatcher(patterns)
+        configs = [
+            ("foo.py", False, True),
+            ("src/keep.py", False, False),
+            ("src/KEEP.PY", False, False),
+            ("build", True, False),
+            ("build", False, None),
+            ("docs/index.md", False, True),
+            ("src/docs/index.md", False, True),
+            ("lib", True, True),
+            ("src/lib/", False, True),
+            ("foo.c", False, None),
+            ("sträße/foo.py", False, True),
+        ]
+        for path, is_dir, expected in configs:
+            assert matcher.is_ignored(path, is_dir=is_dir) is expected
+            assert IgnoreConfigManager.is_ignored(path, patterns, is_dir) is expected
+            assert IgnoreConfigManager.is_ignored(path, matcher, is_dir) is expected
+
+    def test_matcher_default_patterns(self):
+        patterns = (
+            IgnoreConfigManager.get_patterns(
+                io.StringIO(cli_constants.DEFAULT_IGNORE_LIST)
+            )
+            + IgnoreConfigManager.get_push_patterns()
+        )
+        matcher = IgnoreMatcher(patterns)
+        for path in [
+            "./.polyaxon",
+            "./src/.git",
+            "./src/__pycache__",
+            "./src/foo.pyc",
+            "./src/foo.py",
+            "./src/run.plx.json",
+            "./README.md",
+            "./lib64",
+            "./src/foo.so",
+            "./src/foo~",
+        ]:
+            for is_dir in (False, True):
+                assert matcher.is_ignored(
+                    path, is_dir=is_dir
+                ) is IgnoreConfigManager.is_ignored(path, patterns, is_dir=is_dir)
+
+    @patch("polyaxon.managers.ignore.IgnoreConfigManager.get_config")
+    def test_get_unignored_filepaths(self, get_config):
+        get_config.return_value = [
+            Pattern.create(p) for p in ["*.pyc", "build/", "!keep.pyc"]
+        ]
+        path = tempfile.mkdtemp()
+        for subpath in [
+            "foo.py",
+            "foo.pyc",
+            "keep.pyc",
+            "src/bar.py",
+            "src/bar.pyc",
+            "src/build/out.py",
+            "build/out.py",
+        ]:
+            filepath = os.path.join(path, subpath)
+            os.makedirs(os.path.dirname(filepath), exist_ok=True)
+            open(filepath, "w").close()
+        os.symlink(os.path.join(path, "src"), os.path.join(path, "link"))
+
+        with patch("polyaxon.managers.ignore.os.scandir", wraps=os.scandir) as scan:
+            files = IgnoreConfigManager.get_unignored_filepaths(path)
+        assert sorted(files) == [
+            os.path.join(path, "foo.py"),
+            os.path.join(path, "keep.pyc"),
+            os.path.join(path, "src", "bar.py"),
+        ]
+        # Ignored directories are not scanned
+        assert sorted(c[0][0] for c in scan.call_args_list) == [
+            path,
+            os.path.join(path, "src"),
+        ]
+        assert IgnoreConfigManager.get_unignored_filepaths(
+            path, addtional_patterns=[Pattern.create("*.py")]
+        ) == [os.path.join(path, "keep.pyc")]
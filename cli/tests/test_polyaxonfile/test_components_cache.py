@@ -0,0 +1,255 @@
+#!/usr/bin/python
+#
+# Copyright 2018-2022 Polyaxon, Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import os
+import pytest
+import tempfile
+
+from mock import MagicMock, patch
+
+from polyaxon import pkg, settings
+from polyaxon.exceptions import PolyaxonfileError, PolyaxonSchemaError
+from polyaxon.polyaxonfile import components_cache
+from polyaxon.polyaxonfile.check import collect_dag_components, collect_references
+from polyaxon.polyaxonfile.components_cache import (
+    ComponentsCache,
+    get_components_cache,
+    get_path_ref_cache_args,
+    get_url_ref_cache_args,
+)
+from polyaxon.polyflow import V1Component, V1Dag, V1Operation
+from polyaxon.schemas.cli.client_config import ClientConfig
+from polyaxon.utils.test_utils import BaseTestCase
+
+
+def get_component_config(name="foo"):
+    return {
+        "version": 1.1,
+        "kind": "component",
+        "name": name,
+        "run": {"kind": "job", "container": {"image": "foo"}},
+    }
+
+
+@pytest.mark.polyaxonfile_mark
+class TestComponentsCache(BaseTestCase):
+    def setUp(self):
+        super().setUp()
+        self.cache = ComponentsCache(path=tempfile.mkdtemp())
+
+    def test_get_key(self):
+        key = ComponentsCache.get_key("hub", "registry", "foo", "v1")
+        assert key == ComponentsCache.get_key("hub", "registry", "foo", "v1")
+        assert key != ComponentsCache.get_key("hub", "registry", "foo", "v2")
+        assert key != ComponentsCache.get_key("hub", "registryfoo", "", "v1")
+
+    def test_miss_then_hit(self):
+        fetch = MagicMock(return_value=(get_component_config(), "etag1"))
+        component = self.cache.get_or_fetch("key", fetch)
+        assert isinstance(component, V1Component)
+        assert component.name == "foo"
+        fetch.assert_called_once_with(None)
+
+        cached = ComponentsCache(path=self.cache.path).get_or_fetch("key", fetch)
+        assert fetch.call_count == 1
+        assert cached.to_dict() == component.to_dict()
+        assert self.cache.get_metrics() == {"hits": 0, "misses": 1, "revalidated": 0}
+
+    def test_stale_entry_is_revalidated_with_etag(self):
+        cache = ComponentsCache(path=self.cache.path, ttl=0)
+        cache.get_or_fetch(
+            "key", MagicMock(return_value=(get_component_config(), "etag1"))
+        )
+
+        not_modified = MagicMock(return_value=(None, "etag1"))
+        component = cache.get_or_fetch("key", not_modified)
+        not_modified.assert_called_once_with("etag1")
+        assert component.name == "foo"
+        assert cache.get_metrics()["revalidated"] == 1
+
+        modified = MagicMock(return_value=(get_component_config("bar"), "etag2"))
+        assert cache.get_or_fetch("key", modified).name == "bar"
+        modified.assert_called_once_with("etag1")
+        assert cache.load("key")["etag"] == "etag2"
+
+    def test_validator(self):
+        fetch = MagicMock(return_value=(get_component_config(), None))
+        self.cache.get_or_fetch("key", fetch, validator=(1, 10))
+        self.cache.get_or_fetch("key", fetch, validator=(1, 10))
+        assert fetch.call_count == 1
+        self.cache.get_or_fetch("key", fetch, validator=(2, 10))
+        assert fetch.call_count == 2
+        # Entries with a validator are never revalidated with an etag
+        fetch.assert_called_with(None)
+
+    def test_corrupted_entry_is_dropped(self):
+        fetch = MagicMock(return_value=(get_component_config(), None))
+        self.cache.get_or_fetch("key", fetch)
+        with open(self.cache._get_entry_path("key"), "wb") as f:
+            f.write(b"partial")
+        assert self.cache.load("key") is None
+        assert not os.path.exists(self.cache._get_entry_path("key"))
+
+    def test_entry_from_another_version_is_dropped(self):
+        fetch = MagicMock(return_value=(get_component_config(), None))
+        self.cache.get_or_fetch("key", fetch)
+        entry = self.cache.load("key")
+        assert entry["version"] == pkg.VERSION
+        assert entry["component"]["name"] == "foo"
+
+        with patch.object(pkg, "VERSION", "0.0.0"):
+            assert self.cache.load("key") is None
+            assert not os.path.exists(self.cache._get_entry_path("key"))
+            component = self.cache.get_or_fetch("key", fetch)
+        assert component.name == "foo"
+        assert fetch.call_count == 2
+
+    def test_only_components_are_cached(self):
+        fetch = MagicMock(
+            return_value=({"version": 1.1, "kind": "operation", "hubRef": "foo"}, None)
+        )
+        operation = self.cache.get_or_fetch("key", fetch)
+        assert isinstance(operation, V1Operation)
+        assert self.cache.load("key") is None
+        self.cache.get_or_fetch("key", fetch)
+        assert fetch.call_count == 2
+
+        # The kind error is raised for every fetch
+        with patch(
+            "polyaxon.polyaxonfile.check.get_components_cache"
+        ) as get_cache, patch(
+            "polyaxon.polyaxonfile.check.get_hub_ref_cache_args"
+        ) as hub_args:
+            get_cache.return_value = self.cache
+            hub_args.return_value = ("key", fetch)
+            for _ in range(2):
+                with self.assertRaises(PolyaxonfileError):
+                    collect_references(V1Operation(hub_ref="foo"))
+
+    def test_disabled_cache(self):
+        cache = ComponentsCache(path=self.cache.path, enabled=False)
+        fetch = MagicMock(return_value=(get_component_config(), "etag1"))
+        assert cache.get_or_fetch("key", fetch).name == "foo"
+        assert cache.get_or_fetch("key", fetch).name == "foo"
+        assert fetch.call_args_list == [((None,),), ((None,),)]
+        assert cache.load("key") is None
+
+        # Entries written while enabled are not used either
+        self.cache.get_or_fetch("key", fetch)
+        cache.get_or_fetch("key", fetch)
+        assert fetch.call_count == 4
+
+    def test_get_components_cache_uses_the_client_config(self):
+        with patch.object(components_cache, "_COMPONENTS_CACHE", None), patch.object(
+            settings,
+            "CLIENT_CONFIG",
+            ClientConfig(components_cache=False, components_cache_ttl=30),
+        ):
+            cache = get_components_cache()
+        assert cache.enabled is False
+        assert cache._ttl == 30
+
+        with patch.object(components_cache, "_COMPONENTS_CACHE", None), patch.object(
+            settings, "CLIENT_CONFIG", ClientConfig()
+        ):
+            cache = get_components_cache()
+        assert cache.enabled is True
+        assert cache._ttl == ComponentsCache.TTL
+
+    def test_url_ref_cache_args(self):
+        key, fetch = get_url_ref_cache_args("https://foo.bar/c.yaml")
+        assert key == ComponentsCache.get_key("url", "https://foo.bar/c.yaml")
+        with patch("polyaxon.utils.requests_utils.safe_request") as request:
+            request.return_value.status_code = 304
+            assert fetch("etag1") == (None, "etag1")
+        assert request.call_args[1]["headers"] == {"If-None-Match": "etag1"}
+
+    def test_path_ref_cache_args(self):
+        path = os.path.join(self.cache.path, "component.yaml")
+        with open(path, "w") as f:
+            f.write("version: 1.1\nkind: component\nrun: {kind: job, container: {}}")
+        key, fetch, validator = get_path_ref_cache_args(path)
+        assert key == ComponentsCache.get_key("path", path)
+        assert validator == (os.stat(path).st_mtime_ns, os.stat(path).st_size)
+        config, etag = fetch(None)
+        assert config["kind"] == "component"
+        assert etag is None
+
+
+@pytest.mark.polyaxonfile_mark
+class TestCollectDagComponents(BaseTestCase):
+    def setUp(self):
+        super().setUp()
+        self.cache = ComponentsCache(path=tempfile.mkdtemp())
+
+    def get_dag(self):
+        return V1Dag(
+            operations=[
+                V1Operation(name="op1", hub_ref="foo"),
+                V1Operation(name="op2", url_ref="https://foo.bar"),
+                V1Operation(name="op3", hub_ref="foo"),
+                V1Operation(name="op4", hub_ref="bar"),
+            ]
+        )
+
+    def test_distinct_refs_are_resolved_once(self):
+        dag = self.get_dag()
+
+        def get_or_fetch(key, fetch, validator=None):
+            return V1Component.read(get_component_config(key))
+
+        with patch(
+            "polyaxon.polyaxonfile.check.get_components_cache"
+        ) as get_cache, patch(
+            "polyaxon.polyaxonfile.check.get_hub_ref_cache_args"
+        ) as hub_args, patch(
+            "polyaxon.polyaxonfile.check.get_url_ref_cache_args"
+        ) as url_args:
+            get_cache.return_value.get_or_fetch.side_effect = get_or_fetch
+            hub_args.side_effect = lambda hub: (hub, None)
+            url_args.side_effect = lambda url: ("url", None)
+            collect_dag_components(dag)
+
+        assert get_cache.return_value.get_or_fetch.call_count == 3
+        assert hub_args.call_count == 2
+        assert [op.component.name for op in dag.operations] == [
+            "foo",
+            "url",
+            "foo",
+            "bar",
+        ]
+        # Operations sharing a reference do not share the component
+        assert dag.operations[0].component is not dag.operations[2].component
+
+    def test_errors_are_raised_with_the_op_name(self):
+        dag = self.get_dag()
+        with patch(
+            "polyaxon.polyaxonfile.check.get_components_cache"
+        ) as get_cache, patch(
+            "polyaxon.polyaxonfile.check.get_hub_ref_cache_args"
+        ) as hub_args, patch(
+            "polyaxon.polyaxonfile.check.get_url_ref_cache_args"
+        ) as url_args:
+            get_cache.return_value = self.cache
+            hub_args.side_effect = lambda hub: (
+                hub,
+                lambda _: (get_component_config(hub), None),
+            )
+            url_args.return_value = ("url", MagicMock(side_effect=ValueError("boom")))
+            with self.assertRaises(PolyaxonSchemaError) as e:
+                collect_dag_components(dag)
+        assert "op2" in str(e.exception)
+        assert "boom" in str(e.exception)
@@ -16,7 +16,13 @@
 
 import pytest
 
-from polyaxon.polyaxonfile.specs.libs.parser import Parser
+from mock import patch
+
+from polyaxon.polyaxonfile.specs.libs.parser import (
+    Parser,
+    _compile_template,
+    is_template,
+)
 from polyaxon.utils.test_utils import BaseTestCase
 
 
@@ -41,3 +47,40 @@ class TestParser(BaseTestCase):
         parser = Parser()
         assert parser.parse_expression("{{ something }}", {}) == ""
         assert parser.parse_expression("{{ something }}", {"something": 1}) == 1
+
+    def test_literals_fast_path(self):
+        expressions = [
+            "string",
+            "1",
+            "[1, 'a']",
+            "{'a': 1}",
+            "a}}b",
+            "a\nb",
+            "a\n",
+            "a\r\nb",
+            "{ a }",
+        ]
+        for expression in expressions:
+            expected = Parser.engine.from_string(expression).render()
+            if expected == expression:
+                assert is_template(expression) is False
+            assert Parser.parse_expression(expression, {}) == Parser.parse_expression(
+                expected, {}
+            )
+
+        with patch.object(Parser.engine, "from_string") as from_string:
+            assert Parser.parse_expression(["foo", "[1, 2]", "3.1"], {}) == [
+                "foo",
+                [1, 2],
+                3.1,
+            ]
+        assert from_string.call_count == 0
+
+    def test_compiled_templates_cache(self):
+        _compile_template.cache_clear()
+        for i in range(3):
+            assert Parser.parse_expression("{{ foo }}-{{ bar }}", {"foo": i, "bar": 1})
+        assert Parser.parse_expression("{{ foo }}", {"foo": 2}) == 2
+        info = _compile_template.cache_info()
+        assert info.misses == 2
+        assert info.hits == 2
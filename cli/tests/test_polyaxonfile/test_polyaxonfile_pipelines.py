@@ -16,6 +16,7 @@
 
 import os
 import pytest
+import tempfile
 
 from mock import patch
 
@@ -23,6 +24,7 @@ from polyaxon.exceptions import PolyaxonSchemaError
 from polyaxon.k8s.k8s_schemas import V1Container
 from polyaxon.polyaxonfile import check_polyaxonfile
 from polyaxon.polyaxonfile.check import collect_dag_components
+from polyaxon.polyaxonfile.components_cache import ComponentsCache
 from polyaxon.polyaxonfile.specs import (
     CompiledOperationSpecification,
     OperationSpecification,
@@ -112,13 +114,24 @@ class TestPolyaxonfileWithPipelines(BaseTestCase):
                 {"kind": "compiled_operation"},
             ]
         )
-        with patch("polyaxon.config_reader.spec.ConfigSpec.read") as config_read:
-            config_read.return_value = V1Component(
-                kind="component",
-                version=" 1.1",
-                inputs=[V1IO(name="str-input", type="str")],
-                run=V1Job(container=V1Container(name="test")),
-            ).to_dict()
+        component = V1Component(
+            kind="component",
+            version=" 1.1",
+            inputs=[V1IO(name="str-input", type="str")],
+            run=V1Job(container=V1Container(name="test")),
+        ).to_dict()
+        cache = ComponentsCache(path=tempfile.mkdtemp())
+        with patch("polyaxon.config_reader.spec.ConfigSpec.read") as config_read, patch(
+            "polyaxon.config_reader.spec.fetch_url"
+        ) as fetch_url, patch(
+            "polyaxon.config_reader.spec._read_from_polyaxon_hub"
+        ) as read_hub, patch(
+            "polyaxon.polyaxonfile.check.get_components_cache"
+        ) as get_cache:
+            config_read.return_value = component
+            fetch_url.return_value = component, None
+            read_hub.return_value = component
+            get_cache.return_value = cache
             collect_dag_components(run_config.run)
         compiled_op = CompiledOperationSpecification.apply_operation_contexts(
             run_config
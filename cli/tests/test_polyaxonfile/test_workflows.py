@@ -0,0 +1,112 @@
+#!/usr/bin/python
+#
+# Copyright 2018-2022 Polyaxon, Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+
+import pytest
+
+import ujson
+
+from hypertune.search_managers.grid_search.manager import GridSearchManager
+from polyaxon.polyaxonfile.manager import (
+    get_eager_matrix_operations,
+    get_eager_matrix_suggestions,
+)
+from polyaxon.polyflow import V1CompiledOperation, V1GridSearch
+from polyaxon.utils.test_utils import BaseTestCase
+
+
+def get_matrix(num_runs=None):
+    return {
+        "kind": "grid",
+        "numRuns": num_runs,
+        "params": {
+            "lr": {"kind": "linspace", "value": {"start": 0, "stop": 1, "num": 4}},
+            "optimizer": {"kind": "choice", "value": ["sgd", "adam", "rms"]},
+        },
+    }
+
+
+def get_component():
+    return {
+        "kind": "component",
+        "inputs": [
+            {"name": "lr", "type": "float"},
+            {"name": "optimizer", "type": "str"},
+        ],
+        "run": {"kind": "job", "container": {"image": "test"}},
+    }
+
+
+@pytest.mark.polyaxonfile_mark
+class TestEagerWorkflows(BaseTestCase):
+    def test_grid_suggestions_are_lazy(self):
+        for num_runs in [None, 5, 100]:
+            matrix = V1GridSearch.from_dict(get_matrix(num_runs))
+            num_suggestions, suggestions = get_eager_matrix_suggestions(
+                V1CompiledOperation.read(
+                    dict(
+                        get_component(),
+                        version=1.1,
+                        kind="compiled_operation",
+                        matrix=get_matrix(num_runs),
+                    )
+                )
+            )
+            assert not isinstance(suggestions, list)
+            expected = GridSearchManager(matrix).get_suggestions()
+            assert num_suggestions == len(expected)
+            assert list(suggestions) == expected
+
+    def test_ops_share_the_base_operation(self):
+        content = ujson.dumps(
+            {
+                "version": 1.1,
+                "kind": "operation",
+                "matrix": get_matrix(),
+                "component": get_component(),
+            }
+        )
+        compiled_operation = V1CompiledOperation.read(
+            dict(
+                get_component(),
+                version=1.1,
+                kind="compiled_operation",
+                matrix=get_matrix(),
+            )
+        )
+        ops = list(
+            get_eager_matrix_operations(
+                content=content, compiled_operation=compiled_operation
+            )
+        )
+        assert len(ops) == 12
+        assert len({id(op) for op in ops}) == 12
+        assert len({id(op.component) for op in ops}) == 1
+        assert ops[0].matrix is None
+        assert ops[0].component.run == compiled_operation.run
+        assert {
+            (op.params["lr"].value, op.params["optimizer"].value) for op in ops
+        } == {
+            (lr, optimizer)
+            for lr in [0, 1 / 3, 2 / 3, 1]
+            for optimizer in ["sgd", "adam", "rms"]
+        }
+        assert all(op.params["lr"].context_only is False for op in ops)
+        # Ops are serialized with their own params
+        assert ops[1].to_dict()["params"] == {
+            "lr": {"value": 0.0, "contextOnly": False},
+            "optimizer": {"value": "adam", "contextOnly": False},
+        }
@@ -47,6 +47,7 @@ from polyaxon.polypod.common.volumes import get_volume_name
 from polyaxon.polypod.init.store import (
     cp_mount_args,
     cp_store_args,
+    cp_store_paths_args,
     get_base_store_container,
     get_or_create_args,
     get_store_container,
@@ -94,6 +95,15 @@ class TestInitStore(BaseTestCase):
             "polyaxon initializer path --connection-kind=host_path "
             "--path-from=/foo --path-to=/bar --check-path;"
         )
+        assert cp_store_paths_args(
+            backend="s3",
+            manifest=[("s3://foo/a", "/bar/a", True), ("s3://foo/b", "/bar/b", None)],
+            sync_fw=True,
+        ) == (
+            "polyaxon initializer paths --connection-kind=s3 "
+            '--manifest=\'[["s3://foo/a","/bar/a",true],'
+            '["s3://foo/b","/bar/b",null]]\' --sync-fw;'
+        )
 
     def test_files_cp_gcs_args(self):
         assert cp_store_args(
@@ -187,22 +197,14 @@ class TestInitStore(BaseTestCase):
         ) == " ".join(
             [
                 get_or_create_args(path=base_path),
-                cp_store_args(
-                    backend="s3",
-                    path_from=path_from1,
-                    path_to=path_to1,
-                    is_file=True,
-                    sync_fw=False,
-                    check_path=False,
-                ),
                 get_or_create_args(path=base_path),
-                cp_store_args(
+                cp_store_paths_args(
                     backend="s3",
-                    path_from=path_from2,
-                    path_to=path_to2,
-                    is_file=True,
+                    manifest=[
+                        (path_from1, path_to1, True),
+                        (path_from2, path_to2, True),
+                    ],
                     sync_fw=False,
-                    check_path=False,
                 ),
             ]
         )
@@ -220,22 +222,14 @@ class TestInitStore(BaseTestCase):
         ) == " ".join(
             [
                 get_or_create_args(path=base_path),
-                cp_store_args(
-                    backend="s3",
-                    path_from=path_from1,
-                    path_to=path_to1,
-                    is_file=False,
-                    sync_fw=False,
-                    check_path=True,
-                ),
                 get_or_create_args(path=base_path),
-                cp_store_args(
+                cp_store_paths_args(
                     backend="s3",
-                    path_from=path_from2,
-                    path_to=path_to2,
-                    is_file=False,
+                    manifest=[
+                        (path_from1, path_to1, None),
+                        (path_from2, path_to2, None),
+                    ],
                     sync_fw=False,
-                    check_path=True,
                 ),
             ]
         )
@@ -280,22 +274,14 @@ class TestInitStore(BaseTestCase):
         ) == " ".join(
             [
                 get_or_create_args(path=path_to1),
-                cp_store_args(
-                    backend="gcs",
-                    path_from=path_from1,
-                    path_to=path_to1,
-                    is_file=False,
-                    sync_fw=False,
-                    check_path=False,
-                ),
                 get_or_create_args(path=path_to2),
-                cp_store_args(
+                cp_store_paths_args(
                     backend="gcs",
-                    path_from=path_from2,
-                    path_to=path_to2,
-                    is_file=False,
+                    manifest=[
+                        (path_from1, path_to1, False),
+                        (path_from2, path_to2, False),
+                    ],
                     sync_fw=False,
-                    check_path=False,
                 ),
             ]
         )
@@ -340,22 +326,14 @@ class TestInitStore(BaseTestCase):
         ) == " ".join(
             [
                 get_or_create_args(path=base_path),
-                cp_store_args(
-                    backend="wasb",
-                    path_from=path_from1,
-                    path_to=path_to1,
-                    is_file=True,
-                    sync_fw=False,
-                    check_path=False,
-                ),
                 get_or_create_args(path=path_to2),
-                cp_store_args(
+                cp_store_paths_args(
                     backend="wasb",
-                    path_from=path_from2,
-                    path_to=path_to2,
-                    is_file=False,
+                    manifest=[
+                        (path_from1, path_to1, True),
+                        (path_from2, path_to2, False),
+                    ],
                     sync_fw=False,
-                    check_path=False,
                 ),
             ]
         )
@@ -449,22 +427,14 @@ class TestInitStore(BaseTestCase):
                     sync_fw=False,
                 ),
                 get_or_create_args(path=base_path),
-                cp_store_args(
-                    backend=V1ConnectionKind.VOLUME_CLAIM,
-                    path_from=path_from3,
-                    path_to=path_to3,
-                    is_file=False,
-                    sync_fw=False,
-                    check_path=True,
-                ),
                 get_or_create_args(path=base_path),
-                cp_store_args(
+                cp_store_paths_args(
                     backend=V1ConnectionKind.VOLUME_CLAIM,
-                    path_from=path_from4,
-                    path_to=path_to4,
-                    is_file=False,
+                    manifest=[
+                        (path_from3, path_to3, None),
+                        (path_from4, path_to4, None),
+                    ],
                     sync_fw=False,
-                    check_path=True,
                 ),
             ]
         )
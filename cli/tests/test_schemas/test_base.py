@@ -15,8 +15,11 @@
 # limitations under the License.
 
 
-from marshmallow import Schema, ValidationError, fields
+import threading
 
+from marshmallow import EXCLUDE, RAISE, Schema, ValidationError, fields
+
+from polyaxon.polyflow import V1Operation
 from polyaxon.schemas.base import BaseConfig, BaseOneOfSchema, BaseSchema
 from polyaxon.utils.test_utils import BaseTestCase
 
@@ -393,3 +396,75 @@ class TestOneOfSchema(BaseTestCase):
 
         unmarshalled = schema.load(marshalled, many=True)
         assert data == unmarshalled
+
+
+class TestBaseConfig(BaseTestCase):
+    def test_schema_instances_are_shared(self):
+        schema = FooConfig.get_schema()
+        assert isinstance(schema, FooSchema)
+        assert schema.unknown == RAISE
+        assert FooConfig.get_schema() is schema
+        assert FooConfig.get_schema(unknown=RAISE) is schema
+        exclude_schema = FooConfig.get_schema(unknown=EXCLUDE)
+        assert exclude_schema is not schema
+        assert exclude_schema.unknown == EXCLUDE
+        assert BarConfig.get_schema() is not schema
+
+        assert FooConfig.from_dict({"value": "foo", "bar": 1}, unknown=EXCLUDE) == (
+            FooConfig("foo")
+        )
+        with self.assertRaises(ValidationError):
+            FooConfig.from_dict({"value": "foo", "bar": 1})
+        with self.assertRaises(ValidationError):
+            BazConfig.from_dict({"value1": 1})
+        assert BazConfig.from_dict({"value1": 1}, partial=True) == BazConfig(value1=1)
+
+    def test_schema_instances_concurrent_access(self):
+        results = []
+
+        def load(i):
+            results.append(
+                BazConfig.from_dict({"value1": i, "value2": str(i)}).to_dict()
+            )
+
+        threads = [threading.Thread(target=load, args=(i,)) for i in range(20)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        assert sorted(results, key=lambda r: r["value1"]) == [
+            {"value1": i, "value2": str(i)} for i in range(20)
+        ]
+
+    def test_clone(self):
+        config = BazConfig(value1=1, value2="foo")
+        config.value3 = {"nested": [1, 2]}
+        clone = config.clone()
+        assert clone is not config
+        assert clone == config
+        assert clone.to_dict() == config.to_dict()
+        clone.value3["nested"].append(3)
+        assert config.value3 == {"nested": [1, 2]}
+
+    def test_clone_operation(self):
+        operation = V1Operation.read(
+            {
+                "version": 1.1,
+                "kind": "operation",
+                "params": {"lr": {"value": 0.1}},
+                "component": {
+                    "run": {
+                        "kind": "job",
+                        "environment": {"nodeSelector": {"foo": "bar"}},
+                        "container": {"image": "test", "command": ["foo"]},
+                    }
+                },
+            }
+        )
+        clone = operation.clone()
+        assert clone.to_dict() == operation.to_dict()
+        assert clone.component.run.container is not operation.component.run.container
+        clone.component.run.container.command.append("bar")
+        clone.params["lr"].value = 0.2
+        assert operation.component.run.container.command == ["foo"]
+        assert operation.params["lr"].value == 0.1
@@ -16,7 +16,14 @@
 
 import pytest
 
-from polyaxon.env_vars.keys import EV_KEYS_DEBUG, EV_KEYS_HOST, EV_KEYS_VERIFY_SSL
+from polyaxon.env_vars.keys import (
+    EV_KEYS_COMPONENTS_CACHE,
+    EV_KEYS_COMPONENTS_CACHE_TTL,
+    EV_KEYS_DEBUG,
+    EV_KEYS_HOST,
+    EV_KEYS_UPLOAD_STREAMING,
+    EV_KEYS_VERIFY_SSL,
+)
 from polyaxon.schemas.cli.client_config import ClientConfig
 from polyaxon.services.auth import AuthenticationTypes
 from polyaxon.utils.test_utils import BaseTestCase
@@ -41,6 +48,21 @@ class TestClientConfig(BaseTestCase):
         assert config.base_url == "http://localhost:8000/api/v1"
         assert config.verify_ssl is True
 
+    def test_upload_streaming_is_opt_in(self):
+        assert ClientConfig().upload_streaming is False
+        config = ClientConfig.from_dict({EV_KEYS_UPLOAD_STREAMING: True})
+        assert config.upload_streaming is True
+
+    def test_components_cache(self):
+        config = ClientConfig()
+        assert config.components_cache is True
+        assert config.components_cache_ttl is None
+        config = ClientConfig.from_dict(
+            {EV_KEYS_COMPONENTS_CACHE: False, EV_KEYS_COMPONENTS_CACHE_TTL: 30}
+        )
+        assert config.components_cache is False
+        assert config.components_cache_ttl == 30
+
     def test_base_urls(self):
         assert self.config.base_url == "{}/api/v1".format(self.host)
 
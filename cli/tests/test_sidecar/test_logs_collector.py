@@ -0,0 +1,130 @@
+#!/usr/bin/python
+#
+# Copyright 2018-2022 Polyaxon, Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import mock
+import os
+import pytest
+import shutil
+import tempfile
+
+from datetime import timedelta
+
+from polyaxon.sidecar.container.monitors.logs import LogsCollector, decode_log_line
+from polyaxon.utils.tz_utils import now
+from traceml.logging import V1Log, V1Logs
+
+
+def get_logs(start, count, container="main"):
+    return [
+        V1Log(
+            timestamp=start + timedelta(seconds=i),
+            node="node",
+            pod="pod",
+            container=container,
+            value="line{}".format(i),
+        )
+        for i in range(count)
+    ]
+
+
+@pytest.fixture
+def logs_path():
+    path = tempfile.mkdtemp()
+    with mock.patch(
+        "polyaxon.sidecar.container.monitors.logs.get_tmp_logs_path",
+        return_value=os.path.join(path, ".tmpplxlogs"),
+    ):
+        yield path
+    shutil.rmtree(path, ignore_errors=True)
+
+
+def read_logs(path):
+    with open(path, "r") as f:
+        lines = f.read().split("\n")
+    assert lines[0] == V1Logs.get_csv_header()
+    return [decode_log_line(line) for line in lines[1:]]
+
+
+@pytest.mark.asyncio
+async def test_logs_collector_appends_to_the_pod_logs_file(logs_path):
+    collector = LogsCollector(run_uuid="uuid", pod_name="pod")
+    assert collector.path == os.path.join(logs_path, ".tmpplxlogs", "pod.plx")
+    start = now(tzinfo=True)
+    await collector.append(get_logs(start, 2))
+    await collector.append(get_logs(start + timedelta(seconds=10), 3))
+    await collector.append([])
+    assert [log.value for log in read_logs(collector.path)] == [
+        "line0",
+        "line1",
+        "line0",
+        "line1",
+        "line2",
+    ]
+
+    collector.clean()
+    assert not os.path.exists(os.path.dirname(collector.path))
+    assert collector.cursors == {}
+
+
+@pytest.mark.asyncio
+async def test_logs_collector_restores_cursors_from_the_logs_file(logs_path):
+    collector = LogsCollector(run_uuid="uuid", pod_name="pod")
+    assert collector.cursors == {}
+    start = now(tzinfo=True)
+    main_logs = get_logs(start, 3)
+    sidecar_logs = get_logs(start, 2, container="sidecar")
+    await collector.append(main_logs + sidecar_logs)
+
+    # A restarted sidecar resumes after the last line written for every container
+    restarted = LogsCollector(run_uuid="uuid", pod_name="pod")
+    assert restarted.cursors == {
+        ("pod", "main"): main_logs[-1].timestamp,
+        ("pod", "sidecar"): sidecar_logs[-1].timestamp,
+    }
+
+
+@pytest.mark.asyncio
+async def test_logs_collector_rotates_the_logs_file(logs_path):
+    collector = LogsCollector(run_uuid="uuid", pod_name="pod", max_size=300)
+    start = now(tzinfo=True)
+    main_logs = get_logs(start, 3)
+    await collector.append(main_logs)
+    await collector.append(get_logs(start, 1, container="sidecar"))
+    assert not os.path.exists(collector.rotated_path)
+
+    sidecar_logs = get_logs(start + timedelta(seconds=10), 3, container="sidecar")
+    await collector.append(sidecar_logs)
+    assert os.path.getsize(collector.path) <= 300
+    assert [log.value for log in read_logs(collector.rotated_path)] == [
+        "line0",
+        "line1",
+        "line2",
+        "line0",
+    ]
+    assert [log.value for log in read_logs(collector.path)] == [
+        "line0",
+        "line1",
+        "line2",
+    ]
+
+    # The cursors of the containers without new lines are kept in the rotated file
+    restarted = LogsCollector(run_uuid="uuid", pod_name="pod", max_size=300)
+    assert restarted.cursors == {
+        ("pod", "main"): main_logs[-1].timestamp,
+        ("pod", "sidecar"): sidecar_logs[-1].timestamp,
+    }
+    restarted.clean()
+    assert not os.path.exists(collector.rotated_path)
@@ -0,0 +1,319 @@
+#!/usr/bin/python
+#
+# Copyright 2018-2022 Polyaxon, Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import asyncio
+import os
+import pytest
+import tempfile
+import time
+
+from fsspec.implementations.local import LocalFileSystem
+
+from polyaxon import settings
+from polyaxon.fs.inotify import Inotify
+from polyaxon.fs.multipart import (
+    MultipartUpload,
+    MultipartUploadMixin,
+    TransferBudget,
+    supports_multipart,
+)
+from polyaxon.fs.watcher import FSWatcher
+from polyaxon.sidecar.container.monitors.artifacts import sync_fs
+from polyaxon.utils.test_utils import patch_settings
+
+
+class DummyMultipartFS(MultipartUploadMixin, LocalFileSystem):
+    async_impl = True
+    cachable = False
+
+    def __init__(self, fail_at=None, **kwargs):
+        super().__init__(auto_mkdir=True, **kwargs)
+        self.fail_at = fail_at
+        self.uploads = {}
+        self.started = 0
+        self.uploaded_parts = []
+
+    async def _mpu_start(self, rpath, size):
+        self.started += 1
+        upload_id = "upload-{}".format(self.started)
+        self.uploads[upload_id] = {}
+        return upload_id
+
+    async def _mpu_upload_part(self, rpath, upload_id, part_number, offset, data, size):
+        if part_number == self.fail_at:
+            raise OSError("Connection reset")
+        self.uploads[upload_id][part_number] = data
+        self.uploaded_parts.append(part_number)
+        return "etag-{}".format(part_number)
+
+    async def _mpu_complete(self, rpath, upload_id, parts):
+        assert parts == ["etag-{}".format(i + 1) for i in range(len(parts))]
+        data = self.uploads.pop(upload_id)
+        self.makedirs(os.path.dirname(rpath), exist_ok=True)
+        with open(rpath, "wb") as f:
+            for i in sorted(data):
+                f.write(data[i])
+
+
+class FailingFS(LocalFileSystem):
+    cachable = False
+
+    def __init__(self, **kwargs):
+        super().__init__(auto_mkdir=True, **kwargs)
+        self.fail = False
+
+    def cp_file(self, path1, path2, **kwargs):
+        if self.fail:
+            raise OSError("Connection reset")
+        return super().cp_file(path1, path2, **kwargs)
+
+    def put(self, lpath, rpath, recursive=False, **kwargs):
+        if self.fail:
+            raise OSError("Connection reset")
+        return super().put(lpath, rpath, recursive=recursive, **kwargs)
+
+
+def create_file(size):
+    path = os.path.join(tempfile.mkdtemp(), "run", "model.ckpt")
+    os.makedirs(os.path.dirname(path))
+    with open(path, "wb") as f:
+        f.write(os.urandom(size))
+    return path
+
+
+def read_file(path):
+    with open(path, "rb") as f:
+        return f.read()
+
+
+@pytest.mark.asyncio
+async def test_multipart_upload():
+    lpath = create_file(1000)
+    rpath = os.path.join(tempfile.mkdtemp(), "model.ckpt")
+    fs = DummyMultipartFS()
+    states = []
+    await MultipartUpload(
+        fs=fs,
+        lpath=lpath,
+        rpath=rpath,
+        on_state=states.append,
+        budget=TransferBudget(concurrency=2),
+        part_size=300,
+    ).upload()
+    assert read_file(rpath) == read_file(lpath)
+    assert sorted(fs.uploaded_parts) == [1, 2, 3, 4]
+    assert states[-1] is None
+
+
+@pytest.mark.asyncio
+async def test_multipart_upload_resume():
+    lpath = create_file(1000)
+    rpath = os.path.join(tempfile.mkdtemp(), "model.ckpt")
+    fs = DummyMultipartFS(fail_at=3)
+    states = []
+    upload = MultipartUpload(
+        fs=fs,
+        lpath=lpath,
+        rpath=rpath,
+        on_state=states.append,
+        budget=TransferBudget(concurrency=1),
+        part_size=300,
+    )
+    with pytest.raises(OSError):
+        await upload.upload()
+    state = states[-1]
+    assert set(state["parts"].keys()) == {"1", "2", "4"}
+    assert state["attempts"] == 1
+
+    fs.fail_at = None
+    fs.uploaded_parts = []
+    await MultipartUpload(
+        fs=fs,
+        lpath=lpath,
+        rpath=rpath,
+        state=state,
+        budget=TransferBudget(concurrency=1),
+        part_size=300,
+    ).upload()
+    assert fs.started == 1
+    assert fs.uploaded_parts == [3]
+    assert read_file(rpath) == read_file(lpath)
+
+
+@pytest.mark.asyncio
+async def test_multipart_upload_restarts_if_file_changed():
+    lpath = create_file(1000)
+    rpath = os.path.join(tempfile.mkdtemp(), "model.ckpt")
+    fs = DummyMultipartFS()
+    state = {
+        "id": "upload-0",
+        "size": 1000,
+        "ts": 1,
+        "part_size": 300,
+        "parts": {"1": "etag-1"},
+        "attempts": 0,
+    }
+    await MultipartUpload(
+        fs=fs,
+        lpath=lpath,
+        rpath=rpath,
+        state=state,
+        budget=TransferBudget(concurrency=1),
+        part_size=300,
+    ).upload()
+    assert fs.started == 1
+    assert sorted(fs.uploaded_parts) == [1, 2, 3, 4]
+    assert read_file(rpath) == read_file(lpath)
+
+
+@pytest.mark.asyncio
+async def test_transfer_budget_bandwidth():
+    budget = TransferBudget(concurrency=2, bandwidth=10000)
+    start = time.monotonic()
+    for _ in range(3):
+        async with budget.acquire(1000):
+            pass
+    # The first transfer starts right away, the next ones wait 0.1s each
+    assert time.monotonic() - start >= 0.19
+
+
+def test_transfer_budget_is_bound_per_loop():
+    budget = TransferBudget(concurrency=1)
+
+    async def transfer():
+        async with budget.acquire(10):
+            await asyncio.sleep(0)
+
+    async def transfers():
+        await asyncio.gather(transfer(), transfer())
+
+    # A semaphore bound to the first loop would fail in the second one
+    for _ in range(2):
+        loop = asyncio.new_event_loop()
+        try:
+            loop.run_until_complete(transfers())
+        finally:
+            loop.close()
+
+
+@pytest.mark.asyncio
+async def test_transfer_budget_without_concurrency_limit():
+    budget = TransferBudget()
+    running = []
+
+    async def transfer():
+        async with budget.acquire(10):
+            running.append(1)
+            await asyncio.sleep(0.01)
+            return len(running)
+
+    results = await asyncio.gather(*[transfer() for _ in range(10)])
+    assert max(results) == 10
+
+
+@pytest.mark.asyncio
+async def test_sync_fs_resumes_multipart_upload():
+    patch_settings()
+    lpath = create_file(1000)
+    base_path = os.path.dirname(os.path.dirname(lpath))
+    store_path = tempfile.mkdtemp()
+    index_path = os.path.join(tempfile.mkdtemp(), ".fs")
+    settings.CLIENT_CONFIG.upload_part_size = 300
+    fs = DummyMultipartFS(fail_at=2)
+    assert supports_multipart(fs)
+    fw = FSWatcher()
+    fw.init()
+    fw.sync(os.path.join(base_path, "run"))
+    await sync_fs(fs=fs, fw=fw, store_base_path=store_path, index_path=index_path)
+    assert not os.path.exists(os.path.join(store_path, "run", "model.ckpt"))
+
+    # The sidecar restarts, the pending file is not in the index
+    fw = FSWatcher.read(index_path)
+    assert set(fw.get_upload_state("run/model.ckpt")["parts"]) == {"1", "3", "4"}
+    fs.fail_at = None
+    fs.uploaded_parts = []
+    fw.init()
+    fw.sync(os.path.join(base_path, "run"))
+    assert fw.get_files_to_put() == {(base_path, "run/model.ckpt")}
+    await sync_fs(fs=fs, fw=fw, store_base_path=store_path, index_path=index_path)
+    assert fs.uploaded_parts == [2]
+    assert read_file(os.path.join(store_path, "run", "model.ckpt")) == read_file(lpath)
+    assert FSWatcher.read(index_path).get_upload_state("run/model.ckpt") is None
+
+
+@pytest.mark.asyncio
+async def test_sync_fs_retries_failed_moves():
+    patch_settings()
+    for use_events in [False, True]:
+        if use_events and not Inotify.is_available():
+            continue
+        lpath = create_file(100)
+        run_path = os.path.dirname(lpath)
+        base_path = os.path.dirname(run_path)
+        store_path = tempfile.mkdtemp()
+        fs = FailingFS()
+        fw = FSWatcher(use_events=use_events)
+
+        async def sync():
+            fw.init()
+            fw.sync(run_path)
+            await sync_fs(fs=fs, fw=fw, store_base_path=store_path)
+
+        await sync()
+        moved_path = os.path.join(run_path, "model-moved.ckpt")
+        os.rename(lpath, moved_path)
+        fs.fail = True
+        await sync()
+        assert not os.path.exists(os.path.join(store_path, "run", "model-moved.ckpt"))
+
+        fs.fail = False
+        await sync()
+        assert read_file(
+            os.path.join(store_path, "run", "model-moved.ckpt")
+        ) == read_file(moved_path)
+        fw.close()
+
+
+@pytest.mark.asyncio
+async def test_sync_fs_retries_failed_puts():
+    patch_settings()
+    for use_events in [False, True]:
+        if use_events and not Inotify.is_available():
+            continue
+        lpath = create_file(100)
+        run_path = os.path.dirname(lpath)
+        store_path = tempfile.mkdtemp()
+        fs = FailingFS()
+        fs.fail = True
+        fw = FSWatcher(use_events=use_events)
+
+        async def sync():
+            fw.init()
+            fw.sync(run_path)
+            await sync_fs(fs=fs, fw=fw, store_base_path=store_path)
+
+        await sync()
+        assert not os.path.exists(os.path.join(store_path, "run", "model.ckpt"))
+        # The file did not change, it's reported again until it's uploaded
+        await sync()
+        assert not os.path.exists(os.path.join(store_path, "run", "model.ckpt"))
+
+        fs.fail = False
+        await sync()
+        assert read_file(os.path.join(store_path, "run", "model.ckpt")) == read_file(
+            lpath
+        )
+        fw.close()
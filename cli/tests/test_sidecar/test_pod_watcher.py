@@ -0,0 +1,138 @@
+#!/usr/bin/python
+#
+# Copyright 2018-2022 Polyaxon, Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import asyncio
+import pytest
+
+from kubernetes_asyncio.client import (
+    V1ContainerState,
+    V1ContainerStateRunning,
+    V1ContainerStateTerminated,
+    V1ContainerStatus,
+    V1ObjectMeta,
+    V1Pod,
+    V1PodStatus,
+)
+from kubernetes_asyncio.client.rest import ApiException
+
+from polyaxon.sidecar.container.pod_watcher import PodStatusWatcher
+
+
+def get_pod(resource_version, terminated=False):
+    state = (
+        V1ContainerState(terminated=V1ContainerStateTerminated(exit_code=0))
+        if terminated
+        else V1ContainerState(running=V1ContainerStateRunning())
+    )
+    return V1Pod(
+        metadata=V1ObjectMeta(name="pod", resource_version=resource_version),
+        status=V1PodStatus(
+            phase="Running",
+            container_statuses=[
+                V1ContainerStatus(
+                    name="main",
+                    state=state,
+                    image="image",
+                    image_id="image",
+                    ready=True,
+                    restart_count=0,
+                )
+            ],
+        ),
+    )
+
+
+class DummyK8SManager:
+    def __init__(self, watches):
+        self.watches = watches
+        self.resource_versions = []
+        self.polls = 0
+
+    async def watch_pod(self, name, resource_version=None, timeout_seconds=None):
+        self.resource_versions.append(resource_version)
+        if not self.watches:
+            # Keep the watch open
+            await asyncio.sleep(10)
+            return
+        events = self.watches.pop(0)
+        if isinstance(events, Exception):
+            raise events
+        for event in events:
+            await asyncio.sleep(0)
+            yield event
+
+    async def is_pod_running(self, pod_id, container_id):
+        self.polls += 1
+        return True
+
+
+@pytest.mark.asyncio
+async def test_pod_watcher_stops_on_termination():
+    manager = DummyK8SManager(
+        [
+            [("ADDED", get_pod("1"))],
+            [("MODIFIED", get_pod("2")), ("MODIFIED", get_pod("3", terminated=True))],
+        ]
+    )
+    watcher = PodStatusWatcher(manager, pod_id="pod", container_id="main")
+    watcher.start()
+    assert await watcher.wait(timeout=5) is True
+    assert await watcher.is_running() is False
+    # The second watch resumes from the last resource version
+    assert manager.resource_versions == [None, "1"]
+    assert manager.polls == 0
+    await watcher.stop()
+
+
+@pytest.mark.asyncio
+async def test_pod_watcher_uses_watch_state():
+    manager = DummyK8SManager([[("ADDED", get_pod("1"))]])
+    watcher = PodStatusWatcher(manager, pod_id="pod", container_id="main")
+    watcher.start()
+    assert await watcher.wait(timeout=0.1) is False
+    assert watcher.is_watching is True
+    assert await watcher.is_running() is True
+    assert manager.polls == 0
+    await watcher.stop()
+
+
+@pytest.mark.asyncio
+async def test_pod_watcher_resyncs_on_expired_version():
+    manager = DummyK8SManager(
+        [
+            [("ADDED", get_pod("1"))],
+            ApiException(status=410),
+            [("ADDED", get_pod("5", terminated=True))],
+        ]
+    )
+    watcher = PodStatusWatcher(manager, pod_id="pod", container_id="main")
+    watcher.start()
+    assert await watcher.wait(timeout=5) is True
+    assert manager.resource_versions == [None, "1", None]
+    await watcher.stop()
+
+
+@pytest.mark.asyncio
+async def test_pod_watcher_falls_back_to_polling(monkeypatch):
+    monkeypatch.setattr(PodStatusWatcher, "MAX_FAILURES", 1)
+    manager = DummyK8SManager([ApiException(status=500)])
+    watcher = PodStatusWatcher(manager, pod_id="pod", container_id="main")
+    watcher.start()
+    await asyncio.sleep(0.1)
+    assert watcher.is_watching is False
+    assert await watcher.is_running() is True
+    assert manager.polls == 1
+    await watcher.stop()
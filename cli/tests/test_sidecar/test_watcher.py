@@ -0,0 +1,256 @@
+#!/usr/bin/python
+#
+# Copyright 2018-2022 Polyaxon, Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import os
+import tempfile
+
+from mock import patch
+
+from polyaxon.fs.inotify import Inotify
+from polyaxon.fs.watcher import FSWatcher
+from polyaxon.utils.test_utils import BaseTestCase
+
+
+def write_file(path, content="data"):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, "w") as f:
+        f.write(content)
+
+
+class TestFSWatcher(BaseTestCase):
+    use_events = False
+
+    def setUp(self):
+        super().setUp()
+        self.base_path = tempfile.mkdtemp()
+        self.path = os.path.join(self.base_path, "run")
+        write_file(os.path.join(self.path, "file1"))
+        write_file(os.path.join(self.path, "dir1", "file2"))
+        self.fw = FSWatcher(use_events=self.use_events)
+
+    def tearDown(self):
+        self.fw.close()
+        super().tearDown()
+
+    def _upload(self):
+        # The digests of the files are recorded by `sync_fs` once uploaded
+        for base_path, subpath in self.fw.get_files_to_put():
+            path = os.path.join(base_path, subpath)
+            self.fw.set_digest(subpath, self.fw.get_upload_digest(path, subpath))
+
+    def _sync(self):
+        self.fw.init()
+        self.fw.sync(self.path)
+        self._upload()
+
+    def test_sync(self):
+        self._sync()
+        assert self.fw.get_files_to_put() == {
+            (self.base_path, "run/file1"),
+            (self.base_path, "run/dir1/file2"),
+        }
+        assert self.fw.get_dirs_to_put() == {(self.base_path, "run/dir1")}
+        assert self.fw.get_files_to_rm() == set()
+
+        self._sync()
+        assert self.fw.get_files_to_put() == set()
+        assert self.fw.get_dirs_to_put() == set()
+
+        write_file(os.path.join(self.path, "file1"), "new data")
+        os.utime(os.path.join(self.path, "file1"), ns=(1, 1))
+        os.remove(os.path.join(self.path, "dir1", "file2"))
+        os.rmdir(os.path.join(self.path, "dir1"))
+        write_file(os.path.join(self.path, "dir2", "file3"))
+        self._sync()
+        assert self.fw.get_files_to_put() == {
+            (self.base_path, "run/file1"),
+            (self.base_path, "run/dir2/file3"),
+        }
+        assert self.fw.get_files_to_rm() == {(self.base_path, "run/dir1/file2")}
+        assert self.fw.get_dirs_to_rm() == {(self.base_path, "run/dir1")}
+        assert self.fw.get_dirs_to_put() == {(self.base_path, "run/dir2")}
+
+        self._sync()
+        assert self.fw.get_files_to_put() == set()
+        assert self.fw.get_files_to_rm() == set()
+        assert self.fw.get_dirs_to_rm() == set()
+
+    def test_sync_exclude(self):
+        write_file(os.path.join(self.path, ".git", "file"))
+        self.fw.init()
+        self.fw.sync(self.path, exclude=[".git"])
+        self._upload()
+        assert self.fw.get_dirs_to_put() == {(self.base_path, "run/dir1")}
+        write_file(os.path.join(self.path, ".git", "file2"))
+        self.fw.init()
+        self.fw.sync(self.path, exclude=[".git"])
+        assert self.fw.get_files_to_put() == set()
+
+    def test_rename(self):
+        self._sync()
+        os.rename(
+            os.path.join(self.path, "file1"), os.path.join(self.path, "file_moved")
+        )
+        self._sync()
+        assert self.fw.get_files_to_mv() == {
+            (self.base_path, "run/file1", "run/file_moved")
+        }
+        assert self.fw.get_files_to_put() == set()
+        assert self.fw.get_files_to_rm() == set()
+
+        self._sync()
+        assert self.fw.get_files_to_mv() == set()
+
+    def test_retry_files(self):
+        self._sync()
+        assert len(self.fw.get_files_to_put()) == 2
+        self.fw.retry_files([(self.base_path, "run/dir1/file2")])
+        self._sync()
+        assert self.fw.get_files_to_put() == {(self.base_path, "run/dir1/file2")}
+        self._sync()
+        assert self.fw.get_files_to_put() == set()
+
+    def test_touch_identical_file(self):
+        self._sync()
+        file_path = os.path.join(self.path, "file1")
+        os.utime(file_path, ns=(10**9, 10**9))
+        write_file(file_path)
+        self._sync()
+        assert self.fw.get_files_to_put() == set()
+
+        write_file(file_path, "atad")
+        self._sync()
+        assert self.fw.get_files_to_put() == {(self.base_path, "run/file1")}
+
+    def test_same_tick_rewrite(self):
+        file_path = os.path.join(self.path, "file1")
+        self._sync()
+        stat = os.stat(file_path)
+        write_file(file_path, "atad")
+        os.utime(file_path, ns=(stat.st_atime_ns, stat.st_mtime_ns))
+        self._sync()
+        assert self.fw.get_files_to_put() == {(self.base_path, "run/file1")}
+
+    def test_old_file_is_not_hashed(self):
+        file_path = os.path.join(self.path, "file1")
+        os.utime(file_path, ns=(10**9, 10**9))
+        self.fw.init()
+        self.fw.sync(self.path)
+        assert self.fw._file_mapping["run/file1"].digest is None
+        assert self.fw._file_mapping["run/file1"].racy is False
+        assert self.fw._file_mapping["run/file1"].size == 4
+
+    def test_growing_file_is_not_hashed(self):
+        file_path = os.path.join(self.path, "file1")
+        self._sync()
+        with patch.object(
+            FSWatcher, "_get_digest", wraps=FSWatcher._get_digest
+        ) as get_digest:
+            for i in range(3):
+                write_file(file_path, "data" * (i + 2))
+                self.fw.init()
+                self.fw.sync(self.path)
+                assert (self.base_path, "run/file1") in self.fw.get_files_to_put()
+        assert file_path not in {c[0][0] for c in get_digest.call_args_list}
+
+    def test_identical_resave_after_size_change(self):
+        file_path = os.path.join(self.path, "file1")
+        self._sync()
+        write_file(file_path, "data" * 2)
+        self._sync()
+        assert self.fw.get_files_to_put() == {(self.base_path, "run/file1")}
+        os.utime(file_path, ns=(10**9, 10**9))
+        write_file(file_path, "data" * 2)
+        self._sync()
+        assert self.fw.get_files_to_put() == set()
+
+    def test_write_read(self):
+        self._sync()
+        index_path = os.path.join(tempfile.mkdtemp(), "index.json")
+        self.fw.write(index_path)
+
+        fw = FSWatcher.read(index_path)
+        data = fw._file_mapping["run/file1"]
+        assert data.size == 4
+        assert data.digest == self.fw._file_mapping["run/file1"].digest
+        fw.init()
+        fw.sync(self.path)
+        assert fw.get_files_to_put() == set()
+        assert fw.get_dirs_to_put() == set()
+        assert fw.get_files_to_rm() == set()
+
+    def test_read_legacy_index(self):
+        index_path = os.path.join(tempfile.mkdtemp(), "index.json")
+        with open(index_path, "w") as f:
+            f.write(
+                '{"dir_mapping": {}, "file_mapping": '
+                '{"run/file1": ["%s", "2021-01-01T00:00:00", "put"]}}' % self.base_path
+            )
+        fw = FSWatcher.read(index_path)
+        fw.init()
+        fw.sync(self.path)
+        assert (self.base_path, "run/file1") in fw.get_files_to_put()
+
+
+class TestFSWatcherEvents(TestFSWatcher):
+    use_events = True
+
+    def setUp(self):
+        if not Inotify.is_available():
+            self.skipTest("inotify is not available")
+        super().setUp()
+
+    def test_uses_events(self):
+        assert self.fw.uses_events is True
+
+    def test_overflow_triggers_full_scan(self):
+        self._sync()
+        write_file(os.path.join(self.path, "file4"))
+        self.fw._inotify._overflowed = True
+        self._sync()
+        assert self.fw.get_files_to_put() == {(self.base_path, "run/file4")}
+        assert self.fw.get_files_to_rm() == set()
+
+    def test_dangling_symlink_does_not_remove_siblings(self):
+        for i in range(8):
+            write_file(os.path.join(self.path, "dir3", "file{}".format(i)))
+        self._sync()
+        self.fw.get_files_to_put()
+
+        os.symlink(
+            os.path.join(self.base_path, "missing"),
+            os.path.join(self.path, "dir3", "link"),
+        )
+        write_file(os.path.join(self.path, "dir3", "file8"))
+        self._sync()
+        assert self.fw.get_files_to_rm() == set()
+        assert self.fw.get_files_to_put() == {(self.base_path, "run/dir3/file8")}
+
+    def test_failed_dir_scan_does_not_remove_children(self):
+        self._sync()
+        self.fw.get_files_to_put()
+        write_file(os.path.join(self.path, "dir1", "file5"))
+        scandir = os.scandir
+
+        def failing_scandir(path):
+            if path.endswith("dir1"):
+                raise PermissionError(path)
+            return scandir(path)
+
+        with patch("polyaxon.fs.watcher.os.scandir", side_effect=failing_scandir):
+            self._sync()
+        assert self.fw.get_files_to_rm() == set()
+        assert self.fw.get_dirs_to_rm() == set()
@@ -0,0 +1,303 @@
+#!/usr/bin/python
+#
+# Copyright 2018-2022 Polyaxon, Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import io
+import json
+import mock
+import os
+import requests
+import tarfile
+import tempfile
+
+from email.parser import BytesParser
+
+from polyaxon import settings
+from polyaxon.client import RunClient
+from polyaxon.exceptions import PolyaxonShouldExitError
+from polyaxon.stores.downloader import RangedDownloader
+from polyaxon.stores.polyaxon_store import PolyaxonStore
+from polyaxon.utils.test_utils import BaseTestCase
+
+
+class DummyRaw(io.BytesIO):
+    decode_content = False
+
+
+class DummyResponse:
+    def __init__(self, data, status_code=200, headers=None, fail_after=None):
+        self._data = data
+        self.raw = DummyRaw(data)
+        self._fail_after = fail_after
+        self.status_code = status_code
+        self.headers = headers or {}
+
+    def iter_content(self, chunk_size):
+        for i in range(0, len(self._data), chunk_size):
+            if self._fail_after is not None and i >= self._fail_after:
+                raise requests.exceptions.ConnectionError("Connection reset")
+            yield self._data[i : i + chunk_size]
+
+    def close(self):
+        pass
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        pass
+
+
+class DummyRangeSession:
+    def __init__(self, data, accept_ranges=True, fail_after=None):
+        self.data = data
+        self.accept_ranges = accept_ranges
+        self.fail_after = fail_after
+        self.headers = {}
+        self.ranges = []
+
+    def get(self, url, params, headers, timeout, stream):
+        response_headers = {
+            "Content-Length": str(len(self.data)),
+            "ETag": "etag",
+        }
+        response_headers.update(self.headers)
+        if self.accept_ranges:
+            response_headers["Accept-Ranges"] = "bytes"
+        if "Range" not in headers:
+            return DummyResponse(
+                self.data, headers=response_headers, fail_after=self.fail_after
+            )
+        start, end = headers["Range"].split("=")[1].split("-")
+        self.ranges.append((int(start), int(end)))
+        return DummyResponse(
+            self.data[int(start) : int(end) + 1],
+            status_code=206,
+            fail_after=self.fail_after,
+        )
+
+
+class DummySession:
+    def __init__(self):
+        self.headers = None
+        self.body = None
+
+    def post(self, url, params, data, headers, timeout):
+        self.headers = headers
+        self.body = b"".join(data)
+        return self.body
+
+
+class TestPolyaxonStore(BaseTestCase):
+    def setUp(self):
+        super().setUp()
+        settings.CLIENT_CONFIG.upload_streaming = True
+        self.store = PolyaxonStore(
+            client=RunClient(owner="owner", project="project", run_uuid="uuid")
+        )
+        self.dirname = tempfile.mkdtemp()
+        self.files = []
+        for i in range(2):
+            filepath = os.path.join(self.dirname, "file{}".format(i))
+            with open(filepath, "wb") as f:
+                f.write(os.urandom(1024))
+            self.files.append(filepath)
+
+    def parse_body(self, session):
+        message = BytesParser().parsebytes(
+            b"Content-Type: "
+            + session.headers["Content-Type"].encode()
+            + b"\r\n\r\n"
+            + session.body
+        )
+        return {
+            part.get_param("name", header="content-disposition"): part.get_payload(
+                decode=True
+            )
+            for part in message.get_payload()
+        }
+
+    def test_upload_dir_streaming(self):
+        session = DummySession()
+        with mock.patch("requests.Session", return_value=session):
+            self.store.upload_dir(
+                url="http://localhost/upload",
+                files=self.files,
+                path="foo",
+                relative_to=self.dirname,
+            )
+        parts = self.parse_body(session)
+        assert json.loads(parts["json"]) == {
+            "untar": True,
+            "path": "foo",
+            "overwrite": True,
+        }
+        with tarfile.open(fileobj=io.BytesIO(parts["upload_file"])) as tf:
+            assert set(tf.getnames()) == {"file0", "file1"}
+
+    def test_upload_dir_streaming_without_compression(self):
+        settings.CLIENT_CONFIG.upload_compression_level = 0
+        session = DummySession()
+        with mock.patch("requests.Session", return_value=session):
+            self.store.upload_dir(
+                url="http://localhost/upload",
+                files=self.files,
+                relative_to=self.dirname,
+            )
+        settings.CLIENT_CONFIG.upload_compression_level = 9
+        data = self.parse_body(session)["upload_file"]
+        assert len(data) > 2048
+        with tarfile.open(fileobj=io.BytesIO(data), mode="r:gz") as tf:
+            assert set(tf.getnames()) == {"file0", "file1"}
+
+    def test_upload_dir_streaming_size_limit(self):
+        session = DummySession()
+        with mock.patch.dict(os.environ, {"POLYAXON_UPLOAD_SIZE": "1000"}):
+            with mock.patch("requests.Session", return_value=session):
+                with self.assertRaises(PolyaxonShouldExitError):
+                    self.store.upload_dir(
+                        url="http://localhost/upload",
+                        files=self.files,
+                        relative_to=self.dirname,
+                    )
+
+    def test_upload_stream_without_size_check(self):
+        session = DummySession()
+        chunks = [b"a" * 800, b"b" * 800]
+        with mock.patch.dict(os.environ, {"POLYAXON_UPLOAD_SIZE": "1000"}):
+            with self.assertRaises(PolyaxonShouldExitError):
+                self.store.upload_stream(
+                    url="http://localhost/upload",
+                    file_type="uploadfile",
+                    filename="logs",
+                    chunks=iter(chunks),
+                    session=session,
+                    show_progress=False,
+                )
+            self.store.upload_stream(
+                url="http://localhost/upload",
+                file_type="uploadfile",
+                filename="logs",
+                chunks=iter(chunks),
+                session=session,
+                show_progress=False,
+                check_size=False,
+            )
+        assert self.parse_body(session)["uploadfile"] == b"".join(chunks)
+
+    def test_download_ranges(self):
+        data = os.urandom(1024 * 100)
+        session = DummyRangeSession(data)
+        filename = os.path.join(tempfile.mkdtemp(), "file")
+        with mock.patch.object(RangedDownloader, "SEGMENT_SIZE_MIN", 1024 * 30):
+            self.store.download(
+                url="http://localhost/file",
+                filename=filename,
+                session=session,
+                show_progress=False,
+            )
+        with open(filename, "rb") as f:
+            assert f.read() == data
+        assert len(session.ranges) == 4
+        assert not os.path.exists(filename + ".part")
+        assert not os.path.exists(filename + ".part.json")
+
+    def test_download_resume(self):
+        data = os.urandom(1024 * 100)
+        session = DummyRangeSession(data, fail_after=1024 * 64)
+        filename = os.path.join(tempfile.mkdtemp(), "file")
+        with mock.patch.object(RangedDownloader, "STATE_INTERVAL", 1):
+            with self.assertRaises(PolyaxonShouldExitError):
+                self.store.download(
+                    url="http://localhost/file",
+                    filename=filename,
+                    session=session,
+                    show_progress=False,
+                )
+        assert not os.path.exists(filename)
+        assert os.path.exists(filename + ".part")
+
+        session.fail_after = None
+        session.ranges = []
+        self.store.download(
+            url="http://localhost/file",
+            filename=filename,
+            session=session,
+            show_progress=False,
+        )
+        with open(filename, "rb") as f:
+            assert f.read() == data
+        assert session.ranges == [(1024 * 64, 1024 * 100 - 1)]
+
+    def test_download_without_ranges(self):
+        data = os.urandom(1024 * 100)
+        session = DummyRangeSession(data, accept_ranges=False)
+        filename = os.path.join(tempfile.mkdtemp(), "file")
+        self.store.download(
+            url="http://localhost/file",
+            filename=filename,
+            session=session,
+            show_progress=False,
+        )
+        with open(filename, "rb") as f:
+            assert f.read() == data
+        assert session.ranges == []
+
+    def _create_tar(self, extra_member=None):
+        tar_data = io.BytesIO()
+        with tarfile.open(fileobj=tar_data, mode="w:gz") as tar:
+            for filepath in self.files:
+                tar.add(filepath, arcname=os.path.basename(filepath))
+            if extra_member:
+                info = tarfile.TarInfo(extra_member)
+                info.size = 4
+                tar.addfile(info, io.BytesIO(b"data"))
+        return tar_data.getvalue()
+
+    def test_download_untar_stream(self):
+        session = DummyRangeSession(self._create_tar(), accept_ranges=False)
+        session.headers = {"Content-Disposition": 'attachment; filename="foo.tar.gz"'}
+        extract_path = tempfile.mkdtemp()
+        filename = os.path.join(tempfile.mkdtemp(), "foo")
+        result = self.store.download(
+            url="http://localhost/file",
+            filename=filename,
+            session=session,
+            untar=True,
+            extract_path=extract_path,
+            use_filepath=False,
+            show_progress=False,
+        )
+        assert result == extract_path
+        assert set(os.listdir(extract_path)) == {"file0", "file1"}
+        assert not os.path.exists(filename + ".tar.gz")
+
+    def test_download_untar_stream_skips_unsafe_members(self):
+        session = DummyRangeSession(
+            self._create_tar(extra_member="../escaped"), accept_ranges=False
+        )
+        session.headers = {"Content-Disposition": 'attachment; filename="foo.tar.gz"'}
+        extract_path = os.path.join(tempfile.mkdtemp(), "extract")
+        self.store.download(
+            url="http://localhost/file",
+            filename=os.path.join(tempfile.mkdtemp(), "foo"),
+            session=session,
+            untar=True,
+            extract_path=extract_path,
+            use_filepath=False,
+            show_progress=False,
+        )
+        assert set(os.listdir(extract_path)) == {"file0", "file1"}
+        assert not os.path.exists(os.path.join(extract_path, "..", "escaped"))
@@ -16,9 +16,16 @@
 
 import os
 import pytest
+import tarfile
 
 from polyaxon import settings
-from polyaxon.fs.async_manager import delete_file_or_dir, download_dir, download_file
+from polyaxon.fs.async_manager import (
+    delete_file_or_dir,
+    download_dir,
+    download_dirs,
+    download_file,
+    download_files,
+)
 from polyaxon.fs.fs import get_default_fs
 from polyaxon.utils.path_utils import check_or_create_path
 from polyaxon.utils.test_utils import create_tmp_files, set_store
@@ -56,6 +63,47 @@ async def test_download_file():
     assert os.path.exists(path_to)
 
 
+@pytest.mark.asyncio
+@pytest.mark.filterwarnings("ignore::RuntimeWarning")
+async def test_download_files():
+    store_root = set_store()
+    path = os.path.join(store_root, "foo")
+    check_or_create_path(path, is_dir=True)
+    create_tmp_files(path)
+    fs = await get_default_fs()
+    subpaths = ["foo/3", "foo/missing", "foo/0", "foo/1"]
+    results = await download_files(fs=fs, subpaths=subpaths, max_concurrency=2)
+
+    path_to = settings.CLIENT_CONFIG.archive_root
+    assert results == [
+        os.path.join(path_to, "foo/3"),
+        os.path.join(path_to, "foo/0"),
+        os.path.join(path_to, "foo/1"),
+    ]
+    for result in results:
+        assert os.path.exists(result)
+
+
+@pytest.mark.asyncio
+@pytest.mark.filterwarnings("ignore::RuntimeWarning")
+async def test_download_dirs_to_tar():
+    store_root = set_store()
+    for name in ["foo", "bar", "moo"]:
+        path = os.path.join(store_root, "download", name)
+        check_or_create_path(path, is_dir=True)
+        create_tmp_files(path)
+    fs = await get_default_fs()
+    subpaths = ["download/foo", "download/bar", "download/missing", "download/moo"]
+    tar_path = await download_dirs(
+        fs=fs, subpaths=subpaths, to_tar=True, max_concurrency=2
+    )
+    assert os.path.exists(tar_path)
+    with tarfile.open(tar_path) as tar:
+        names = set(tar.getnames())
+    for name in ["foo", "bar", "moo"]:
+        assert {"{}/{}".format(name, i) for i in range(4)} <= names
+
+
 @pytest.mark.asyncio
 @pytest.mark.filterwarnings("ignore::RuntimeWarning")
 async def test_delete_file():
@@ -0,0 +1,136 @@
+#!/usr/bin/python
+#
+# Copyright 2018-2022 Polyaxon, Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import time
+
+from polyaxon import settings
+from polyaxon.client.transport.coalescing_transport import CoalescingTransportMixin
+from polyaxon.client.workers.coalescing_worker import CoalescingWorker
+from tests.test_transports.utils import BaseTestCaseTransport
+
+
+class DummyTransport(CoalescingTransportMixin):
+    def __init__(self):
+        self.queue = []
+
+    def request(self, data):
+        self.queue.append(data)
+
+    def exception_request(self, data):
+        raise ValueError("error")
+
+    @staticmethod
+    def merge(current, data):
+        return {**current, **data}
+
+
+class TestCoalescingTransport(BaseTestCaseTransport):
+    # pylint:disable=protected-access
+    def setUp(self):
+        super().setUp()
+        self.transport = DummyTransport()
+        settings.CLIENT_CONFIG.timeout = 0.01
+        settings.CLIENT_CONFIG.coalesce_interval = 0.05
+
+    def test_worker(self):
+        assert hasattr(self.transport, "_coalescing_worker") is False
+        assert isinstance(self.transport.coalescing_worker, CoalescingWorker)
+        assert isinstance(self.transport._coalescing_worker, CoalescingWorker)
+        assert self.transport.coalescing_merged == 0
+        assert self.transport.coalescing_sent == 0
+
+    def test_async_coalesce_on_interval(self):
+        for i in range(5):
+            self.transport.async_coalesce(
+                key="run1",
+                data={"step": i},
+                request=self.transport.request,
+                merge=self.transport.merge,
+            )
+        self.transport.async_coalesce(
+            key="run2",
+            data={"loss": 0.1},
+            request=self.transport.request,
+            merge=self.transport.merge,
+        )
+        time.sleep(0.2)
+        assert self.transport.queue == [{"step": 4}, {"loss": 0.1}]
+        assert self.transport.coalescing_merged == 4
+        assert self.transport.coalescing_sent == 2
+        assert self.transport.coalescing_exceptions == 0
+
+    def test_async_coalesce_on_batch_size(self):
+        settings.CLIENT_CONFIG.coalesce_interval = 10
+        self.transport.coalescing_worker._batch_size = 3
+        for i in range(7):
+            self.transport.async_coalesce(
+                key="run1",
+                data={"step": i},
+                request=self.transport.request,
+                merge=self.transport.merge,
+            )
+        time.sleep(0.05)
+        assert self.transport.queue == [{"step": 2}, {"step": 5}]
+        assert self.transport.coalescing_worker.pending_size == 1
+
+    def test_atexit_flushes_pending(self):
+        settings.CLIENT_CONFIG.coalesce_interval = 10
+        self.transport.async_coalesce(
+            key="run1",
+            data={"step": 1},
+            request=self.transport.request,
+            merge=self.transport.merge,
+        )
+        self.transport.async_coalesce(
+            key="run1",
+            data={"step": 2},
+            request=self.transport.exception_request,
+            merge=self.transport.merge,
+        )
+        self.transport.async_coalesce(
+            key="run2",
+            data={"step": 1},
+            request=self.transport.request,
+            merge=self.transport.merge,
+        )
+        time.sleep(0.05)
+        assert self.transport.queue == []
+        self.transport.coalescing_worker.atexit()
+        assert self.transport.queue == [{"step": 1}]
+        assert self.transport.coalescing_sent == 2
+        assert self.transport.coalescing_exceptions == 1
+        assert self.transport._coalescing_worker.is_alive() is False
+
+    def test_flush_coalesced(self):
+        settings.CLIENT_CONFIG.coalesce_interval = 10
+        settings.CLIENT_CONFIG.timeout = 5
+        self.transport.flush_coalesced("run1")
+        for i in range(3):
+            self.transport.async_coalesce(
+                key="run1",
+                data={"step": i},
+                request=self.transport.request,
+                merge=self.transport.merge,
+            )
+        self.transport.async_coalesce(
+            key="run2",
+            data={"step": 1},
+            request=self.transport.request,
+            merge=self.transport.merge,
+        )
+        self.transport.flush_coalesced("run1")
+        assert self.transport.queue == [{"step": 2}]
+        assert self.transport.coalescing_worker.pending_size == 1
@@ -0,0 +1,93 @@
+#!/usr/bin/python
+#
+# Copyright 2018-2022 Polyaxon, Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import os
+import pytest
+import tempfile
+
+from polyaxon.client.transport.journal import RequestJournal
+from polyaxon.utils.test_utils import BaseTestCase
+
+
+def merge_dicts(current, data):
+    return {**current, **data}
+
+
+def merge_lists(current, data):
+    return current + data
+
+
+class TestRequestJournal(BaseTestCase):
+    def setUp(self):
+        super().setUp()
+        self.path = os.path.join(tempfile.mkdtemp(), "run", "journal.plx.jsonl")
+        self.journal = RequestJournal(
+            path=self.path,
+            merges={"patch": merge_dicts, "lineage": merge_lists},
+            compact_size=5,
+        )
+
+    def test_append_and_compact(self):
+        assert len(self.journal) == 0
+        self.journal.append("patch", {"loss": 0.5})
+        self.journal.append("lineage", ["l1"])
+        self.journal.append("patch", {"loss": 0.4, "acc": 0.9})
+        assert len(self.journal) == 3
+        assert self.journal.compacted() == [
+            ("patch", {"loss": 0.4, "acc": 0.9}),
+            ("lineage", ["l1"]),
+        ]
+        # Compaction is triggered by the size
+        self.journal.append("lineage", ["l2"])
+        self.journal.append("patch", {"loss": 0.3})
+        assert len(self.journal) == 2
+        assert self.journal.compacted() == [
+            ("patch", {"loss": 0.3, "acc": 0.9}),
+            ("lineage", ["l1", "l2"]),
+        ]
+
+    def test_skip_corrupted_records(self):
+        self.journal.append("patch", {"loss": 0.5})
+        with open(self.path, "a") as f:
+            f.write('{"kind": "patch", "da')
+        journal = RequestJournal(path=self.path, merges={"patch": merge_dicts})
+        assert journal.compacted() == [("patch", {"loss": 0.5})]
+
+    def test_append_after_partial_record(self):
+        self.journal.append("patch", {"loss": 0.5})
+        with open(self.path, "a") as f:
+            f.write('{"kind": "patch", "da')
+        self.journal.append("patch", {"acc": 0.9})
+        journal = RequestJournal(path=self.path, merges={"patch": merge_dicts})
+        assert journal.compacted() == [("patch", {"loss": 0.5, "acc": 0.9})]
+
+    def test_replay(self):
+        sent = []
+        self.journal.append("patch", {"loss": 0.5})
+        self.journal.append("lineage", ["l1"])
+
+        def fail(data):
+            raise ValueError()
+
+        with pytest.raises(ValueError):
+            self.journal.replay({"patch": sent.append, "lineage": fail})
+        assert sent == [{"loss": 0.5}]
+        assert self.journal.compacted() == [("lineage", ["l1"])]
+
+        self.journal.replay({"patch": sent.append, "lineage": sent.append})
+        assert sent == [{"loss": 0.5}, ["l1"]]
+        assert len(self.journal) == 0
+        assert os.path.exists(self.path) is False
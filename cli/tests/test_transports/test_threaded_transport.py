@@ -14,11 +14,15 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+import os
 import requests
+import shutil
+import tempfile
 import time
 
 from polyaxon import settings
 from polyaxon.client.transport.threaded_transport import ThreadedTransportMixin
+from polyaxon.client.workers.pool_worker import PoolWorker, QueueFullPolicy, SpillQueue
 from polyaxon.client.workers.queue_worker import QueueWorker
 from tests.test_transports.utils import BaseTestCaseTransport
 
@@ -199,3 +203,134 @@ class TestThreadedTransport(BaseTestCaseTransport):
         assert self.exception_transport.threaded_done == 1
         assert self.exception_transport.threaded_exceptions == 1
         assert self.exception_transport._worker.is_alive() is False
+
+
+class TestPoolThreadedTransport(BaseTestCaseTransport):
+    # pylint:disable=protected-access
+    def setUp(self):
+        super().setUp()
+        self.transport = DummyTransport()
+        self.exception_transport = ExceptionTransport()
+        settings.CLIENT_CONFIG.timeout = 0.5
+        settings.CLIENT_CONFIG.transport_workers = 2
+
+    def tearDown(self):
+        settings.CLIENT_CONFIG.transport_workers = None
+        settings.CLIENT_CONFIG.transport_full_policy = None
+        settings.CLIENT_CONFIG.transport_queue_size = None
+        super().tearDown()
+
+    def test_worker(self):
+        assert isinstance(self.transport.worker, PoolWorker)
+        assert self.transport.threaded_depth == 0
+        assert self.transport.threaded_dropped == 0
+
+    def test_async_requests_keep_ordering_per_url(self):
+        for i in range(10):
+            self.transport.async_patch(url="url1")
+            self.transport.async_post(url="url2")
+        self.transport.worker.atexit()
+        assert [q for q in self.transport.queue if q[1] == "url1"] == [
+            ("patch", "url1")
+        ] * 10
+        assert [q for q in self.transport.queue if q[1] == "url2"] == [
+            ("post", "url2")
+        ] * 10
+        assert self.transport.threaded_done == 20
+        assert self.transport.threaded_exceptions == 0
+        assert self.transport.threaded_depth == 0
+        assert self.transport.threaded_latency["max"] >= 0
+
+    def test_uploads_do_not_block_requests(self):
+        self.transport.delay = 0.2
+        self.transport.async_upload(url="url_upload", files=["file"], files_size=200)
+        time.sleep(0.05)
+        self.transport.delay = 0
+        self.transport.async_post(url="url_post")
+        time.sleep(0.05)
+        assert self.transport.queue == [("post", "url_post")]
+        self.transport.worker.atexit()
+        assert self.transport.queue == [("post", "url_post"), ("upload", "url_upload")]
+
+    def test_async_exceptions(self):
+        self.exception_transport.async_post(url="url_post")
+        self.exception_transport.async_upload(url="url_upload", files=[], files_size=0)
+        self.exception_transport.worker.atexit()
+        assert self.exception_transport.threaded_done == 2
+        assert self.exception_transport.threaded_exceptions == 2
+
+    def test_drop_oldest_policy(self):
+        worker = PoolWorker(
+            callback=lambda **kwargs: time.sleep(0.1),
+            num_workers=1,
+            queue_size=2,
+            full_policy=QueueFullPolicy.DROP_OLDEST,
+        )
+        for i in range(5):
+            worker.queue(key="url", value=i)
+        assert worker.dropped >= 2
+        assert worker.depth <= 2
+        worker.atexit()
+
+    def test_spill_policy(self):
+        results = []
+
+        def callback(value):
+            time.sleep(0.01)
+            results.append(value)
+
+        spill_path = self.get_tmp_dir()
+        worker = PoolWorker(
+            callback=callback,
+            num_workers=1,
+            queue_size=2,
+            full_policy=QueueFullPolicy.SPILL,
+            spill_path=spill_path,
+        )
+        for i in range(20):
+            worker.queue(key="url", value=i)
+        assert worker.depth > 2
+        worker.atexit()
+        assert results == list(range(20))
+        assert worker.dropped == 0
+        # A spill path that was passed is not removed
+        assert os.path.isdir(spill_path)
+
+    def test_spill_dir_is_removed_on_exit(self):
+        worker = PoolWorker(
+            callback=lambda value: None,
+            num_workers=1,
+            queue_size=2,
+            full_policy=QueueFullPolicy.SPILL,
+        )
+        spill_path = worker._spill_path
+        self.addCleanup(shutil.rmtree, spill_path, ignore_errors=True)
+        assert os.path.isdir(spill_path)
+        worker.queue(key="url", value=1)
+        worker.atexit()
+        assert not os.path.exists(spill_path)
+
+    def test_atexit_does_not_block_on_full_lanes(self):
+        worker = PoolWorker(
+            callback=lambda value: time.sleep(1),
+            num_workers=1,
+            queue_size=1,
+            timeout=0.1,
+        )
+        worker.queue(key="url", value=0)
+        time.sleep(0.05)
+        worker.queue(key="url", value=1)
+        start = time.time()
+        worker.atexit()
+        assert time.time() - start < 1
+
+    def test_spill_queue(self):
+        queue = SpillQueue(os.path.join(self.get_tmp_dir(), "spill.jsonl"))
+        queue.put([1, {"a": 1}])
+        queue.put([2, {"b": 2}])
+        assert len(queue) == 2
+        assert queue.get() == [1, {"a": 1}]
+        queue.put([3, {"c": 3}])
+        assert queue.get() == [2, {"b": 2}]
+        assert queue.get() == [3, {"c": 3}]
+        assert len(queue) == 0
@@ -14,6 +14,9 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+import shutil
+import tempfile
+
 from polyaxon import settings
 from polyaxon.utils.test_utils import BaseTestCase
 
@@ -22,3 +25,8 @@ class BaseTestCaseTransport(BaseTestCase):
     def setUp(self):
         super().setUp()
         settings.MIN_TIMEOUT = 0.001
+
+    def get_tmp_dir(self):
+        path = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, path, ignore_errors=True)
+        return path
@@ -14,6 +14,7 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+import io
 import os
 import pytest
 import tarfile
@@ -26,6 +27,8 @@ from polyaxon.utils.path_utils import (
     create_tarfile_from_path,
     get_files_by_paths,
     get_files_in_path_context,
+    is_safe_tar_member,
+    stream_tarfile,
 )
 
 
@@ -40,6 +43,59 @@ class TestFiles(TestCase):
                 assert set([m.name for m in members]) == set(files)
         assert not os.path.exists(tar_file_name)
 
+    def test_stream_tarfile(self):
+        dirname = tempfile.mkdtemp()
+        for i in range(3):
+            with open(os.path.join(dirname, "file{}".format(i)), "wb") as f:
+                f.write(os.urandom(1024 * 100))
+        files = [os.path.join(dirname, "file{}".format(i)) for i in range(3)]
+        for compresslevel in [0, 9]:
+            chunks = list(
+                stream_tarfile(
+                    files,
+                    relative_to=dirname,
+                    compresslevel=compresslevel,
+                    chunk_size=1024 * 10,
+                    max_chunks=2,
+                )
+            )
+            assert len(chunks) > 1
+            with tarfile.open(fileobj=io.BytesIO(b"".join(chunks))) as tf:
+                assert set(tf.getnames()) == {"file0", "file1", "file2"}
+                with open(files[1], "rb") as f:
+                    assert tf.extractfile("file1").read() == f.read()
+
+    def test_stream_tarfile_closed_early(self):
+        files = ["tests/test_utils/__init__.py", "tests/test_utils/test_enums.py"]
+        stream = stream_tarfile(files, chunk_size=16, max_chunks=1)
+        assert next(stream)
+        stream.close()
+
+    def test_stream_tarfile_raises(self):
+        with self.assertRaises(OSError):
+            list(stream_tarfile(["tests/test_utils/not_found.py"]))
+
+    def test_is_safe_tar_member(self):
+        extract_path = tempfile.mkdtemp()
+
+        def member(name, linkname=None, kind=tarfile.REGTYPE):
+            info = tarfile.TarInfo(name)
+            info.type = kind
+            if linkname:
+                info.linkname = linkname
+            return info
+
+        assert is_safe_tar_member(member("foo/bar"), extract_path)
+        assert not is_safe_tar_member(member("../bar"), extract_path)
+        assert not is_safe_tar_member(member("/etc/passwd"), extract_path)
+        assert is_safe_tar_member(
+            member("foo/link", "bar", tarfile.SYMTYPE), extract_path
+        )
+        assert not is_safe_tar_member(
+            member("foo/link", "../../bar", tarfile.SYMTYPE), extract_path
+        )
+        assert not is_safe_tar_member(member("dev", kind=tarfile.CHRTYPE), extract_path)
+
     def test_get_files_in_path_context_raises(self):
         filepaths = ["tests/test_utils/__init__.py"]
         with get_files_by_paths("repo", filepaths) as (files, files_size):